@@ -0,0 +1,97 @@
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from geocode_cache import normalize_address
+
+
+class AddressIndex:
+    """
+    정규화된 주소를 정렬된 배열로 보관하고, 이진 탐색으로 접두어(prefix)가 일치하는 주소를 찾는 자동완성 인덱스입니다.
+    각 주소에는 미리 구한 좌표가 함께 저장되어 있어, 추천 주소를 선택하면 지오코딩 API를 호출할 필요가 없습니다.
+    """
+
+    def __init__(self, addresses, latitudes, longitudes):
+        """
+        Args:
+            addresses (sequence of str): 주소 목록 (중복된 주소는 마지막 값이 사용됩니다.)
+            latitudes (array-like): 위도 배열
+            longitudes (array-like): 경도 배열
+        """
+        merged = {}
+        for address, lat, lon in zip(addresses, latitudes, longitudes):
+            merged[normalize_address(address)] = (address, lat, lon)
+        self.keys = sorted(merged)
+        self.labels = [merged[key][0] for key in self.keys]
+        self.lat = np.array([merged[key][1] for key in self.keys], dtype=np.float64)
+        self.lon = np.array([merged[key][2] for key in self.keys], dtype=np.float64)
+
+    @classmethod
+    def from_sources(cls, address_csv=None, geocode_cache=None, address_column='주소', lat_column='위도', lon_column='경도'):
+        """
+        로컬 주소 목록 CSV와 지오코딩 캐시 기록을 합쳐 인덱스를 생성합니다.
+
+        Args:
+            address_csv (str, optional): 주소, 위도, 경도 컬럼을 가진 CSV 경로
+            geocode_cache (GeocodeCache, optional): 지오코딩 캐시 (이전에 검색한 주소)
+            address_column (str): 주소 컬럼 이름
+            lat_column (str): 위도 컬럼 이름
+            lon_column (str): 경도 컬럼 이름
+
+        Returns:
+            AddressIndex: 생성된 인덱스
+        """
+        addresses, latitudes, longitudes = [], [], []
+        if address_csv:
+            df = pd.read_csv(address_csv, usecols=[address_column, lat_column, lon_column]).dropna()
+            addresses += df[address_column].tolist()
+            latitudes += df[lat_column].tolist()
+            longitudes += df[lon_column].tolist()
+        if geocode_cache is not None:
+            for key, lat, lon in geocode_cache.entries():
+                addresses.append(key)
+                latitudes.append(lat)
+                longitudes.append(lon)
+        return cls(addresses, latitudes, longitudes)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def suggest(self, text, limit=10):
+        """
+        입력 문자열로 시작하는 주소를 찾습니다.
+
+        Args:
+            text (str): 사용자가 입력 중인 주소
+            limit (int): 최대 추천 개수
+
+        Returns:
+            list: (주소, 위도, 경도) 튜플 목록 (정규화된 주소 순)
+        """
+        prefix = normalize_address(text)
+        if not prefix:
+            return []
+        start = bisect_left(self.keys, prefix)
+        results = []
+        for i in range(start, min(start + limit, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            results.append((self.labels[i], float(self.lat[i]), float(self.lon[i])))
+        return results
+
+    def lookup(self, text):
+        """
+        입력 문자열과 정확히 일치하는 주소의 좌표를 찾습니다.
+
+        Args:
+            text (str): 주소
+
+        Returns:
+            tuple (float, float): 위도와 경도. 없으면 None
+        """
+        key = normalize_address(text)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return float(self.lat[i]), float(self.lon[i])
+        return None
@@ -0,0 +1,268 @@
+import argparse
+import csv
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from geocoding import GeocodeError, geocode_naver
+
+# 출력 CSV 컬럼 (row_id는 입력 CSV의 데이터 행 번호로, 이어서 실행할 때 기준이 됩니다.)
+# 오류로 끝난 행은 다음 실행에서 다시 기록되므로 같은 row_id가 여러 번 나올 수 있으며, 마지막 줄이 최종 결과입니다.
+OUTPUT_FIELDS = ['row_id', 'address', 'latitude', 'longitude', 'status']
+DONE_STATUSES = ('ok', 'not_found')  # 다시 처리하지 않는 상태
+
+
+class RateLimiter:
+    """
+    여러 워커 스레드가 공유하는 토큰 버킷 방식의 호출 속도 제한기입니다.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate (float): 초당 허용 호출 수. 0 이하이면 제한하지 않습니다.
+            burst (int, optional): 순간적으로 허용할 최대 호출 수. 기본값은 rate와 같습니다.
+        """
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        토큰을 하나 얻을 때까지 대기합니다.
+        """
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+def mock_geocode(latency=0.0):
+    """
+    벤치마크용 로컬 가짜 지오코더를 생성합니다.
+    주소 해시로부터 부산 인근의 결정적인 좌표를 만들어 반환합니다.
+
+    Args:
+        latency (float): 호출마다 흉내 낼 응답 지연 시간 (초)
+
+    Returns:
+        function: address를 받아 (위도, 경도)를 반환하는 함수
+    """
+    def geocode(address):
+        if latency:
+            time.sleep(latency)
+        digest = hashlib.md5(address.encode('utf-8')).digest()
+        lat = 35.0 + digest[0] / 255 * 0.3
+        lon = 128.9 + digest[1] / 255 * 0.3
+        return lat, lon
+    return geocode
+
+
+def truncate_partial_line(output_path):
+    """
+    중단 시점에 줄바꿈 없이 일부만 기록된 마지막 줄을 잘라 냅니다.
+    잘라 내지 않으면 이어서 기록하는 첫 행이 그 줄 뒤에 붙어 잘못된 행으로 읽힙니다.
+
+    Args:
+        output_path (str): 출력 CSV 경로
+    """
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # 마지막 줄바꿈을 뒤에서부터 찾습니다.
+        position = size
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)  # 헤더도 완성되지 않은 경우
+
+
+def read_checkpoint(output_path):
+    """
+    이미 처리되어 출력 CSV에 기록된 행 번호를 읽어 옵니다.
+    같은 row_id가 여러 번 기록되어 있으면 마지막 줄의 상태를 따릅니다.
+
+    Args:
+        output_path (str): 출력 CSV 경로
+
+    Returns:
+        set: 처리 완료된 row_id 집합 (오류로 끝난 행은 제외)
+    """
+    statuses = {}
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            try:
+                statuses[int(row['row_id'])] = row.get('status')
+            except (KeyError, TypeError, ValueError):
+                continue  # 형식이 맞지 않는 줄은 무시하고 다시 처리합니다.
+    # 오류로 실패했거나 상태가 온전하지 않은 행은 다시 처리합니다.
+    return {row_id for row_id, status in statuses.items() if status in DONE_STATUSES}
+
+
+def iter_addresses(input_path, address_column, skip=frozenset()):
+    """
+    입력 CSV에서 (row_id, 주소)를 한 줄씩 읽어 옵니다. 파일 전체를 메모리에 올리지 않습니다.
+
+    Args:
+        input_path (str): 입력 CSV 경로
+        address_column (str): 주소가 들어 있는 컬럼 이름
+        skip (set): 건너뛸 row_id 집합 (이미 처리된 행)
+
+    Yields:
+        tuple (int, str): 행 번호와 주소
+    """
+    with open(input_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        if address_column not in (reader.fieldnames or []):
+            raise ValueError(f"입력 CSV에 '{address_column}' 컬럼이 없습니다.")
+        for row_id, row in enumerate(reader):
+            if row_id not in skip:
+                yield row_id, row[address_column]
+
+
+def geocode_csv(input_path, output_path, address_column='주소', geocode=geocode_naver,
+                workers=8, rate=10.0, cache=None, progress_every=1000, log=None):
+    """
+    CSV 파일의 주소를 일괄 지오코딩하여 결과를 출력 CSV에 순차적으로 기록합니다.
+    출력 파일이 체크포인트 역할을 하므로, 중단된 작업을 다시 실행하면 처리되지 않은 행부터 이어서 진행합니다.
+    오류로 끝난 행은 다음 실행에서 다시 처리하여 뒤에 추가로 기록하므로, 같은 row_id는 마지막 줄이 최종 결과입니다.
+
+    Args:
+        input_path (str): 입력 CSV 경로
+        output_path (str): 출력 CSV 경로 (이미 있으면 이어서 기록)
+        address_column (str): 주소 컬럼 이름
+        geocode (function): 주소를 (위도, 경도) 또는 None으로 변환하는 함수
+        workers (int): 동시에 실행할 워커 수
+        rate (float): 초당 최대 API 호출 수 (0 이하이면 제한 없음)
+        cache (GeocodeCache, optional): 지오코딩 캐시. 캐시 적중 시 API를 호출하지 않습니다.
+        progress_every (int): 진행 상황을 출력할 행 간격
+        log (function, optional): 진행 메시지 출력 함수
+
+    Returns:
+        dict: 처리 결과 통계 {'processed', 'skipped', 'ok', 'not_found', 'error', 'elapsed', 'rows_per_sec'}
+    """
+    log = log or (lambda message: print(message, file=sys.stderr))
+    truncate_partial_line(output_path)
+    done = read_checkpoint(output_path)
+    limiter = RateLimiter(rate)
+    stats = {'processed': 0, 'skipped': len(done), 'ok': 0, 'not_found': 0, 'error': 0}
+
+    def work(row_id, address):
+        if cache is not None:
+            found, coordinates = cache.get(address)
+            if found:
+                return row_id, address, coordinates, 'ok' if coordinates else 'not_found'
+        limiter.acquire()
+        try:
+            coordinates = geocode(address)
+        except GeocodeError:
+            return row_id, address, None, 'error'  # 실패한 행은 status만 기록하고 다음 실행에서 재시도합니다.
+        except Exception as e:
+            # 네트워크 오류나 예상하지 못한 응답도 한 행의 실패로 기록하고 작업 전체는 계속합니다.
+            log(f"{row_id}행 지오코딩 실패: {e!r}")
+            return row_id, address, None, 'error'
+        if cache is not None:
+            cache.put(address, coordinates)
+        return row_id, address, coordinates, 'ok' if coordinates else 'not_found'
+
+    new_file = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    started = time.perf_counter()
+    with open(output_path, 'a', newline='', encoding='utf-8') as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+        if new_file:
+            writer.writeheader()
+
+        def drain(futures):
+            finished, pending = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                row_id, address, coordinates, status = future.result()
+                writer.writerow({
+                    'row_id': row_id,
+                    'address': address,
+                    'latitude': coordinates[0] if coordinates else '',
+                    'longitude': coordinates[1] if coordinates else '',
+                    'status': status,
+                })
+                stats['processed'] += 1
+                stats[status] += 1
+                if stats['processed'] % progress_every == 0:
+                    out.flush()
+                    elapsed = time.perf_counter() - started
+                    log(f"{stats['processed']}건 처리 ({stats['processed'] / elapsed:.1f} rows/s)")
+            return pending
+
+        # 진행 중인 작업 수를 workers의 몇 배로 제한하여 입력 전체를 메모리에 올리지 않습니다.
+        futures = set()
+        for row_id, address in iter_addresses(input_path, address_column, done):
+            futures.add(pool.submit(work, row_id, address))
+            if len(futures) >= workers * 4:
+                futures = drain(futures)
+        while futures:
+            futures = drain(futures)
+
+    stats['elapsed'] = time.perf_counter() - started
+    stats['rows_per_sec'] = stats['processed'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    return stats
+
+
+def main(argv=None):
+    """
+    명령행에서 일괄 지오코딩을 실행합니다.
+
+    예:
+        python batch_geocode.py facilities.csv facilities_gps.csv --column 주소 --workers 8 --rate 10
+        python batch_geocode.py facilities.csv bench.csv --mock-latency 0.02 --rate 0   # 로컬 가짜 지오코더로 벤치마크
+    """
+    parser = argparse.ArgumentParser(description="CSV 주소 일괄 지오코딩 (중단 후 이어서 실행 가능)")
+    parser.add_argument('input', help="입력 CSV 경로")
+    parser.add_argument('output', help="출력 CSV 경로 (이미 있으면 이어서 처리)")
+    parser.add_argument('--column', default='주소', help="주소 컬럼 이름 (기본값: 주소)")
+    parser.add_argument('--workers', type=int, default=8, help="동시 워커 수 (기본값: 8)")
+    parser.add_argument('--rate', type=float, default=10.0, help="초당 최대 호출 수, 0이면 제한 없음 (기본값: 10)")
+    parser.add_argument('--no-cache', action='store_true', help="지오코딩 캐시를 사용하지 않습니다.")
+    parser.add_argument('--mock-latency', type=float, default=None,
+                        help="네이버 API 대신 지정한 지연 시간(초)을 갖는 로컬 가짜 지오코더를 사용합니다.")
+    args = parser.parse_args(argv)
+
+    geocode = geocode_naver if args.mock_latency is None else mock_geocode(args.mock_latency)
+    cache = None
+    if not args.no_cache and args.mock_latency is None:
+        from geocode_cache import GeocodeCache
+        cache = GeocodeCache()
+
+    stats = geocode_csv(args.input, args.output, address_column=args.column, geocode=geocode,
+                        workers=args.workers, rate=args.rate, cache=cache)
+    print(f"처리 {stats['processed']}건 (이전 실행에서 완료 {stats['skipped']}건 건너뜀), "
+          f"성공 {stats['ok']} / 결과 없음 {stats['not_found']} / 오류 {stats['error']}, "
+          f"{stats['elapsed']:.1f}초, {stats['rows_per_sec']:.1f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
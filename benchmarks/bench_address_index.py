@@ -0,0 +1,48 @@
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from address_index import AddressIndex
+
+DISTRICTS = ['부산진구', '해운대구', '동래구', '남구', '북구', '사하구', '금정구', '연제구', '수영구', '사상구']
+ROADS = ['신천대로', '중앙대로', '가야대로', '해운대로', '수영로', '동래로', '만덕대로', '낙동대로']
+
+
+def make_addresses(n, seed=0):
+    """
+    벤치마크용 가상 주소와 좌표를 생성합니다.
+    """
+    rng = random.Random(seed)
+    addresses = [
+        f"부산시 {rng.choice(DISTRICTS)} {rng.choice(ROADS)}{rng.randint(1, 99)}번길 {i}"
+        for i in range(n)
+    ]
+    latitudes = [35.0 + rng.random() * 0.3 for _ in range(n)]
+    longitudes = [128.9 + rng.random() * 0.3 for _ in range(n)]
+    return addresses, latitudes, longitudes
+
+
+def main(n=1_000_000, queries=10_000):
+    addresses, latitudes, longitudes = make_addresses(n)
+    started = time.perf_counter()
+    index = AddressIndex(addresses, latitudes, longitudes)
+    print(f"인덱스 생성: {n:,}건, {time.perf_counter() - started:.2f}초")
+
+    rng = random.Random(1)
+    prefixes = [a[:rng.randint(4, len(a))] for a in rng.sample(addresses, queries)]
+    timings = []
+    for prefix in prefixes:
+        t = time.perf_counter()
+        index.suggest(prefix)
+        timings.append(time.perf_counter() - t)
+    timings.sort()
+    print(f"추천 조회 {queries:,}회: 평균 {statistics.mean(timings) * 1e6:.1f}us, "
+          f"p50 {timings[len(timings) // 2] * 1e6:.1f}us, p99 {timings[int(len(timings) * 0.99)] * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
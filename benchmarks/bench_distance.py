@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distance_engine import ELLIPSOIDAL, GEODESIC, HAVERSINE, distances
+
+FIRE = (35.1649865, 129.0507722)  # 부산 (기본 화재 지점)
+
+
+def random_points(n, radius_deg, seed=0):
+    """
+    화재 지점 주변에 무작위 지점을 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    return FIRE[0] + (rng.random(n) - 0.5) * 2 * radius_deg, FIRE[1] + (rng.random(n) - 0.5) * 2 * radius_deg
+
+
+def accuracy():
+    print("정확도 (geodesic 대비 최대 절대 오차)")
+    for label, radius in (("~1km", 0.01), ("~10km", 0.1), ("~100km", 1.0)):
+        lats, lons = random_points(2000, radius, seed=1)
+        exact = distances(*FIRE, lats, lons, GEODESIC)
+        for method in (HAVERSINE, ELLIPSOIDAL):
+            error = np.abs(distances(*FIRE, lats, lons, method) - exact)
+            print(f"  {label:>7} {method:<12} 최대 {error.max():.4f} m, 상대 {np.max(error / np.maximum(exact, 1)):.2e}")
+
+
+def speed():
+    print("조회 1회당 시간")
+    for n in (10_000, 100_000, 1_000_000):
+        lats, lons = random_points(n, 0.1)
+        row = [f"  {n:>9,}건"]
+        for method in (HAVERSINE, ELLIPSOIDAL):
+            started = time.perf_counter()
+            for _ in range(5):
+                distances(*FIRE, lats, lons, method)
+            row.append(f"{method} {(time.perf_counter() - started) / 5 * 1000:8.2f} ms")
+        # geodesic은 느리므로 1,000건을 측정하여 환산합니다.
+        started = time.perf_counter()
+        distances(*FIRE, lats[:1000], lons[:1000], GEODESIC)
+        row.append(f"geodesic(환산) {(time.perf_counter() - started) * n / 1000 * 1000:10.0f} ms")
+        print(", ".join(row))
+
+
+if __name__ == "__main__":
+    accuracy()
+    speed()
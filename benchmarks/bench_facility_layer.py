@@ -0,0 +1,101 @@
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_spatial_index import FIRE, random_lines
+from facility_layer import build_facility_layer, feature_collection
+
+NAIVE_LIMIT = 10_000  # 시설물마다 folium 객체를 만드는 방식은 이 개수까지만 측정합니다. (그 이상은 수 분이 걸립니다.)
+
+
+def render(add_layer):
+    """
+    지도에 레이어를 추가하고 HTML로 만드는 시간(ms)과 HTML 크기(바이트, gzip 바이트)를 반환합니다.
+    """
+    started = time.perf_counter()
+    m = folium.Map(location=FIRE, zoom_start=13)
+    add_layer(m)
+    html = m.get_root().render().encode('utf-8')
+    return (time.perf_counter() - started) * 1000, len(html), len(gzip.compress(html))
+
+
+def naive_polylines(lines, df):
+    # 시설물마다 folium.PolyLine 객체를 만드는 방식
+    def add(m):
+        for row in range(len(lines)):
+            folium.PolyLine(lines.vertices(row)[:, ::-1].tolist(), color='#1f77b4',
+                            tooltip=str(df['kind'].iat[row])).add_to(m)
+    return add
+
+
+def folium_geojson(lines, df):
+    # folium.GeoJson에 style_function을 주는 방식 (스타일이 피처마다 기록됩니다.)
+    colors = {'a': '#1f77b4', 'b': '#ff7f0e', 'c': '#2ca02c'}
+
+    def add(m):
+        features = [{'type': 'Feature', 'properties': {'kind': df['kind'].iat[row]},
+                     'geometry': {'type': 'LineString', 'coordinates': lines.vertices(row).tolist()}}
+                    for row in range(len(lines))]
+        folium.GeoJson({'type': 'FeatureCollection', 'features': features},
+                       style_function=lambda feature: {'color': colors[feature['properties']['kind']]},
+                       tooltip=folium.GeoJsonTooltip(['kind'])).add_to(m)
+    return add
+
+
+def facility_layer(lines, df):
+    def add(m):
+        build_facility_layer(df, lines, style_column='kind', tooltip_column='kind').add_to(m)
+    return add
+
+
+def parse_ms(data):
+    """
+    브라우저 대신 node에서 GeoJSON 문자열을 JSON.parse하는 시간(ms)을 잽니다. (node가 없으면 None)
+    브라우저가 없는 환경에서 클라이언트 측 부담을 가늠하는 용도이며, Leaflet의 그리기 시간은 포함하지 않습니다.
+    """
+    node = shutil.which('node')
+    if node is None:
+        return None
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        f.write(data)
+    script = ("const s = require('fs').readFileSync(process.argv[1], 'utf8'); const t = process.hrtime.bigint();"
+              "for (let i = 0; i < 5; i++) JSON.parse(s);"
+              "console.log(Number(process.hrtime.bigint() - t) / 5e6);")
+    try:
+        return float(subprocess.run([node, '-e', script, f.name], capture_output=True, text=True, check=True).stdout)
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    for n in (1_000, 10_000, 100_000):
+        lines = random_lines(n)
+        df = pd.DataFrame({'kind': np.random.default_rng(0).choice(['a', 'b', 'c'], n)})
+        print(f"시설물 {n}건")
+        for label, add in (("PolyLine 개별 객체", naive_polylines(lines, df)),
+                           ("folium.GeoJson", folium_geojson(lines, df)),
+                           ("시설물 레이어", facility_layer(lines, df))):
+            if label == "PolyLine 개별 객체" and n > NAIVE_LIMIT:
+                print(f"  {label:18s} 생략")
+                continue
+            ms, size, compressed = render(add)
+            print(f"  {label:18s} 생성 {ms:9.1f} ms, HTML {size / 1e6:7.2f} MB (gzip {compressed / 1e6:6.2f} MB)")
+        rows = np.arange(n)
+        raw = json.dumps({'type': 'FeatureCollection', 'features': [
+            {'type': 'Feature', 'properties': {'kind': df['kind'].iat[row]},
+             'geometry': {'type': 'LineString', 'coordinates': lines.vertices(row).tolist()}} for row in rows]})
+        compact = feature_collection(lines, rows)
+        raw_ms, compact_ms = parse_ms(raw), parse_ms(compact)
+        if raw_ms is not None:
+            print(f"  JSON.parse (node)   원본 좌표 {raw_ms:7.1f} ms, 반올림/압축 {compact_ms:7.1f} ms")
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from facility_store import write_store
+
+FIRE = (35.1649865, 129.0507722)  # 부산 (기본 화재 지점)
+
+# 새 프로세스에서 실행하는 시작 단계. 시설물 데이터를 불러와 거리 계산이 가능한 상태까지 측정합니다.
+COLD_START = {
+    'csv': (
+        "import pandas as pd\n"
+        "from facility_geometry import get_linestrings\n"
+        "df = pd.read_csv({path!r}, encoding='utf-8-sig', low_memory=False)\n"
+        "lines = get_linestrings(df)\n"
+        "lines.bounds\n"
+    ),
+    'store': (
+        "from facility_store import load_store\n"
+        "df, lines = load_store({path!r})\n"
+    ),
+}
+# 최대 RSS는 /proc/self/status의 VmHWM(kB)을 사용합니다. (ru_maxrss는 부모 프로세스 값을 물려받을 수 있습니다.)
+PEAK_RSS = "[int(l.split()[1]) for l in open('/proc/self/status') if l.startswith('VmHWM')][0]"
+REPORT = f"print(time.perf_counter() - started, {PEAK_RSS})\n"
+
+
+def make_facilities(n, seed=0):
+    """
+    화재 지점 주변에 n개의 무작위 시설물(LINESTRING과 속성 컬럼)을 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(2, 8, n)
+    starts = np.c_[FIRE[1] + (rng.random(n) - 0.5) * 0.3, FIRE[0] + (rng.random(n) - 0.5) * 0.3]
+    wkt = []
+    for (lon, lat), count in zip(starts.tolist(), counts.tolist()):
+        points = ", ".join(f"{lon + i * 0.0003:.7f} {lat + i * 0.0002:.7f}" for i in range(count))
+        wkt.append(f"LINESTRING ({points})")
+    return pd.DataFrame({
+        '관리번호': [f"FAC{i:07d}" for i in range(n)],
+        '시설물구분': rng.choice(['상수관로', '하수관로', '가스관로', '통신관로'], n),
+        '관경': rng.integers(50, 1000, n),
+        '주소': [f"부산광역시 부산진구 테스트로 {i % 999 + 1}" for i in range(n)],
+        '공간위치G': wkt,
+    })
+
+
+def cold_start(kind, path):
+    """
+    새 파이썬 프로세스에서 시작 단계를 실행하고 (경과 시간(초), 최대 RSS(MB))를 반환합니다.
+    """
+    code = "import time\nstarted = time.perf_counter()\n" + COLD_START[kind].format(path=path) + REPORT
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    seconds, max_rss_kb = output.split()
+    return float(seconds), int(max_rss_kb) / 1024
+
+
+def baseline_rss():
+    # 라이브러리만 불러온 프로세스의 최대 RSS (MB)
+    code = f"import pandas, numpy, pyarrow\nprint({PEAK_RSS})"
+    return int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout) / 1024
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "facilities.csv")
+        store_path = os.path.join(workdir, "facility_store")
+        df = make_facilities(n)
+        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        started = time.perf_counter()
+        write_store(df, store_path)
+        print(f"{n:,}행, 저장소 변환 {time.perf_counter() - started:.1f}초")
+        print(f"  라이브러리 import만 한 프로세스 최대 RSS {baseline_rss():.0f} MB")
+        for kind, path in (('csv', csv_path), ('store', store_path)):
+            seconds, rss = cold_start(kind, path)
+            print(f"  {kind:<5} 시작 {seconds:6.2f}초, 최대 RSS {rss:7.0f} MB")
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_spatial_index import FIRE, random_lines
+from impact_engine import ImpactEngine
+from spatial_index import SpatialIndex
+
+
+def nudges(count, step_m, seed=0):
+    """
+    화재 지점 주변을 step_m 미터 안팎으로 반복해서 옮기는 클릭 위치를 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = rng.normal(0, step_m, (count, 2))
+    return FIRE[0] + offsets[:, 0] / 111_000, FIRE[1] + offsets[:, 1] / 91_000
+
+
+if __name__ == "__main__":
+    radius = 500
+    lines = random_lines(500_000)
+    index = SpatialIndex.build(lines)
+    lats, lons = nudges(50, 20)
+    for label, engine_index in (("인덱스 없음", None), ("공간 인덱스", index)):
+        # 매번 전체 계산 (기준 조회를 지워 부분 계산을 하지 않음)
+        full_engine = ImpactEngine(lines, engine_index)
+        started = time.perf_counter()
+        full = []
+        for lat, lon in zip(lats, lons):
+            full_engine.reset()
+            full.append(full_engine.query(lat, lon, radius))
+        full_ms = (time.perf_counter() - started) / len(lats) * 1000
+
+        engine = ImpactEngine(lines, engine_index)
+        engine.query(*FIRE, radius)
+        started = time.perf_counter()
+        for (lat, lon), (rows, result) in zip(zip(lats, lons), full):
+            new_rows, new_result = engine.query(lat, lon, radius)
+            assert np.array_equal(new_rows, rows) and np.allclose(new_result.distance, result.distance)
+        incremental_ms = (time.perf_counter() - started) / len(lats) * 1000
+        print(f"{label}: 전체 계산 {full_ms:7.2f} ms, 부분 계산 {incremental_ms:6.2f} ms ({engine.stats()})")
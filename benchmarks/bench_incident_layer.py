@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import folium
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_impact_engine import nudges
+from bench_spatial_index import FIRE
+from incident_layer import FIRE as FIRE_SLOT
+from incident_layer import IncidentLayer, fire_marker
+
+
+def static_map(n):
+    """
+    정적 요소(원형 마커) n개가 붙은 지도를 만듭니다.
+    """
+    m = folium.Map(location=FIRE, zoom_start=15)
+    for i in range(n):
+        folium.CircleMarker([FIRE[0] + i * 1e-6, FIRE[1]], radius=2).add_to(m)
+    return m
+
+
+def walk_and_replace(m, latitude, longitude):
+    # 이전 방식: 지도의 모든 요소를 순회해 마커를 지우고 새 마커를 붙입니다.
+    # (원래 코드는 순회 중에 dict를 바꿔 RuntimeError가 나므로 목록을 복사해 순회합니다.)
+    for name, layer in list(m._children.items()):
+        if isinstance(layer, folium.Marker):
+            del m._children[name]
+    fire_marker(latitude, longitude).add_to(m)
+
+
+if __name__ == "__main__":
+    lats, lons = nudges(200, 20)
+    for n in (1_000, 10_000, 100_000):
+        m = static_map(n)
+        started = time.perf_counter()
+        for lat, lon in zip(lats, lons):
+            walk_and_replace(m, lat, lon)
+        walk_us = (time.perf_counter() - started) / len(lats) * 1e6
+
+        m = static_map(n)
+        layer = IncidentLayer().add_to(m)
+        started = time.perf_counter()
+        for lat, lon in zip(lats, lons):
+            layer.set(FIRE_SLOT, fire_marker(lat, lon))
+        slot_us = (time.perf_counter() - started) / len(lats) * 1e6
+        print(f"정적 요소 {n:7d}개: 전체 순회 {walk_us:9.1f} us, 칸 교체 {slot_us:6.1f} us")
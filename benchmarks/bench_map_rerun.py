@@ -0,0 +1,91 @@
+import copy
+import json
+import os
+import sys
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+import streamlit_folium
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_impact_engine import nudges
+from bench_spatial_index import FIRE, random_lines
+from facility_layer import build_facility_layer
+from spatial_index import SpatialIndex
+
+TILES = "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
+RADIUS = 300
+
+# st_folium이 프런트엔드로 보내는 인자를 기록합니다. (Streamlit 서버 없이 실행하므로 컴포넌트 대신 기록만 합니다.)
+sent = []
+
+
+def record(**kwargs):
+    sent.append(kwargs)
+    return kwargs['default']
+
+
+streamlit_folium._component_func = record
+
+
+def message_bytes(kwargs):
+    # 컴포넌트 인자 중 브라우저로 보내는 값의 JSON 크기
+    return len(json.dumps({k: v for k, v in kwargs.items() if not callable(v)}, default=str).encode('utf-8'))
+
+
+def base_map():
+    m = folium.Map(location=FIRE, zoom_start=15, control_scale=True)
+    folium.TileLayer(TILES, attr='OpenStreetMap').add_to(m)
+    return m
+
+
+def incident(latitude, longitude):
+    group = folium.FeatureGroup(name="화재 지점")
+    folium.Marker([latitude, longitude], icon=folium.Icon(color="red", icon="fire", prefix="fa")).add_to(group)
+    folium.Circle([latitude, longitude], radius=RADIUS, color="red", fill=False).add_to(group)
+    return group
+
+
+def rebuild(latitude, longitude, facilities):
+    # 이전 방식: 지도 전체를 다시 만들어 마커와 시설물을 지도에 직접 붙입니다.
+    m = base_map()
+    for child in incident(latitude, longitude)._children.values():
+        child.add_to(m)
+    facilities.add_to(m)
+    return streamlit_folium.st_folium(m, key="map1", returned_objects=["last_clicked"])
+
+
+def overlay(m, latitude, longitude, facilities):
+    # 기본 지도는 그대로 두고 바뀌는 레이어만 feature_group_to_add로 보냅니다.
+    # 앱의 display_map()과 같이 레이어는 기본 지도의 복사본에 붙입니다.
+    layers = [facilities, incident(latitude, longitude)]
+    return streamlit_folium.st_folium(copy.deepcopy(m), key="map1", returned_objects=["last_clicked"],
+                                      center=(latitude, longitude), feature_group_to_add=layers, render=False)
+
+
+if __name__ == "__main__":
+    lines = random_lines(200_000)
+    index = SpatialIndex.build(lines)
+    df = pd.DataFrame({'kind': np.random.default_rng(0).choice(['a', 'b', 'c'], len(lines))})
+    lats, lons = nudges(20, 20)
+    base = base_map()
+    streamlit_folium.generate_leaflet_string(base)  # 앱의 create_map()과 같이 변수 이름을 고정하고 한 번 렌더링해 둡니다.
+    base.get_root().render()
+    for label, run in (("지도 전체 재생성", lambda lat, lon, layer: rebuild(lat, lon, layer)),
+                       ("기본 지도 + 레이어", lambda lat, lon, layer: overlay(base, lat, lon, layer))):
+        sent.clear()
+        elapsed = []
+        for lat, lon in zip(lats, lons):
+            rows, _ = index.within(lat, lon, RADIUS)
+            layer = build_facility_layer(df, lines, rows, style_column='kind')
+            started = time.perf_counter()
+            run(lat, lon, layer)
+            elapsed.append((time.perf_counter() - started) * 1000)
+        sizes = [message_bytes(kwargs) for kwargs in sent]
+        remounts = len({kwargs['key'] for kwargs in sent}) - 1  # 컴포넌트 키가 바뀌면 브라우저에서 지도를 새로 만듭니다.
+        base_sizes = [len(kwargs['script']) + len(kwargs['html']) + len(kwargs['header']) for kwargs in sent]
+        print(f"{label}: 실행당 {np.mean(elapsed):6.1f} ms, 전송 {np.mean(sizes) / 1e3:7.1f} KB "
+              f"(기본 지도 {np.mean(base_sizes) / 1e3:6.1f} KB), 지도 새로 만들기 {remounts}/{len(sent) - 1}회")
@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_spatial_index import FIRE, random_lines
+from distance_engine import polyline_distances
+from parallel_impact import ShardedImpact
+
+QUERIES = 10
+
+
+def measure(function):
+    started = time.perf_counter()
+    for _ in range(QUERIES):
+        function()
+    return (time.perf_counter() - started) / QUERIES * 1000
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    lines = random_lines(n, radius_deg=2.0)  # 전국 규모에 가깝게 약 400km 범위에 분포
+    radius = 200_000  # 대부분의 타일을 계산하는 넓은 반경
+    baseline = measure(lambda: polyline_distances(lines, *FIRE, radius))
+    print(f"{n:,}건, CPU {os.cpu_count()}개. 단일 프로세스 반경 {radius // 1000}km {baseline:.1f} ms")
+    for workers in (1, 2, 4, 8):
+        # 타일 수를 고정하여 작업 프로세스 수에 따른 차이만 비교합니다.
+        with ShardedImpact(lines, workers=workers, tiles=32) as sharded:
+            sharded.nearest(*FIRE, 10)  # 작업 프로세스 시작
+            within = measure(lambda: sharded.within(*FIRE, radius))
+            nearest = measure(lambda: sharded.nearest(*FIRE, 10))
+        print(f"  작업 프로세스 {workers}개: 반경 {within:7.1f} ms (x{baseline / within:4.2f}), 최근접 10개 {nearest:7.1f} ms")
@@ -0,0 +1,57 @@
+import gzip
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_facility_layer import parse_ms
+from bench_spatial_index import FIRE
+from facility_geometry import LineStrings
+from facility_layer import build_facility_layer
+from facility_simplify import build_levels, level_for_zoom, register_levels
+
+ZOOMS = (10, 12, 14, 16)
+
+
+def surveyed_lines(n, seed=0):
+    """
+    측량 선형처럼 1~2m 간격의 꼭짓점이 50~400개인 완만한 곡선 선형을 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(50, 400, n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    # 방향이 천천히 바뀌는 걸음으로 관로처럼 휘어지는 선을 만듭니다. (1e-5도 ≈ 1m)
+    heading = np.cumsum(rng.normal(0, 0.05, offsets[-1]))
+    step = rng.uniform(1e-5, 2e-5, offsets[-1])
+    steps = np.c_[np.cos(heading) * step, np.sin(heading) * step]
+    steps[offsets[:-1]] = 0
+    walk = np.cumsum(steps, axis=0)
+    starts = np.c_[FIRE[1] + (rng.random(n) - 0.5) * 0.3, FIRE[0] + (rng.random(n) - 0.5) * 0.3]
+    coords = np.repeat(starts, counts, axis=0) + walk - np.repeat(walk[offsets[:-1]], counts, axis=0)
+    return LineStrings(coords, offsets, np.ones(n, dtype=bool))
+
+
+if __name__ == "__main__":
+    for n in (1_000, 10_000):
+        lines = surveyed_lines(n)
+        df = pd.DataFrame({'kind': np.random.default_rng(0).choice(['a', 'b', 'c'], n)})
+        started = time.perf_counter()
+        levels = build_levels(lines)
+        print(f"시설물 {n}건 (꼭짓점 {len(lines.coords)}개), 단순화 단계 생성 {time.perf_counter() - started:.2f}초: "
+              + ", ".join(f"{tolerance}m {len(level.coords)}개" for tolerance, level in levels.items()))
+        register_levels(lines, levels)  # 저장소에서 불러온 것처럼 단계를 등록해 둡니다.
+        for zoom in ZOOMS:
+            started = time.perf_counter()
+            layer = build_facility_layer(df, lines, style_column='kind', zoom=zoom)
+            ms = (time.perf_counter() - started) * 1000
+            data = next(iter(layer._children.values())).data
+            parsed = parse_ms(data)
+            tolerance = level_for_zoom(zoom, FIRE[0])
+            print(f"  줌 {zoom:2d} ({'원본' if tolerance is None else f'{tolerance}m'}): 생성 {ms:7.1f} ms, "
+                  f"GeoJSON {len(data) / 1e6:6.2f} MB (gzip {len(gzip.compress(data.encode('utf-8'))) / 1e6:5.2f} MB)"
+                  + ("" if parsed is None else f", JSON.parse {parsed:6.1f} ms"))
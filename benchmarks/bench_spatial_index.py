@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distance_engine import polyline_distances
+from facility_geometry import LineStrings
+from spatial_index import SpatialIndex
+
+FIRE = (35.1649865, 129.0507722)  # 부산 (기본 화재 지점)
+
+
+def random_lines(n, radius_deg=0.15, seed=0):
+    """
+    화재 지점 주변에 꼭짓점 2~7개의 무작위 선형을 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(2, 8, n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    starts = np.c_[FIRE[1] + (rng.random(n) - 0.5) * 2 * radius_deg, FIRE[0] + (rng.random(n) - 0.5) * 2 * radius_deg]
+    steps = rng.normal(0, 0.0005, (offsets[-1], 2))
+    steps[offsets[:-1]] = 0
+    walk = np.cumsum(steps, axis=0)
+    coords = np.repeat(starts, counts, axis=0) + walk - np.repeat(walk[offsets[:-1]], counts, axis=0)
+    return LineStrings(coords, offsets, np.ones(n, dtype=bool))
+
+
+def timed(function, repeat=20):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    for n in (10_000, 100_000, 500_000):
+        lines = random_lines(n)
+        started = time.perf_counter()
+        index = SpatialIndex.build(lines)
+        build = (time.perf_counter() - started) * 1000
+        scan = timed(lambda: polyline_distances(lines, *FIRE), repeat=3)
+        radius = timed(lambda: index.within(*FIRE, 500))
+        nearest = timed(lambda: index.nearest(*FIRE, 10))
+        print(f"{n:>9,}건  생성 {build:7.1f} ms, 전체 계산 {scan:7.1f} ms, "
+              f"반경 500m {radius:6.2f} ms, 최근접 10개 {nearest:6.2f} ms")
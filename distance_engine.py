@@ -0,0 +1,349 @@
+from collections import namedtuple
+
+import numpy as np
+from geopy.distance import geodesic
+
+
+# WGS84 타원체 상수
+WGS84_A = 6378137.0  # 장반경 (m)
+WGS84_F = 1 / 298.257223563  # 편평률
+WGS84_E2 = WGS84_F * (2 - WGS84_F)  # 이심률 제곱
+EARTH_RADIUS_M = 6371008.8  # 지구 평균 반지름 (m)
+
+# 거리 계산 방식
+HAVERSINE = 'haversine'  # 구면 거리. 부산 지역에서 geodesic 대비 상대 오차 약 0.25%
+ELLIPSOIDAL = 'ellipsoidal'  # 중간 위도의 타원체 곡률 반경을 사용하는 근사. 10km 이내에서 geodesic 대비 오차 1cm 미만
+GEODESIC = 'geodesic'  # geopy geodesic (Karney). 정확하지만 행마다 파이썬 반복 계산을 하므로 느립니다.
+METHODS = (HAVERSINE, ELLIPSOIDAL, GEODESIC)
+
+
+def haversine(latitude, longitude, latitudes, longitudes):
+    """
+    한 지점에서 여러 지점까지의 구면(haversine) 거리를 한 번에 계산합니다.
+
+    Args:
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        latitudes (np.ndarray): 대상 위도 배열
+        longitudes (np.ndarray): 대상 경도 배열
+
+    Returns:
+        np.ndarray: 거리 (미터)
+    """
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes) - longitude)
+    a = np.sin(dlat * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon * 0.5) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def ellipsoidal(latitude, longitude, latitudes, longitudes):
+    """
+    한 지점에서 여러 지점까지의 거리를 WGS84 타원체 근사로 한 번에 계산합니다.
+    두 점의 중간 위도에서 자오선 곡률 반경(M)과 묘유선 곡률 반경(N)을 구해 평면 거리로 계산합니다.
+    화재 영향 반경(수 km) 범위에서는 geodesic과 사실상 같은 값이며, 거리가 멀어질수록 오차가 커집니다.
+    (benchmarks/bench_distance.py 측정값, geodesic 대비 최대 오차: 1km 이내 0.1mm 미만, 10km 이내 약 2mm, 100km 이내 약 2m)
+
+    Args:
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        latitudes (np.ndarray): 대상 위도 배열
+        longitudes (np.ndarray): 대상 경도 배열
+
+    Returns:
+        np.ndarray: 거리 (미터)
+    """
+    lat2 = np.asarray(latitudes, dtype=np.float64)
+    mid = np.radians((lat2 + latitude) * 0.5)
+    sin2 = np.sin(mid) ** 2
+    w = np.sqrt(1 - WGS84_E2 * sin2)
+    m = WGS84_A * (1 - WGS84_E2) / w ** 3  # 자오선 곡률 반경
+    n = WGS84_A / w  # 묘유선 곡률 반경
+    dy = np.radians(lat2 - latitude) * m
+    dx = np.radians(np.asarray(longitudes, dtype=np.float64) - longitude) * n * np.cos(mid)
+    return np.hypot(dx, dy)
+
+
+def geodesic_exact(latitude, longitude, latitudes, longitudes):
+    """
+    geopy geodesic으로 거리를 계산합니다. 기존 calculate_distance와 같은 값이 필요할 때 사용합니다.
+
+    Returns:
+        np.ndarray: 거리 (미터). 좌표가 NaN인 항목은 NaN
+    """
+    origin = (latitude, longitude)
+    return np.array([
+        geodesic(origin, (lat, lon)).meters if np.isfinite(lat) and np.isfinite(lon) else np.nan
+        for lat, lon in zip(np.asarray(latitudes).tolist(), np.asarray(longitudes).tolist())
+    ], dtype=np.float64)
+
+
+_FUNCTIONS = {HAVERSINE: haversine, ELLIPSOIDAL: ellipsoidal, GEODESIC: geodesic_exact}
+
+
+def distances(latitude, longitude, latitudes, longitudes, method=ELLIPSOIDAL):
+    """
+    한 지점(화재 지점)에서 N개 지점까지의 거리를 계산합니다.
+
+    Args:
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        latitudes (np.ndarray): 대상 위도 배열
+        longitudes (np.ndarray): 대상 경도 배열
+        method (str): HAVERSINE, ELLIPSOIDAL(기본값), GEODESIC 중 하나
+
+    Returns:
+        np.ndarray: 거리 (미터)
+    """
+    try:
+        function = _FUNCTIONS[method]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 거리 계산 방식입니다: {method} (사용 가능: {', '.join(METHODS)})") from None
+    return function(latitude, longitude, latitudes, longitudes)
+
+
+# 선형까지의 거리 계산 결과. 배열은 모두 행 수 크기이며, 계산하지 않은(가지치기된) 행은 distance=inf, segment=-1입니다.
+PolylineDistances = namedtuple('PolylineDistances', ['distance', 'closest_lat', 'closest_lon', 'segment'])
+
+
+def local_scale(latitude):
+    """
+    기준 위도에서 경도 1도, 위도 1도에 해당하는 거리(미터)를 반환합니다.
+    수 km 범위에서는 이 비율로 평면 좌표로 보아도 충분히 정확합니다.
+
+    Returns:
+        tuple (float, float): (경도 1도당 미터, 위도 1도당 미터)
+    """
+    phi = np.radians(latitude)
+    w = np.sqrt(1 - WGS84_E2 * np.sin(phi) ** 2)
+    m = WGS84_A * (1 - WGS84_E2) / w ** 3
+    n = WGS84_A / w
+    return np.radians(1.0) * n * np.cos(phi), np.radians(1.0) * m
+
+
+def pruning_limit(distance):
+    """
+    경계 상자 하한과 비교할 거리 한계를 반환합니다.
+    평면 근사와 거리 계산 방식의 차이를 고려해 약간의 여유를 둡니다.
+    """
+    return distance * 1.001 + 1.0
+
+
+def box_distances(bounds, latitude, longitude):
+    """
+    기준점에서 경계 상자들까지의 거리(미터)를 구합니다. 상자 안의 선형까지의 실제 거리는 이 값보다 작을 수 없습니다.
+
+    Args:
+        bounds (np.ndarray): (상자 수, 4) 크기의 (최소 경도, 최소 위도, 최대 경도, 최대 위도) 배열
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+
+    Returns:
+        np.ndarray: 경계 상자까지의 거리 (NaN 상자는 inf)
+    """
+    kx, ky = local_scale(latitude)
+    dx = np.maximum(np.maximum(bounds[:, 0] - longitude, longitude - bounds[:, 2]), 0) * kx
+    dy = np.maximum(np.maximum(bounds[:, 1] - latitude, latitude - bounds[:, 3]), 0) * ky
+    lower = np.hypot(dx, dy)
+    return np.where(np.isnan(lower), np.inf, lower)
+
+
+def bounds_lower_bound(lines, latitude, longitude, rows=None):
+    """
+    기준점에서 각 행의 경계 상자까지의 거리(미터)를 구합니다.
+
+    Args:
+        lines (LineStrings): 파싱된 선형
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        rows (np.ndarray, optional): 계산할 행 번호 (기본값: 전체)
+
+    Returns:
+        np.ndarray: 경계 상자까지의 거리 (유효하지 않은 행은 inf)
+    """
+    return box_distances(lines.bounds if rows is None else lines.bounds[rows], latitude, longitude)
+
+
+# 기준점을 원점으로 하는 평면 좌표(미터, x 동쪽, y 북쪽)의 선분 배열.
+# vertex는 선분 시작 꼭짓점 번호, group은 선분이 속한 행의 순번(rows 안에서의 위치), seg_counts는 행별 선분 수입니다.
+LocalSegments = namedtuple('LocalSegments', ['ax', 'ay', 'bx', 'by', 'vertex', 'group', 'seg_counts'])
+
+
+def local_segments(lines, rows, latitude, longitude):
+    """
+    지정한 행들의 모든 선분을 기준점 중심의 평면 좌표(미터)로 변환합니다. 같은 행의 선분은 연속되어 있습니다.
+
+    Args:
+        lines (LineStrings): 파싱된 선형
+        rows (np.ndarray): 행 번호
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+
+    Returns:
+        LocalSegments: 선분 배열
+    """
+    kx, ky = local_scale(latitude)
+    starts = lines.offsets[rows]
+    seg_counts = np.maximum(lines.offsets[rows + 1] - starts - 1, 0)
+    group = np.repeat(np.arange(len(rows)), seg_counts)
+    first = np.repeat(np.cumsum(seg_counts) - seg_counts, seg_counts)
+    vertex = np.repeat(starts, seg_counts) + (np.arange(len(group)) - first)
+    a = lines.coords[vertex]
+    b = lines.coords[vertex + 1]
+    return LocalSegments((a[:, 0] - longitude) * kx, (a[:, 1] - latitude) * ky,
+                         (b[:, 0] - longitude) * kx, (b[:, 1] - latitude) * ky, vertex, group, seg_counts)
+
+
+def closest_to_origin(ax, ay, bx, by):
+    """
+    평면 좌표의 선분들 위에서 원점에 가장 가까운 지점을 구합니다.
+
+    Returns:
+        tuple (np.ndarray, np.ndarray): 가장 가까운 지점의 x, y
+    """
+    vx, vy = bx - ax, by - ay
+    length2 = vx * vx + vy * vy
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.clip(np.where(length2 > 0, -(ax * vx + ay * vy) / length2, 0.0), 0.0, 1.0)
+    return ax + t * vx, ay + t * vy
+
+
+def nearest_segment(values, group, seg_counts):
+    """
+    행별로 값이 가장 작은 선분의 위치를 구합니다. (같은 값이면 앞의 선분)
+
+    Args:
+        values (np.ndarray): 선분별 값 (예: 거리 제곱)
+        group (np.ndarray): 선분이 속한 행의 순번
+        seg_counts (np.ndarray): 행별 선분 수
+
+    Returns:
+        np.ndarray: 선분이 있는 행마다 최소 선분의 위치 (행 순서)
+    """
+    nonempty = seg_counts > 0
+    starts = (np.cumsum(seg_counts) - seg_counts)[nonempty]
+    row_min = np.full(len(seg_counts), np.inf)
+    if len(starts):
+        row_min[nonempty] = np.minimum.reduceat(values, starts)
+    candidates = np.flatnonzero(values == row_min[group])
+    _, first = np.unique(group[candidates], return_index=True)
+    return candidates[first]
+
+
+def _evaluate(lines, rows, latitude, longitude, method):
+    # rows에 해당하는 선형마다 모든 선분까지의 최소 거리를 한 번의 배열 연산으로 계산합니다.
+    kx, ky = local_scale(latitude)
+    segments = local_segments(lines, rows, latitude, longitude)
+    px, py = closest_to_origin(segments.ax, segments.ay, segments.bx, segments.by)
+    best = nearest_segment(px * px + py * py, segments.group, segments.seg_counts)
+
+    result_rows = segments.group[best]
+    closest_lon = longitude + px[best] / kx
+    closest_lat = latitude + py[best] / ky
+    segment = segments.vertex[best] - lines.offsets[rows[result_rows]]
+    distance = distances(latitude, longitude, closest_lat, closest_lon, method)
+    return result_rows, distance, closest_lat, closest_lon, segment
+
+
+def row_distances(lines, rows, latitude, longitude, method=ELLIPSOIDAL):
+    """
+    지정한 행들의 선형까지만 최소 거리를 계산합니다. (공간 인덱스가 고른 후보 평가용)
+
+    Args:
+        lines (LineStrings): 파싱된 선형
+        rows (np.ndarray): 계산할 행 번호
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        method (str): 거리 계산 방식
+
+    Returns:
+        PolylineDistances: rows와 같은 순서의 거리 정보 (선분이 없는 행은 거리 inf, 선분 번호 -1)
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    result = PolylineDistances(np.full(len(rows), np.inf), np.full(len(rows), np.nan),
+                               np.full(len(rows), np.nan), np.full(len(rows), -1, dtype=np.int64))
+    if len(rows):
+        positions, d, lat, lon, seg = _evaluate(lines, rows, latitude, longitude, method)
+        result.distance[positions], result.closest_lat[positions] = d, lat
+        result.closest_lon[positions], result.segment[positions] = lon, seg
+    return result
+
+
+def polyline_distances(lines, latitude, longitude, max_distance=None, method=ELLIPSOIDAL):
+    """
+    기준점(화재 지점)에서 각 선형의 모든 선분까지의 최소 거리와 가장 가까운 지점을 계산합니다.
+    max_distance를 지정하면, 경계 상자가 그보다 먼 선형은 선분을 계산하지 않고 건너뜁니다.
+
+    Args:
+        lines (LineStrings): 파싱된 선형
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        max_distance (float, optional): 이 거리(미터)보다 먼 선형은 계산하지 않습니다. (거리 inf, 선분 번호 -1)
+        method (str): 가장 가까운 지점까지의 거리 계산 방식
+
+    Returns:
+        PolylineDistances: 행별 거리(미터), 가장 가까운 지점의 위도/경도, 선형 안에서의 선분 번호
+    """
+    n = len(lines)
+    distance = np.full(n, np.inf)
+    closest_lat = np.full(n, np.nan)
+    closest_lon = np.full(n, np.nan)
+    segment = np.full(n, -1, dtype=np.int64)
+
+    rows = np.flatnonzero(lines.valid)
+    if max_distance is not None:
+        lower = bounds_lower_bound(lines, latitude, longitude, rows)
+        rows = rows[lower <= pruning_limit(max_distance)]
+    if len(rows):
+        positions, d, lat, lon, seg = _evaluate(lines, rows, latitude, longitude, method)
+        if max_distance is not None:
+            # 여유 범위 때문에 계산된 행 중 실제로 max_distance보다 먼 행은 가지치기된 행과 같이 처리합니다.
+            keep = d <= max_distance
+            positions, d, lat, lon, seg = positions[keep], d[keep], lat[keep], lon[keep], seg[keep]
+        target = rows[positions]
+        distance[target], closest_lat[target], closest_lon[target], segment[target] = d, lat, lon, seg
+    return PolylineDistances(distance, closest_lat, closest_lon, segment)
+
+
+def nearest_polylines(lines, latitude, longitude, k=10, method=ELLIPSOIDAL, batch=1024):
+    """
+    기준점에서 가장 가까운 선형 k개를 찾습니다.
+    경계 상자까지의 거리가 가까운 순서로 선형을 조금씩 계산하고, 다음 후보의 하한이 현재 k번째 거리보다 멀면 멈춥니다.
+
+    Args:
+        lines (LineStrings): 파싱된 선형
+        latitude (float): 기준 위도
+        longitude (float): 기준 경도
+        k (int): 찾을 선형 수
+        method (str): 거리 계산 방식
+        batch (int): 한 번에 계산할 후보 수
+
+    Returns:
+        tuple (np.ndarray, PolylineDistances): 가까운 순서의 행 번호와, 그 행들의 거리 정보
+    """
+    rows = np.flatnonzero(lines.valid)
+    lower = bounds_lower_bound(lines, latitude, longitude, rows)
+    order = np.argsort(lower, kind='stable')
+    rows, lower = rows[order], lower[order]
+
+    found_rows, found = [], []
+    kth = np.inf
+    for start in range(0, len(rows), batch):
+        if start >= k and lower[start] > pruning_limit(kth):
+            break  # 남은 후보는 모두 현재 k번째보다 멉니다.
+        chunk = rows[start:start + batch]
+        positions, d, lat, lon, seg = _evaluate(lines, chunk, latitude, longitude, method)
+        found_rows.append(chunk[positions])
+        found.append(np.column_stack([d, lat, lon, seg]))
+        all_d = np.concatenate([f[:, 0] for f in found])
+        if len(all_d) >= k:
+            kth = np.partition(all_d, k - 1)[k - 1]
+
+    if not found:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.int64), PolylineDistances(empty, empty, empty, np.empty(0, dtype=np.int64))
+    result_rows = np.concatenate(found_rows)
+    values = np.concatenate(found)
+    top = np.argsort(values[:, 0], kind='stable')[:k]
+    return result_rows[top], PolylineDistances(values[top, 0], values[top, 1], values[top, 2], values[top, 3].astype(np.int64))
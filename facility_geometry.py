@@ -0,0 +1,298 @@
+import warnings
+import weakref
+
+import numpy as np
+import pandas as pd
+
+GEOMETRY_COLUMN = '공간위치G'  # 시설물 LINESTRING(WKT)이 저장된 컬럼
+_FALLBACK_BLOCK = 1024  # 잘못된 행이 있을 때 다시 변환하는 행 묶음 크기
+KOREA_EXTENT = (124.0, 33.0, 132.0, 39.0)  # 국내 시설물 좌표 범위 (최소 경도, 최소 위도, 최대 경도, 최대 위도)
+
+# 좌표 검증 거부 사유 (코드 번호는 REASONS의 위치)
+REASONS = ('ok', 'missing', 'bad_wkt', 'empty', 'too_few_points', 'odd_coordinates',
+           'non_numeric', 'non_finite', 'out_of_extent', 'swapped')
+(OK, MISSING, BAD_WKT, EMPTY, TOO_FEW_POINTS, ODD_COORDINATES,
+ NON_NUMERIC, NON_FINITE, OUT_OF_EXTENT, SWAPPED) = range(len(REASONS))
+REASON_LABELS = {
+    'ok': '정상',
+    'missing': '값 없음',
+    'bad_wkt': 'LINESTRING 형식이 아님',
+    'empty': '빈 선형',
+    'too_few_points': '꼭짓점이 2개 미만',
+    'odd_coordinates': '좌표 개수가 홀수',
+    'non_numeric': '숫자가 아닌 좌표',
+    'non_finite': 'NaN 또는 무한대 좌표',
+    'out_of_extent': '좌표 범위를 벗어남',
+    'swapped': '경도/위도 순서가 뒤바뀜',
+}
+
+
+class LineStrings:
+    """
+    여러 LINESTRING을 하나의 좌표 버퍼에 이어 붙여 보관하는 비정형(ragged) 배열입니다.
+    i번째 선형의 꼭짓점은 coords[offsets[i]:offsets[i + 1]]이며, 좌표는 WKT와 같은 (경도, 위도) 순서입니다.
+    파싱에 실패한 행은 valid[i] == False이고 꼭짓점이 0개입니다.
+    """
+
+    __slots__ = ('coords', 'offsets', 'valid', '_bounds', '__weakref__')
+
+    def __init__(self, coords, offsets, valid, bounds=None):
+        """
+        Args:
+            coords (np.ndarray): (전체 꼭짓점 수, 2) 크기의 float64 배열 (경도, 위도)
+            offsets (np.ndarray): (행 수 + 1) 크기의 int64 배열
+            valid (np.ndarray): 행 수 크기의 bool 배열
+            bounds (np.ndarray, optional): 미리 계산해 둔 경계 상자 (없으면 처음 조회할 때 계산)
+        """
+        self.coords = coords
+        self.offsets = offsets
+        self.valid = valid
+        self._bounds = bounds
+
+    def __len__(self):
+        return len(self.valid)
+
+    @property
+    def counts(self):
+        """
+        행별 꼭짓점 수 배열
+        """
+        return np.diff(self.offsets)
+
+    def vertices(self, i):
+        """
+        i번째 행의 꼭짓점 배열 (경도, 위도)을 반환합니다.
+        """
+        return self.coords[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def bounds(self):
+        """
+        행별 경계 상자 (최소 경도, 최소 위도, 최대 경도, 최대 위도). 처음 조회할 때 한 번 계산합니다.
+        유효하지 않은 행은 NaN입니다.
+
+        Returns:
+            np.ndarray: (행 수, 4) 크기의 배열
+        """
+        if self._bounds is None:
+            bounds = np.full((len(self), 4), np.nan)
+            nonempty = self.counts > 0
+            starts = self.offsets[:-1][nonempty]
+            if len(starts):
+                bounds[nonempty, :2] = np.minimum.reduceat(self.coords, starts, axis=0)
+                bounds[nonempty, 2:] = np.maximum.reduceat(self.coords, starts, axis=0)
+            self._bounds = bounds
+        return self._bounds
+
+
+def _split_body(value):
+    # "LINESTRING (x y, x y)" 에서 좌표 부분을 공백으로 구분된 문자열로 꺼냅니다. 형식이 아니면 None
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    open_at = value.find('(')
+    if open_at < 0 or not value.endswith(')') or value[:open_at].strip().upper() != 'LINESTRING':
+        return None
+    return value[open_at + 1:-1].replace(',', ' ')
+
+
+def _parse_numbers(text, expected):
+    # 공백으로 구분된 숫자 문자열을 한 번에 float64 배열로 변환합니다. 개수가 맞지 않으면 None
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)  # 숫자가 아닌 토큰이 있으면 경고 대신 예외로 처리합니다.
+        try:
+            values = np.fromstring(text, dtype=np.float64, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+    return values if len(values) == expected else None
+
+
+def _rejection_of(value):
+    # 좌표 부분을 꺼낼 수 없는 값의 거부 사유
+    if not isinstance(value, str):
+        return MISSING
+    return EMPTY if value.strip().upper().endswith('EMPTY') else BAD_WKT
+
+
+def _drop_rows(coords, counts, reasons, bad_vertex, reason):
+    # bad_vertex가 하나라도 있는 행을 reason으로 거부하고, 그 행의 좌표를 버퍼에서 제거합니다.
+    row_of_vertex = np.repeat(np.arange(len(counts)), counts)
+    rejected = np.bincount(row_of_vertex[bad_vertex], minlength=len(counts)) > 0
+    reasons[rejected] = reason
+    return coords[~rejected[row_of_vertex]], np.where(rejected, 0, counts)
+
+
+def validate_linestrings(column, extent=None):
+    """
+    WKT LINESTRING 문자열 컬럼 전체를 한 번에 파싱하고, 사용할 수 없는 행을 사유와 함께 골라냅니다.
+    행마다 float 변환을 반복하지 않고, 모든 좌표 문자열을 이어 붙여 한 번에 숫자 배열로 변환합니다.
+    거부된 행은 valid가 False이고 꼭짓점이 0개이므로, 거리 계산은 유효한 행만 예외 처리 없이 계산합니다.
+
+    Args:
+        column (pd.Series or sequence of str): "LINESTRING (경도 위도, 경도 위도, ...)" 형식의 문자열
+        extent (tuple, optional): 허용하는 좌표 범위 (최소 경도, 최소 위도, 최대 경도, 최대 위도).
+            지정하면 범위를 벗어난 행을 거부하고, 경도/위도를 바꾸면 범위 안에 드는 행은 SWAPPED로 표시합니다.
+
+    Returns:
+        tuple (LineStrings, np.ndarray): 파싱 결과와 행별 거부 사유 코드 (REASONS의 번호, 0이면 정상)
+    """
+    values = column.tolist() if isinstance(column, pd.Series) else list(column)
+    bodies = [_split_body(value) for value in values]
+    token_counts = np.fromiter((len(body.split()) if body else 0 for body in bodies), dtype=np.int64, count=len(bodies))
+    reasons = np.zeros(len(bodies), dtype=np.int8)
+    reasons[token_counts % 2 == 1] = ODD_COORDINATES
+    reasons[token_counts == 2] = TOO_FEW_POINTS
+    reasons[token_counts == 0] = EMPTY
+    for i, body in enumerate(bodies):
+        if body is None:
+            reasons[i] = _rejection_of(values[i])
+    valid = reasons == OK  # 꼭짓점 2개 이상, 좌표 개수 짝수
+
+    numbers = _parse_numbers(' '.join(b for b, ok in zip(bodies, valid.tolist()) if ok), int(token_counts[valid].sum()))
+    if numbers is None:
+        # 숫자가 아닌 토큰이 섞인 행이 있으면, 블록 단위로 다시 변환하고 실패한 블록만 행 단위로 검사하여 그 행을 제외합니다.
+        chunks = []
+        for start in range(0, len(bodies), _FALLBACK_BLOCK):
+            block = slice(start, start + _FALLBACK_BLOCK)
+            rows = [(b, n) for b, n, ok in zip(bodies[block], token_counts[block].tolist(), valid[block].tolist()) if ok]
+            parsed = _parse_numbers(' '.join(b for b, _ in rows), sum(n for _, n in rows))
+            if parsed is not None:
+                chunks.append(parsed)
+                continue
+            for i in range(start, min(start + _FALLBACK_BLOCK, len(bodies))):
+                row = _parse_numbers(bodies[i], token_counts[i]) if valid[i] else None
+                if row is None:
+                    if valid[i]:
+                        reasons[i] = NON_NUMERIC
+                else:
+                    chunks.append(row)
+        numbers = np.concatenate(chunks or [np.empty(0)])
+
+    counts = np.where(reasons == OK, token_counts // 2, 0)
+    coords = numbers.reshape(-1, 2)
+
+    # NaN/무한대 좌표가 포함된 행
+    finite = np.isfinite(coords).all(axis=1)
+    if not finite.all():
+        coords, counts = _drop_rows(coords, counts, reasons, ~finite, NON_FINITE)
+
+    # 허용 범위를 벗어난 좌표가 포함된 행 (경도/위도가 뒤바뀐 행 구분)
+    if extent is not None:
+        min_x, min_y, max_x, max_y = extent
+        x, y = coords[:, 0], coords[:, 1]
+        outside = (x < min_x) | (x > max_x) | (y < min_y) | (y > max_y)
+        if outside.any():
+            swapped_outside = (y < min_x) | (y > max_x) | (x < min_y) | (x > max_y)
+            row_of_vertex = np.repeat(np.arange(len(counts)), counts)
+            # 뒤바꾸어도 범위를 벗어나는 꼭짓점이 있는 행은 OUT_OF_EXTENT, 아니면 SWAPPED
+            fixable = np.bincount(row_of_vertex[swapped_outside], minlength=len(counts)) == 0
+            coords, counts = _drop_rows(coords, counts, reasons, outside, OUT_OF_EXTENT)
+            reasons[(reasons == OUT_OF_EXTENT) & fixable] = SWAPPED
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return LineStrings(np.ascontiguousarray(coords), offsets, reasons == OK), reasons
+
+
+def parse_linestrings(column, extent=None):
+    """
+    WKT LINESTRING 문자열 컬럼 전체를 한 번에 파싱합니다. 사용할 수 없는 행은 valid가 False입니다.
+
+    Args:
+        column (pd.Series or sequence of str): "LINESTRING (경도 위도, 경도 위도, ...)" 형식의 문자열
+        extent (tuple, optional): 허용하는 좌표 범위 (validate_linestrings 참고)
+
+    Returns:
+        LineStrings: 파싱 결과
+    """
+    return validate_linestrings(column, extent)[0]
+
+
+def quarantine_table(column, reasons):
+    """
+    거부된 행의 목록을 만듭니다.
+
+    Args:
+        column (pd.Series or sequence of str): 검증한 LINESTRING 컬럼
+        reasons (np.ndarray): validate_linestrings()가 반환한 거부 사유 코드
+
+    Returns:
+        pd.DataFrame: '행'(위치 기준 행 번호), '사유'(코드), '설명', '원본값' 컬럼
+    """
+    rows = np.flatnonzero(reasons != OK)
+    values = column.iloc[rows] if isinstance(column, pd.Series) else [column[i] for i in rows]
+    codes = np.array(REASONS, dtype=object)[reasons[rows]]
+    return pd.DataFrame({
+        '행': rows,
+        '사유': codes,
+        '설명': [REASON_LABELS[code] for code in codes],
+        '원본값': [value if isinstance(value, str) else None for value in values],
+    })
+
+
+def validation_counts(reasons):
+    """
+    검증 결과를 사유별 건수로 집계합니다.
+
+    Args:
+        reasons (np.ndarray): validate_linestrings()가 반환한 거부 사유 코드
+
+    Returns:
+        dict: 'total', 'valid', 'rejected'와 사유 코드별 건수 (0건인 사유는 제외)
+    """
+    counts = np.bincount(reasons, minlength=len(REASONS))
+    result = {'total': int(len(reasons)), 'valid': int(counts[OK]), 'rejected': int(len(reasons) - counts[OK])}
+    result.update({code: int(count) for code, count in zip(REASONS[1:], counts[1:].tolist()) if count})
+    return result
+
+
+# DataFrame별 파싱 결과 캐시 (DataFrame이 사라지면 함께 제거됩니다.)
+_geometry_cache = {}
+
+
+def get_linestrings(df, column=GEOMETRY_COLUMN):
+    """
+    DataFrame의 LINESTRING 컬럼을 파싱한 결과를 반환합니다. 같은 DataFrame에 대해서는 한 번만 파싱합니다.
+    DataFrame을 수정한 경우 invalidate_linestrings()를 호출해야 합니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        column (str): LINESTRING 컬럼 이름
+
+    Returns:
+        LineStrings: 파싱 결과 (행 순서는 df의 행 순서와 같습니다.)
+    """
+    key = (id(df), column)
+    cached = _geometry_cache.get(key)
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+    geometry = parse_linestrings(df[column])
+    register_linestrings(df, geometry, column)
+    return geometry
+
+
+def register_linestrings(df, geometry, column=GEOMETRY_COLUMN):
+    """
+    이미 파싱된 선형을 DataFrame의 파싱 결과로 등록합니다. (미리 변환해 둔 시설물 저장소를 불러온 경우 사용)
+    등록한 뒤에는 df에 column 컬럼이 없어도 get_linestrings(df, column)이 이 선형을 반환합니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        geometry (LineStrings): df와 행 순서가 같은 선형
+        column (str): LINESTRING 컬럼 이름
+    """
+    key = (id(df), column)
+
+    def forget(ref, key=key):
+        # 같은 id를 가진 새 DataFrame의 항목을 지우지 않도록, 자기 자신의 항목일 때만 제거합니다.
+        if _geometry_cache.get(key, (None,))[0] is ref:
+            del _geometry_cache[key]
+
+    _geometry_cache[key] = (weakref.ref(df, forget), geometry)
+
+
+def invalidate_linestrings(df, column=GEOMETRY_COLUMN):
+    """
+    DataFrame의 파싱 결과 캐시를 지웁니다.
+    """
+    _geometry_cache.pop((id(df), column), None)
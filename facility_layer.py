@@ -0,0 +1,218 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+from branca.element import Template
+from folium.map import FeatureGroup, Layer
+from folium.plugins import FastMarkerCluster
+
+from distance_engine import local_scale
+from facility_simplify import get_simplified, level_for_zoom
+
+COORD_DIGITS = 5  # 지도에 보내는 좌표의 소수점 자릿수 (위도 1e-5도 ≈ 1.1m)
+POINT_EXTENT = 2.0  # 경계 상자의 대각선이 이 거리(미터)보다 짧은 선형은 점 시설물로 보고 마커 클러스터로 그립니다.
+PALETTE = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+           '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf')  # 분류별 선 색상 (분류가 더 많으면 반복)
+DEFAULT_COLOR = '#3388ff'  # 분류 없이 그릴 때의 색상
+LINE_WEIGHT = 3
+_TEMPLATE_OPEN = re.compile(r'\{(?=[{%#])')  # Jinja 템플릿 구문의 시작 ('{{', '{%', '{#')
+
+
+class FacilityGeoJson(Layer):
+    """
+    미리 직렬화한 GeoJSON FeatureCollection 문자열을 그대로 지도에 넣는 레이어입니다.
+    folium.GeoJson은 style_function 결과를 피처마다 따로 기록하지만, 이 레이어는 스타일 목록을 한 번만 보내고
+    각 피처의 's' 속성(스타일 번호)으로 브라우저에서 스타일을 고릅니다. 선은 canvas 렌더러로 그립니다.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var styles = {{ this.styles|tojson }};
+                var layer = L.geoJson({{ this.data }}, {
+                    renderer: L.canvas(),
+                    style: function(feature) { return styles[feature.properties.s]; },
+                    onEachFeature: function(feature, layer) {
+                        if (feature.properties.t !== undefined) {
+                            layer.bindTooltip(String(feature.properties.t), {sticky: true});
+                        }
+                    }
+                });
+                return layer;
+            })();
+        {% endmacro %}
+        """)
+
+    def __init__(self, data, styles, name=None, overlay=True, control=True, show=True):
+        """
+        Args:
+            data (str): feature_collection()이 반환한 GeoJSON 문자열
+            styles (list): Leaflet 경로 스타일 목록 (피처의 's' 속성이 가리키는 위치)
+            name (str, optional): 레이어 이름
+            overlay (bool): 오버레이 레이어 여부
+            control (bool): 레이어 컨트롤에 표시할지 여부
+            show (bool): 처음에 표시할지 여부
+        """
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = 'FacilityGeoJson'
+        self.data = data
+        self.styles = styles
+
+
+def quantize(lines, rows, digits=COORD_DIGITS):
+    """
+    선택한 행의 좌표를 digits 자리로 반올림하고, 반올림 후 바로 앞과 같아진 꼭짓점을 제거합니다.
+
+    Args:
+        lines (LineStrings): 시설물 선형
+        rows (np.ndarray): 행 번호
+        digits (int): 소수점 자릿수
+
+    Returns:
+        tuple (np.ndarray, np.ndarray): (꼭짓점 수, 2) 크기의 반올림한 좌표 (경도, 위도)와 rows별 시작 위치 (len(rows) + 1)
+    """
+    counts = lines.counts[rows]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    vertex = np.repeat(lines.offsets[rows] - offsets[:-1], counts) + np.arange(offsets[-1])
+    coords = np.round(lines.coords[vertex], digits)
+
+    # 각 행의 첫 꼭짓점은 항상 남기고, 나머지는 앞 꼭짓점과 다를 때만 남깁니다.
+    keep = np.ones(len(coords), dtype=bool)
+    keep[1:] = (coords[1:] != coords[:-1]).any(axis=1)
+    keep[offsets[:-1][counts > 0]] = True
+    kept = np.zeros(len(coords) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept[1:])
+    return coords[keep], kept[offsets]
+
+
+def point_like(lines, rows, extent=POINT_EXTENT):
+    """
+    경계 상자의 대각선이 extent(미터)보다 짧아 점으로 그려도 되는 행을 표시합니다.
+
+    Args:
+        lines (LineStrings): 시설물 선형
+        rows (np.ndarray): 행 번호
+        extent (float): 점 시설물로 보는 최대 크기 (미터)
+
+    Returns:
+        np.ndarray: rows와 같은 길이의 bool 배열
+    """
+    bounds = lines.bounds[rows]
+    kx, ky = local_scale(np.nan_to_num((bounds[:, 1] + bounds[:, 3]) / 2))
+    width = (bounds[:, 2] - bounds[:, 0]) * kx
+    height = (bounds[:, 3] - bounds[:, 1]) * ky
+    return np.hypot(width, height) < extent
+
+
+def category_styles(values, palette=PALETTE):
+    """
+    분류 값을 스타일 번호로 바꾸고, 번호별 Leaflet 스타일 목록을 만듭니다. 값이 없는 행은 마지막 스타일(기본 색상)입니다.
+
+    Args:
+        values (pd.Series or None): 행별 분류 값 (None이면 모두 같은 스타일)
+        palette (tuple): 분류별 색상
+
+    Returns:
+        tuple (np.ndarray, list, dict): 행별 스타일 번호, 스타일 목록, {분류 값: 색상} 범례
+    """
+    if values is None:
+        return np.zeros(0, dtype=np.int64), [{'color': DEFAULT_COLOR, 'weight': LINE_WEIGHT}], {}
+    codes, categories = pd.factorize(values, sort=True)
+    colors = [palette[i % len(palette)] for i in range(len(categories))] + [DEFAULT_COLOR]
+    codes = np.where(codes < 0, len(categories), codes)
+    styles = [{'color': color, 'weight': LINE_WEIGHT} for color in colors]
+    return codes, styles, dict(zip(map(str, categories), colors))
+
+
+def feature_collection(lines, rows, codes=None, tooltips=None, digits=COORD_DIGITS):
+    """
+    선택한 행을 하나의 GeoJSON FeatureCollection 문자열로 직렬화합니다.
+    좌표는 digits 자리로 반올림하고 공백 없이 기록하며, 피처 속성은 스타일 번호 's', 행 번호 'i',
+    (있으면) 툴팁 't'만 넣습니다. 결과는 HTML <script> 안에 그대로 넣을 수 있습니다.
+
+    Args:
+        lines (LineStrings): 시설물 선형
+        rows (np.ndarray): 행 번호
+        codes (np.ndarray, optional): rows와 같은 순서의 스타일 번호 (없으면 모두 0)
+        tooltips (list, optional): rows와 같은 순서의 툴팁 문자열
+        digits (int): 소수점 자릿수
+
+    Returns:
+        str: GeoJSON 문자열
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    coords, offsets = quantize(lines, rows, digits)
+    points = coords.tolist()  # 한 번에 파이썬 리스트로 바꾸고 행별로 잘라 씁니다.
+    bounds = offsets.tolist()
+    codes = np.zeros(len(rows), dtype=np.int64) if codes is None else np.asarray(codes)
+    features = []
+    for position, (row, code) in enumerate(zip(rows.tolist(), codes.tolist())):
+        properties = {'s': code, 'i': row}
+        if tooltips is not None:
+            properties['t'] = tooltips[position]
+        features.append({'type': 'Feature', 'properties': properties,
+                         'geometry': {'type': 'LineString', 'coordinates': points[bounds[position]:bounds[position + 1]]}})
+    data = json.dumps({'type': 'FeatureCollection', 'features': features}, ensure_ascii=False, separators=(',', ':'))
+    data = data.replace('<', '\\u003c')  # 툴팁의 '</script>'가 HTML 스크립트를 끝내지 않도록 합니다.
+    # 레이어 스크립트는 렌더링할 때 템플릿으로 컴파일되므로, 툴팁의 '{{', '{%', '{#'이 템플릿 구문으로 해석되지 않게 합니다.
+    # (구조상의 '{' 뒤에는 항상 '"'나 '}'가 오므로, 이 조합은 문자열 안에만 나타납니다.)
+    return _TEMPLATE_OPEN.sub(r'\\u007b', data)
+
+
+def _point_callback(styles):
+    # FastMarkerCluster가 행 [위도, 경도, 스타일 번호]마다 호출하는 함수 (색상 목록은 한 번만 기록)
+    colors = json.dumps([style['color'] for style in styles])
+    return (f"function (row) {{ var colors = {colors}; "
+            f"return L.circleMarker(new L.LatLng(row[0], row[1]), "
+            f"{{radius: 5, color: colors[row[2]], fillOpacity: 0.8}}); }}")
+
+
+def build_facility_layer(df, lines, rows=None, style_column=None, tooltip_column=None, digits=COORD_DIGITS,
+                         name='시설물', zoom=None):
+    """
+    시설물 선형을 지도에 그리는 FeatureGroup을 만듭니다.
+    선형은 하나의 GeoJSON FeatureCollection으로, 점처럼 작은 시설물은 브라우저에서 묶어 그리는
+    FastMarkerCluster로 보냅니다. zoom을 주면 그 줌에서 픽셀보다 작은 굴곡을 줄인 단순화 선형으로 그립니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        lines (LineStrings): 시설물 선형
+        rows (np.ndarray, optional): 그릴 행 번호 (없으면 유효한 모든 행)
+        style_column (str, optional): 색상을 나눌 분류 컬럼
+        tooltip_column (str, optional): 툴팁으로 보여줄 컬럼
+        digits (int): 좌표 소수점 자릿수
+        name (str): 레이어 이름
+        zoom (float, optional): 지도 줌 레벨 (없으면 원본 선형으로 그립니다.)
+
+    Returns:
+        folium.FeatureGroup: 시설물 레이어 (legend 속성에 {분류 값: 색상} 범례)
+    """
+    rows = np.flatnonzero(lines.valid) if rows is None else np.asarray(rows, dtype=np.int64)
+    rows = rows[lines.valid[rows]]
+    codes, styles, legend = category_styles(None if style_column is None else df[style_column].iloc[rows])
+    if style_column is None:
+        codes = np.zeros(len(rows), dtype=np.int64)
+    tooltips = None if tooltip_column is None else df[tooltip_column].iloc[rows].astype(str).tolist()
+
+    group = FeatureGroup(name=name)
+    group.legend = legend
+    points = point_like(lines, rows)
+    line_rows = np.flatnonzero(~points)
+    if len(line_rows):
+        # 점 판별과 거리 계산은 원본 선형을 쓰고, 지도에 보내는 좌표만 단순화 선형에서 가져옵니다.
+        drawn = lines
+        if zoom is not None:
+            drawn = get_simplified(lines, level_for_zoom(zoom, float(np.mean(lines.bounds[rows[line_rows], 1]))))
+        data = feature_collection(drawn, rows[line_rows], codes[line_rows],
+                                  None if tooltips is None else [tooltips[i] for i in line_rows], digits)
+        FacilityGeoJson(data, styles, name=name, control=False).add_to(group)
+    point_rows = np.flatnonzero(points)
+    if len(point_rows):
+        bounds = lines.bounds[rows[point_rows]]
+        centers = np.round(np.column_stack([(bounds[:, 1] + bounds[:, 3]) / 2, (bounds[:, 0] + bounds[:, 2]) / 2]),
+                           digits)
+        data = [[lat, lon, code] for (lat, lon), code in zip(centers.tolist(), codes[point_rows].tolist())]
+        FastMarkerCluster(data, callback=_point_callback(styles), name=f"{name} (점)", control=False).add_to(group)
+    return group
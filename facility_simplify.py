@@ -0,0 +1,118 @@
+import math
+import weakref
+
+import numpy as np
+
+from distance_engine import closest_to_origin, local_scale, nearest_segment
+from facility_geometry import LineStrings
+
+# 단순화 허용 오차 (미터, 오름차순). 지도 줌에 맞는 단계를 골라 그립니다.
+SIMPLIFY_TOLERANCES = (2.5, 10.0, 40.0)
+_EQUATOR_M_PER_PIXEL = 156543.03392  # 줌 0에서 적도의 픽셀당 미터 (256px 타일)
+
+# LineStrings -> {허용 오차: 단순화한 LineStrings}
+_levels = weakref.WeakKeyDictionary()
+
+
+def simplify(lines, tolerance):
+    """
+    모든 선형을 Douglas-Peucker 방식으로 단순화합니다. 행마다 재귀하지 않고,
+    모든 행의 분할 구간을 한 번의 배열 연산으로 처리하는 과정을 더 나눌 구간이 없을 때까지 반복합니다.
+    거리는 행의 첫 꼭짓점 위도 기준 평면 좌표(미터)로 계산하고, 각 행의 양 끝점은 항상 남깁니다.
+
+    Args:
+        lines (LineStrings): 시설물 선형
+        tolerance (float): 허용 오차 (미터). 제거한 꼭짓점은 남은 선에서 이 거리 안에 있습니다.
+
+    Returns:
+        LineStrings: 단순화한 선형 (행 순서와 valid는 원본과 같습니다.)
+    """
+    counts = lines.counts
+    starts = lines.offsets[:-1]
+    nonempty = counts > 0
+    keep = np.zeros(len(lines.coords), dtype=bool)
+    keep[starts[nonempty]] = True
+    keep[(starts + counts - 1)[nonempty]] = True
+
+    # 행의 첫 꼭짓점 위도로 평면 좌표(미터)를 만듭니다.
+    first_lat = np.repeat(np.asarray(lines.coords[starts[nonempty], 1]), counts[nonempty])
+    kx, ky = local_scale(first_lat)
+    x = np.asarray(lines.coords[:, 0]) * kx
+    y = np.asarray(lines.coords[:, 1]) * ky
+
+    # 구간 [begin, end]의 안쪽 꼭짓점 중 가장 먼 꼭짓점이 허용 오차보다 멀면 남기고 두 구간으로 나눕니다.
+    begin, end = starts[counts > 2], (starts + counts - 1)[counts > 2]
+    limit = tolerance * tolerance
+    while len(begin):
+        inner = end - begin - 1
+        total = int(inner.sum())
+        group = np.repeat(np.arange(len(begin)), inner)
+        vertex = np.repeat(begin + 1 - (np.cumsum(inner) - inner), inner) + np.arange(total)
+        a, b = begin[group], end[group]
+        px, py = closest_to_origin(x[a] - x[vertex], y[a] - y[vertex], x[b] - x[vertex], y[b] - y[vertex])
+        d2 = px * px + py * py
+        far = nearest_segment(-d2, group, inner)  # 구간별로 가장 먼 꼭짓점
+        split = d2[far] > limit
+        middle = vertex[far[split]]
+        keep[middle] = True
+        begin = np.concatenate([begin[split], middle])
+        end = np.concatenate([middle, end[split]])
+        more = end - begin > 1
+        begin, end = begin[more], end[more]
+
+    kept = np.zeros(len(keep) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept[1:])
+    return LineStrings(np.ascontiguousarray(lines.coords[keep]), kept[lines.offsets], lines.valid)
+
+
+def build_levels(lines, tolerances=SIMPLIFY_TOLERANCES):
+    """
+    허용 오차별 단순화 선형을 만듭니다. 모든 단계를 원본에서 단순화하므로 각 단계의 오차는 그 허용 오차 이하입니다.
+
+    Returns:
+        dict: {허용 오차: LineStrings}
+    """
+    return {tolerance: simplify(lines, tolerance) for tolerance in tolerances}
+
+
+def register_levels(lines, levels):
+    """
+    저장소에서 불러온 단순화 선형을 원본 선형과 연결해 둡니다. (get_simplified()가 다시 계산하지 않습니다.)
+    """
+    _levels[lines] = dict(levels)
+
+
+def get_simplified(lines, tolerance):
+    """
+    원본 선형의 단순화 선형을 반환합니다. 등록된 단계가 없으면 처음 요청할 때 계산하여 보관합니다.
+
+    Args:
+        lines (LineStrings): 원본 선형
+        tolerance (float): 허용 오차 (미터). None이면 원본을 반환합니다.
+
+    Returns:
+        LineStrings: 단순화 선형
+    """
+    if tolerance is None:
+        return lines
+    levels = _levels.setdefault(lines, {})
+    if tolerance not in levels:
+        levels[tolerance] = simplify(lines, tolerance)
+    return levels[tolerance]
+
+
+def level_for_zoom(zoom, latitude, tolerances=SIMPLIFY_TOLERANCES):
+    """
+    지도 줌 레벨에서 픽셀 하나보다 작은 오차 중 가장 큰 허용 오차를 고릅니다.
+
+    Args:
+        zoom (float): 지도 줌 레벨
+        latitude (float): 지도 중심 위도
+        tolerances (tuple): 사용할 수 있는 허용 오차 (미터)
+
+    Returns:
+        float: 허용 오차. 원본 정밀도가 필요한 줌이면 None
+    """
+    pixel = _EQUATOR_M_PER_PIXEL * math.cos(math.radians(latitude)) / 2 ** zoom
+    usable = [tolerance for tolerance in tolerances if tolerance <= pixel]
+    return max(usable) if usable else None
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from facility_geometry import (GEOMETRY_COLUMN, KOREA_EXTENT, LineStrings, quarantine_table, register_linestrings,
+                               validate_linestrings, validation_counts)
+from facility_simplify import SIMPLIFY_TOLERANCES, build_levels, register_levels
+
+# 미리 변환한 시설물 저장소 디렉터리 (환경 변수로 변경 가능, 기본값은 실행 위치와 관계없이 이 파일 옆의 data/facility_store)
+FACILITY_STORE_PATH = os.getenv('FACILITY_STORE_PATH',
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'facility_store'))
+STORE_VERSION = 1
+
+# 저장소 디렉터리 안의 파일
+_GEOMETRY_FILES = ('coords', 'offsets', 'valid', 'bounds')  # 각각 <이름>.npy
+ATTRIBUTES_FILE = 'attributes.arrow'  # 좌표 외 컬럼 (압축하지 않은 Arrow IPC 파일)
+_SIMPLIFIED_FILES = ('coords', 'offsets')  # 단순화 단계마다 simplified_<단계>_<이름>.npy
+INDEX_FILE = 'spatial_index.npz'  # 공간 인덱스 (처음 불러올 때 생성)
+QUARANTINE_FILE = 'quarantine.csv'  # 좌표 검증에서 거부된 행 목록
+META_FILE = 'meta.json'  # 마지막에 기록되며, 이 파일이 있어야 완성된 저장소입니다.
+
+
+def read_source(path):
+    """
+    시설물 원본 파일(CSV 또는 Excel)을 DataFrame으로 읽습니다.
+
+    Args:
+        path (str): 원본 파일 경로 (.csv, .xlsx, .xls)
+
+    Returns:
+        pd.DataFrame: 시설물 DataFrame
+    """
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(path)
+    return pd.read_csv(path, encoding='utf-8-sig', low_memory=False)
+
+
+def _replace(path, write, mode='wb'):
+    # 임시 파일에 쓴 뒤 이름을 바꿔, 중단되어도 반쯤 쓰인 파일이 남지 않게 합니다.
+    temporary = path + '.tmp'
+    with open(temporary, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+        write(f)
+    os.replace(temporary, path)
+
+
+def write_store(df, store_path=FACILITY_STORE_PATH, column=GEOMETRY_COLUMN, source=None, extent=KOREA_EXTENT):
+    """
+    시설물 DataFrame을 열 단위 바이너리 저장소로 변환합니다.
+    LINESTRING 컬럼은 파싱하여 좌표 버퍼(.npy)로, 나머지 컬럼은 Arrow IPC 파일로 저장합니다.
+    좌표 검증에서 거부된 행은 사유와 함께 quarantine.csv에 기록하고, 사유별 건수는 메타데이터에 기록합니다.
+    지도용 단순화 선형(SIMPLIFY_TOLERANCES 단계별)도 함께 저장합니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        store_path (str): 저장소 디렉터리
+        column (str): LINESTRING 컬럼 이름
+        source (str, optional): 원본 파일 경로 (메타데이터에 기록)
+        extent (tuple, optional): 허용하는 좌표 범위 (None이면 범위를 검사하지 않습니다.)
+
+    Returns:
+        dict: 저장소 메타데이터
+    """
+    os.makedirs(store_path, exist_ok=True)
+    meta_path = os.path.join(store_path, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)  # 기록 도중에는 완성되지 않은 저장소로 취급합니다.
+
+    lines, reasons = validate_linestrings(df[column], extent)
+    for name in _GEOMETRY_FILES:
+        array = getattr(lines, name)
+        _replace(os.path.join(store_path, f'{name}.npy'), lambda f, a=array: np.save(f, a))
+    levels = build_levels(lines)
+    for level, tolerance in enumerate(SIMPLIFY_TOLERANCES):
+        for name in _SIMPLIFIED_FILES:
+            array = getattr(levels[tolerance], name)
+            _replace(os.path.join(store_path, f'simplified_{level}_{name}.npy'), lambda f, a=array: np.save(f, a))
+    index_path = os.path.join(store_path, INDEX_FILE)
+    if os.path.exists(index_path):
+        os.remove(index_path)  # 이전 데이터의 인덱스는 사용할 수 없습니다.
+
+    table = pa.Table.from_pandas(df.drop(columns=[column]), preserve_index=False)
+
+    def write_attributes(f):
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+    _replace(os.path.join(store_path, ATTRIBUTES_FILE), write_attributes)
+    quarantine = quarantine_table(df[column], reasons)
+    _replace(os.path.join(store_path, QUARANTINE_FILE),
+             lambda f: quarantine.to_csv(f, index=False, lineterminator='\n'), mode='w')
+
+    meta = {
+        'version': STORE_VERSION,
+        'rows': len(df),
+        'vertices': len(lines.coords),
+        'invalid_rows': int((~lines.valid).sum()),
+        'validation': validation_counts(reasons),
+        'simplify_tolerances': list(SIMPLIFY_TOLERANCES),
+        'column': column,
+        'source': source,
+        'created_at': time.time(),
+    }
+    _replace(meta_path, lambda f: json.dump(meta, f, ensure_ascii=False), mode='w')
+    return meta
+
+
+def store_exists(store_path=FACILITY_STORE_PATH):
+    """
+    완성된 시설물 저장소가 있는지 확인합니다.
+    """
+    return os.path.exists(os.path.join(store_path, META_FILE))
+
+
+def load_store(store_path=FACILITY_STORE_PATH):
+    """
+    시설물 저장소를 메모리 매핑으로 불러옵니다. 좌표와 속성 데이터는 실제로 접근할 때 디스크에서 읽힙니다.
+    반환한 DataFrame에는 LINESTRING 컬럼이 없지만, get_linestrings(df)가 저장된 선형을 바로 반환합니다.
+    저장된 단순화 선형은 get_simplified()가 다시 계산하지 않도록 등록해 둡니다.
+
+    Args:
+        store_path (str): 저장소 디렉터리
+
+    Returns:
+        tuple (pd.DataFrame, LineStrings): 속성 DataFrame (Arrow 기반 컬럼)과 선형
+
+    Raises:
+        ValueError: 저장소가 없거나 형식이 맞지 않는 경우
+    """
+    try:
+        with open(os.path.join(store_path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"시설물 저장소를 찾을 수 없습니다: {store_path}") from e
+    if meta.get('version') != STORE_VERSION:
+        raise ValueError(f"지원하지 않는 시설물 저장소 버전입니다: {meta.get('version')}")
+
+    arrays = {name: np.load(os.path.join(store_path, f'{name}.npy'), mmap_mode='r') for name in _GEOMETRY_FILES}
+    lines = LineStrings(arrays['coords'], arrays['offsets'], arrays['valid'], arrays['bounds'])
+
+    table = pa.ipc.open_file(pa.memory_map(os.path.join(store_path, ATTRIBUTES_FILE), 'r')).read_all()
+    if len(lines) != meta['rows'] or table.num_rows != meta['rows']:
+        raise ValueError("시설물 저장소의 행 수가 메타데이터와 일치하지 않습니다.")
+    # Arrow 기반 컬럼으로 변환하여 문자열을 파이썬 객체로 복사하지 않습니다.
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    register_linestrings(df, lines, meta['column'])
+    # 단순화 선형이 없는 이전 저장소는 지도에서 처음 필요할 때 계산합니다.
+    levels = {}
+    for level, tolerance in enumerate(meta.get('simplify_tolerances', [])):
+        simplified = {name: np.load(os.path.join(store_path, f'simplified_{level}_{name}.npy'), mmap_mode='r')
+                      for name in _SIMPLIFIED_FILES}
+        levels[tolerance] = LineStrings(simplified['coords'], simplified['offsets'], lines.valid)
+    register_levels(lines, levels)
+    return df, lines
+
+
+def load_validation(store_path=FACILITY_STORE_PATH):
+    """
+    저장소를 만들 때 기록한 좌표 검증 결과를 불러옵니다.
+
+    Args:
+        store_path (str): 저장소 디렉터리
+
+    Returns:
+        tuple (dict, pd.DataFrame): 사유별 건수와 거부된 행 목록
+    """
+    with open(os.path.join(store_path, META_FILE), encoding='utf-8') as f:
+        counts = json.load(f).get('validation', {})
+    quarantine = pd.read_csv(os.path.join(store_path, QUARANTINE_FILE), encoding='utf-8', keep_default_na=False)
+    return counts, quarantine
+
+
+def index_path(store_path=FACILITY_STORE_PATH):
+    """
+    저장소에 함께 보관하는 공간 인덱스 파일 경로 (get_spatial_index의 path 인자로 사용)
+    """
+    return os.path.join(store_path, INDEX_FILE)
+
+
+def main(argv=None):
+    """
+    명령행에서 시설물 원본 파일을 저장소로 변환합니다.
+
+    예:
+        python facility_store.py facilities.csv --output data/facility_store
+    """
+    parser = argparse.ArgumentParser(description="시설물 원본 파일(CSV/Excel)을 열 단위 바이너리 저장소로 변환")
+    parser.add_argument('input', help="원본 파일 경로 (.csv, .xlsx)")
+    parser.add_argument('--output', default=FACILITY_STORE_PATH, help=f"저장소 디렉터리 (기본값: {FACILITY_STORE_PATH})")
+    parser.add_argument('--column', default=GEOMETRY_COLUMN, help=f"LINESTRING 컬럼 이름 (기본값: {GEOMETRY_COLUMN})")
+    parser.add_argument('--no-extent', action='store_true', help="국내 좌표 범위 검사를 하지 않습니다.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    meta = write_store(read_source(args.input), args.output, args.column, source=os.path.abspath(args.input),
+                       extent=None if args.no_extent else KOREA_EXTENT)
+    print(f"{meta['rows']}행 (좌표 {meta['vertices']}개, 거부 {meta['invalid_rows']}행) 변환 완료, "
+          f"{time.perf_counter() - started:.1f}초 -> {args.output}")
+    rejected = {code: count for code, count in meta['validation'].items() if code not in ('total', 'valid', 'rejected')}
+    if rejected:
+        print("거부 사유: " + ", ".join(f"{code} {count}건" for code, count in rejected.items())
+              + f" (목록: {os.path.join(args.output, QUARANTINE_FILE)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import atexit
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# 캐시 기본 설정
+GEOCODE_CACHE_PATH = os.getenv('GEOCODE_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'geocode.sqlite3'))
+GEOCODE_CACHE_TTL = 30 * 24 * 3600  # 정상 결과 보관 기간 (30일)
+GEOCODE_CACHE_NEGATIVE_TTL = 24 * 3600  # 검색 결과 없음(totalCount == 0) 보관 기간 (1일)
+GEOCODE_CACHE_MAX_ENTRIES = 100000  # 최대 보관 주소 수 (초과 시 LRU 방식으로 제거)
+_FLUSH_INTERVAL = 30  # 메모리에 모아 둔 적중/실패 횟수와 최근 사용 시각을 이 간격(초)마다 DB에 기록합니다.
+
+# 광역시/특별시 표기 통일용 (예: "부산광역시", "부산시" -> "부산")
+_REGION_SUFFIX = re.compile(r'^(서울|부산|대구|인천|광주|대전|울산|세종)(특별자치시|특별시|광역시|시)(?=\s|$)')
+
+
+def normalize_address(address):
+    """
+    캐시 키로 사용할 수 있도록 주소 문자열을 정규화합니다.
+    전각/반각 문자 통일, 쉼표 제거, 공백 정리, 시/도 명칭 축약을 수행합니다.
+
+    Args:
+        address (str): 사용자가 입력한 주소 문자열
+
+    Returns:
+        str: 정규화된 주소 문자열
+    """
+    text = address or ''
+    if not unicodedata.is_normalized('NFKC', text):
+        text = unicodedata.normalize('NFKC', text)
+    text = ' '.join(text.replace(',', ' ').split()).lower()
+    match = _REGION_SUFFIX.match(text)
+    if match:
+        text = match.group(1) + text[match.end():]
+    return text
+
+
+class GeocodeCache:
+    """
+    SQLite 파일에 지오코딩 결과를 저장하는 디스크 캐시입니다.
+    같은 파일을 사용하는 모든 Streamlit 세션과 워커 프로세스가 캐시를 공유합니다.
+    검색 결과가 없는 주소(오타 등)도 별도의 TTL로 저장하여 API를 다시 호출하지 않도록 합니다.
+    조회는 DB에 쓰지 않습니다. 적중/실패 횟수와 최근 사용 시각은 메모리에 모았다가 flush()로 한 번에 기록합니다.
+    저장된 항목 수는 geocode_stats의 'entries'에 저장/제거할 때마다 함께 갱신하여, 전체 행을 세지 않습니다.
+    """
+
+    def __init__(self, path=GEOCODE_CACHE_PATH, ttl=GEOCODE_CACHE_TTL,
+                 negative_ttl=GEOCODE_CACHE_NEGATIVE_TTL, max_entries=GEOCODE_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            ttl (int): 정상 결과의 유효 기간 (초)
+            negative_ttl (int): 검색 결과 없음의 유효 기간 (초)
+            max_entries (int): 최대 보관 항목 수
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._local = threading.local()  # 스레드별 커넥션 (Streamlit 세션은 스레드에서 실행됨)
+        self._pending_lock = threading.Lock()
+        self._pending_counts = {'hits': 0, 'misses': 0}  # 아직 기록하지 않은 적중/실패 횟수
+        self._pending_access = {}  # 아직 기록하지 않은 최근 사용 시각 (키 -> time.time)
+        self._flushed_at = time.monotonic()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS geocode (
+                    key TEXT PRIMARY KEY,
+                    lat REAL,
+                    lon REAL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS geocode_last_access ON geocode (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS geocode_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO geocode_stats VALUES ('hits', 0), ('misses', 0)")
+            # 항목 수를 기록하지 않던 이전 캐시 파일은 처음 열 때 한 번만 셉니다.
+            conn.execute("INSERT OR IGNORE INTO geocode_stats SELECT 'entries', COUNT(*) FROM geocode")
+        atexit.register(self.flush)  # 종료할 때 남은 횟수를 기록합니다.
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 프로세스의 동시 읽기를 허용합니다.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, address):
+        """
+        캐시에서 주소의 좌표를 조회합니다.
+
+        Args:
+            address (str): 조회할 주소
+
+        Returns:
+            tuple (bool, tuple or None): (캐시 적중 여부, (위도, 경도) 또는 검색 결과 없음을 뜻하는 None)
+        """
+        key = normalize_address(address)
+        now = time.time()
+        row = self._connect().execute("SELECT lat, lon FROM geocode WHERE key = ? AND expires_at > ?",
+                                      (key, now)).fetchone()
+        with self._pending_lock:
+            self._pending_counts['misses' if row is None else 'hits'] += 1
+            if row is not None:
+                self._pending_access[key] = now
+            due = time.monotonic() - self._flushed_at >= _FLUSH_INTERVAL
+        if due:
+            self.flush()
+        if row is None:
+            return False, None
+        if row[0] is None:
+            return True, None  # 저장된 "검색 결과 없음"
+        return True, (row[0], row[1])
+
+    def put(self, address, coordinates):
+        """
+        주소의 지오코딩 결과를 저장합니다.
+
+        Args:
+            address (str): 주소
+            coordinates (tuple or None): (위도, 경도). 검색 결과가 없는 경우 None
+        """
+        key = normalize_address(address)
+        now = time.time()
+        if coordinates is None:
+            lat = lon = None
+            expires_at = now + self.negative_ttl
+        else:
+            lat, lon = float(coordinates[0]), float(coordinates[1])
+            expires_at = now + self.ttl
+        with self._connect() as conn:
+            self._write_pending(conn)  # 제거할 항목을 고르기 전에 최근 사용 시각을 반영합니다.
+            inserted = conn.execute("INSERT OR IGNORE INTO geocode VALUES (?, ?, ?, ?, ?)",
+                                    (key, lat, lon, expires_at, now)).rowcount
+            if inserted:
+                conn.execute("UPDATE geocode_stats SET value = value + 1 WHERE name = 'entries'")
+            else:
+                conn.execute("UPDATE geocode SET lat = ?, lon = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                             (lat, lon, expires_at, now, key))
+            count = conn.execute("SELECT value FROM geocode_stats WHERE name = 'entries'").fetchone()[0]
+            if count > self.max_entries:
+                # 만료된 항목을 먼저 지우고, 그래도 넘치면 가장 오래 사용되지 않은 항목부터 제거합니다.
+                removed = conn.execute("DELETE FROM geocode WHERE expires_at <= ?", (now,)).rowcount
+                overflow = count - removed - self.max_entries
+                if overflow > 0:
+                    removed += conn.execute(
+                        "DELETE FROM geocode WHERE key IN (SELECT key FROM geocode ORDER BY last_access LIMIT ?)",
+                        (overflow,)).rowcount
+                conn.execute("UPDATE geocode_stats SET value = value - ? WHERE name = 'entries'", (removed,))
+
+    def _write_pending(self, conn):
+        # 모아 둔 횟수와 최근 사용 시각을 conn의 현재 트랜잭션에 기록합니다.
+        with self._pending_lock:
+            counts, self._pending_counts = self._pending_counts, {'hits': 0, 'misses': 0}
+            access, self._pending_access = self._pending_access, {}
+            self._flushed_at = time.monotonic()
+        conn.executemany("UPDATE geocode_stats SET value = value + ? WHERE name = ?",
+                         [(count, name) for name, count in counts.items() if count])
+        conn.executemany("UPDATE geocode SET last_access = max(last_access, ?) WHERE key = ?",
+                         [(seen, key) for key, seen in access.items()])
+
+    def flush(self):
+        """
+        메모리에 모아 둔 적중/실패 횟수와 최근 사용 시각을 한 번의 트랜잭션으로 기록합니다.
+        """
+        with self._pending_lock:
+            if not any(self._pending_counts.values()) and not self._pending_access:
+                return
+        with self._connect() as conn:
+            self._write_pending(conn)
+
+    def entries(self):
+        """
+        유효 기간이 남은 정상 결과(좌표가 있는 항목)를 모두 반환합니다. 주소 자동완성 인덱스 생성에 사용합니다.
+
+        Returns:
+            list: (정규화된 주소, 위도, 경도) 튜플 목록
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT key, lat, lon FROM geocode WHERE lat IS NOT NULL AND expires_at > ?", (time.time(),)
+            ).fetchall()
+
+    def stats(self):
+        """
+        캐시 적중/실패 횟수와 현재 저장된 항목 수를 반환합니다.
+        DB에 쓰지 않으며, 기록된 횟수에 아직 기록하지 않은 이 프로세스의 횟수를 더해 계산합니다.
+
+        Returns:
+            dict: {'hits': int, 'misses': int, 'entries': int, 'hit_rate': float}
+        """
+        counters = dict(self._connect().execute("SELECT name, value FROM geocode_stats").fetchall())
+        with self._pending_lock:
+            hits = counters['hits'] + self._pending_counts['hits']
+            misses = counters['misses'] + self._pending_counts['misses']
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'entries': counters['entries'],
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """
+        저장된 모든 항목과 통계를 삭제합니다.
+        """
+        with self._pending_lock:
+            self._pending_counts = {'hits': 0, 'misses': 0}
+            self._pending_access = {}
+        with self._connect() as conn:
+            conn.execute("DELETE FROM geocode")
+            conn.execute("UPDATE geocode_stats SET value = 0")
@@ -0,0 +1,281 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from dotenv import load_dotenv
+
+from http_client import get_client
+
+# .env 파일 로드
+load_dotenv()
+
+NAVER_CLIENT_ID = os.getenv('NAVER_CLIENT_ID')  # 환경 변수에서 네이버 클라이언트 ID를 불러옵니다.
+NAVER_CLIENT_SECRET = os.getenv('NAVER_CLIENT_SECRET')  # 환경 변수에서 네이버 클라이언트 비밀 키를 불러옵니다.
+NAVER_GEOCODE_URL = "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode"  # 네이버 Geocoding API 엔드포인트 URL입니다.
+
+
+class GeocodeError(Exception):
+    """
+    지오코딩 API 호출 자체가 실패한 경우(네트워크 오류, 200이 아닌 응답 등) 발생하는 예외입니다.
+    검색 결과가 없는 경우는 예외가 아니라 None으로 표현합니다.
+    """
+
+
+def geocode_naver(address):
+    """
+    네이버 Geocoding API로 주소를 GPS 좌표(위도, 경도)로 변환합니다.
+    Streamlit에 의존하지 않으므로 앱과 일괄 처리 스크립트에서 함께 사용합니다.
+
+    Args:
+        address (str): GPS 좌표를 얻고자 하는 주소 문자열입니다.
+
+    Returns:
+        tuple (float, float): 위도와 경도. 검색 결과가 없는 경우 None을 반환합니다.
+
+    Raises:
+        GeocodeError: API 호출에 실패한 경우
+    """
+    headers = {
+        "X-NCP-APIGW-API-KEY-ID": NAVER_CLIENT_ID,
+        "X-NCP-APIGW-API-KEY": NAVER_CLIENT_SECRET
+    }
+    try:
+        response = get_client().get('naver_geocode', NAVER_GEOCODE_URL, headers=headers, params={"query": address})
+    except requests.RequestException as e:
+        raise GeocodeError(f"Naver API 요청 중 오류가 발생했습니다: {e}") from e
+
+    if response.status_code != 200:
+        raise GeocodeError(f"Naver API 요청에 실패했습니다. 상태 코드: {response.status_code}")
+    result = response.json()
+    if result['meta']['totalCount'] > 0:  # 검색 결과가 있는 경우, 첫 번째 결과를 사용합니다.
+        return float(result['addresses'][0]['y']), float(result['addresses'][0]['x'])
+    return None
+
+
+class NaverProvider:
+    """
+    네이버 Geocoding API 제공자입니다.
+    """
+    name = 'naver'
+
+    def geocode(self, address):
+        return geocode_naver(address)
+
+
+class NominatimProvider:
+    """
+    OpenStreetMap Nominatim 제공자입니다. (geopy 사용)
+    """
+    name = 'nominatim'
+
+    def __init__(self, user_agent="address_to_map", timeout=10):
+        from geopy.geocoders import Nominatim
+        self.geolocator = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    def geocode(self, address):
+        from geopy.exc import GeopyError
+        try:
+            location = self.geolocator.geocode(address)
+        except GeopyError as e:
+            raise GeocodeError(f"Nominatim 요청 중 오류가 발생했습니다: {e}") from e
+        return (location.latitude, location.longitude) if location else None
+
+
+class CallableProvider:
+    """
+    임의의 함수를 제공자로 감쌉니다. 테스트나 벤치마크에서 로컬 가짜 지오코더로 교체할 때 사용합니다.
+    """
+
+    def __init__(self, name, func):
+        """
+        Args:
+            name (str): 제공자 이름
+            func (function): 주소를 받아 (위도, 경도) 또는 None을 반환하고, 실패 시 GeocodeError를 발생시키는 함수
+        """
+        self.name = name
+        self.geocode = func
+
+
+class CircuitBreaker:
+    """
+    연속으로 실패하는 제공자를 일정 시간 동안 호출 대상에서 제외하는 서킷 브레이커입니다.
+    닫힘(정상) -> 열림(차단) -> 반열림(시험 호출 1회 허용) 상태로 전이합니다.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Args:
+            failure_threshold (int): 차단을 시작할 연속 실패 횟수
+            reset_timeout (float): 차단 후 시험 호출을 허용하기까지의 시간 (초)
+            clock (function): 현재 시간 함수 (테스트에서 교체 가능)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        """
+        지금 호출해도 되는지 여부를 반환합니다. 반열림 상태에서는 시험 호출을 한 번만 허용합니다.
+        """
+        with self.lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()  # 반열림 상태의 시험 호출이 실패하면 다시 차단합니다.
+
+
+class ProviderStats:
+    """
+    제공자별 최근 응답 시간을 보관하여 이동 중앙값을 계산합니다.
+    """
+
+    def __init__(self, window=50):
+        self.latencies = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def median(self):
+        with self.lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[len(ordered) // 2]
+
+
+class GeocoderChain:
+    """
+    여러 지오코딩 제공자를 묶어 하나의 지오코더처럼 사용합니다.
+    최근 응답 시간이 가장 빠른 정상 제공자에게 먼저 요청하고, hedge_delay 안에 응답이 없으면
+    다음 제공자에게 동시에(hedged) 요청하여 먼저 도착한 성공 응답을 사용합니다.
+    계속 실패하는 제공자는 서킷 브레이커로 차단합니다.
+    """
+
+    def __init__(self, providers, hedge_delay=0.5, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic,
+                 failure_penalty=2.0):
+        """
+        Args:
+            providers (list): name 속성과 geocode(address) 메서드를 가진 제공자 목록 (기본 우선순위 순)
+            hedge_delay (float): 다음 제공자에게 추가 요청을 보내기 전 기다리는 시간 (초)
+            failure_threshold (int): 제공자 차단을 시작할 연속 실패 횟수
+            reset_timeout (float): 차단된 제공자에게 다시 시험 호출을 보내기까지의 시간 (초)
+            clock (function): 서킷 브레이커가 사용할 현재 시간 함수
+            failure_penalty (float): 실패한 호출의 응답 시간에 더하는 벌점 (초)
+        """
+        self.providers = list(providers)
+        self.hedge_delay = hedge_delay
+        self.failure_penalty = failure_penalty
+        self.breakers = {p.name: CircuitBreaker(failure_threshold, reset_timeout, clock) for p in self.providers}
+        self.stats = {p.name: ProviderStats() for p in self.providers}
+        self.executor = ThreadPoolExecutor(max_workers=max(2, len(self.providers) * 4), thread_name_prefix='geocoder')
+
+    def ranked_providers(self):
+        """
+        응답 시간 중앙값이 빠른 순서로 정렬된 제공자 목록을 반환합니다.
+        아직 통계가 없는 제공자는 기본 우선순위의 자리를 그대로 지키고, 통계가 있는 제공자끼리만 자리를 바꿉니다.
+        """
+        medians = [self.stats[p.name].median() for p in self.providers]
+        slots = [order for order, median in enumerate(medians) if median is not None]
+        ranked = list(self.providers)
+        for slot, order in zip(slots, sorted(slots, key=lambda order: (medians[order], order))):
+            ranked[slot] = self.providers[order]
+        return ranked
+
+    def _call(self, provider, address):
+        started = time.perf_counter()
+        try:
+            result = provider.geocode(address)
+        except Exception:
+            # 바로 실패하는 제공자가 빠른 제공자로 앞에 오지 않도록, 실패한 호출은 벌점을 더해 기록합니다.
+            self.stats[provider.name].observe(time.perf_counter() - started + self.failure_penalty)
+            self.breakers[provider.name].record_failure()
+            raise
+        self.stats[provider.name].observe(time.perf_counter() - started)
+        self.breakers[provider.name].record_success()
+        return result
+
+    def geocode(self, address):
+        """
+        주소를 GPS 좌표로 변환합니다.
+
+        Args:
+            address (str): 주소
+
+        Returns:
+            tuple (float, float): 위도와 경도. 검색 결과가 없는 경우 None을 반환합니다.
+
+        Raises:
+            GeocodeError: 호출 가능한 모든 제공자가 실패한 경우
+        """
+        candidates = iter(self.ranked_providers())
+        pending = set()
+        errors = []
+
+        def launch_next():
+            for provider in candidates:
+                if self.breakers[provider.name].allow():
+                    pending.add(self.executor.submit(self._call, provider, address))
+                    return True
+            return False
+
+        launch_next()
+        while pending:
+            # 남은 제공자가 있으면 hedge_delay 만큼만 기다렸다가 추가 요청을 보냅니다.
+            done, _ = wait(pending, timeout=self.hedge_delay, return_when=FIRST_COMPLETED)
+            if not done:
+                launch_next()
+                continue
+            for future in done:
+                pending.discard(future)
+                try:
+                    return future.result()  # 먼저 도착한 성공 응답을 사용합니다. (늦게 끝난 요청은 통계에만 반영)
+                except Exception as e:
+                    errors.append(e)
+            if not pending:
+                launch_next()  # 실패한 경우 기다리지 않고 바로 다음 제공자에게 요청합니다.
+        raise GeocodeError(f"사용 가능한 지오코딩 제공자가 모두 실패했습니다: {errors}")
+
+    def health(self):
+        """
+        제공자별 상태를 반환합니다.
+
+        Returns:
+            dict: 제공자 이름 -> {'state': 서킷 상태, 'median_latency': 응답 시간 중앙값(초)}
+        """
+        return {
+            p.name: {'state': self.breakers[p.name].state, 'median_latency': self.stats[p.name].median()}
+            for p in self.providers
+        }
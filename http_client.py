@@ -0,0 +1,175 @@
+import asyncio
+import bisect
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 엔드포인트별 (연결, 읽기) 타임아웃 (초)
+ENDPOINT_TIMEOUTS = {
+    'naver_geocode': (3.05, 5),
+    'kma_weather': (3.05, 10),
+}
+DEFAULT_TIMEOUT = (3.05, 10)
+RETRY_STATUS = {429, 500, 502, 503, 504}  # 재시도할 응답 상태 코드
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # 지연 시간 히스토그램 구간 상한 (초)
+
+
+class LatencyHistogram:
+    """
+    엔드포인트 하나의 응답 지연 시간을 고정 구간 히스토그램으로 집계합니다.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 최대 구간을 넘는 경우
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds, error=False):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+            self.count += 1
+            self.errors += int(error)
+
+    def quantile(self, q):
+        """
+        히스토그램에서 분위수의 근사값(해당 구간의 상한)을 반환합니다.
+        """
+        with self.lock:
+            if not self.count:
+                return None
+            target = q * self.count
+            seen = 0
+            for upper, n in zip(self.buckets + (float('inf'),), self.counts):
+                seen += n
+                if seen >= target:
+                    return upper
+        return float('inf')
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: 호출 수, 오류 수, 평균, p50/p95 근사값, 구간별 건수
+        """
+        with self.lock:
+            labels = [f"<={b}s" for b in self.buckets] + [f">{self.buckets[-1]}s"]
+            counts = dict(zip(labels, self.counts))
+            count, total, errors = self.count, self.total, self.errors
+        return {
+            'count': count,
+            'errors': errors,
+            'mean': total / count if count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': counts,
+        }
+
+
+class HttpClient:
+    """
+    커넥션 풀을 재사용하는 공용 HTTP 클라이언트입니다.
+    엔드포인트별 타임아웃, 지터가 섞인 지수 백오프 재시도, 지연 시간 히스토그램을 제공합니다.
+    """
+
+    def __init__(self, timeouts=None, max_retries=2, backoff=0.2, pool_size=20):
+        """
+        Args:
+            timeouts (dict, optional): 엔드포인트 이름 -> (연결, 읽기) 타임아웃
+            max_retries (int): 최초 요청 이후 최대 재시도 횟수
+            backoff (float): 백오프 기본 대기 시간 (초). 재시도마다 2배씩 늘어납니다.
+            pool_size (int): 호스트별 유지할 keep-alive 커넥션 수
+        """
+        self.timeouts = dict(ENDPOINT_TIMEOUTS, **(timeouts or {}))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def _histogram(self, endpoint):
+        with self.lock:
+            if endpoint not in self.histograms:
+                self.histograms[endpoint] = LatencyHistogram()
+            return self.histograms[endpoint]
+
+    def _sleep_before_retry(self, attempt):
+        # 전체 지터(full jitter): 0 ~ backoff * 2^attempt 사이에서 무작위로 대기합니다.
+        time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    def get(self, endpoint, url, **kwargs):
+        """
+        GET 요청을 보냅니다. 연결 오류, 타임아웃, 429/5xx 응답은 정해진 횟수만큼 재시도합니다.
+
+        Args:
+            endpoint (str): 타임아웃과 통계를 구분하는 엔드포인트 이름 (예: 'naver_geocode')
+            url (str): 요청 URL
+            **kwargs: requests.Session.get에 전달할 인자 (params, headers 등)
+
+        Returns:
+            requests.Response: 마지막 응답. 재시도 후에도 실패 상태이면 그 응답을 그대로 반환합니다.
+
+        Raises:
+            requests.RequestException: 재시도 후에도 연결 오류나 타임아웃이 계속되는 경우
+        """
+        kwargs.setdefault('timeout', self.timeouts.get(endpoint, DEFAULT_TIMEOUT))
+        histogram = self._histogram(endpoint)
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                histogram.observe(time.perf_counter() - started, error=True)
+                if attempt == self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt)
+                continue
+            retry = response.status_code in RETRY_STATUS
+            histogram.observe(time.perf_counter() - started, error=retry)
+            if not retry or attempt == self.max_retries:
+                return response
+            response.close()
+            self._sleep_before_retry(attempt)
+
+    async def aget(self, endpoint, url, **kwargs):
+        """
+        get()의 비동기 버전입니다. 같은 커넥션 풀을 사용하며 별도 스레드에서 실행됩니다.
+        """
+        return await asyncio.to_thread(self.get, endpoint, url, **kwargs)
+
+    def latency_stats(self):
+        """
+        엔드포인트별 지연 시간 히스토그램을 반환합니다.
+
+        Returns:
+            dict: 엔드포인트 이름 -> LatencyHistogram.snapshot() 결과
+        """
+        with self.lock:
+            histograms = dict(self.histograms)
+        return {endpoint: histogram.snapshot() for endpoint, histogram in histograms.items()}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    프로세스 전체에서 공유하는 HttpClient 객체를 반환합니다.
+
+    Returns:
+        HttpClient: 공용 HTTP 클라이언트
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,93 @@
+import numpy as np
+
+from distance_engine import ELLIPSOIDAL, PolylineDistances, distances, polyline_distances, pruning_limit, row_distances
+
+
+class ImpactEngine:
+    """
+    화재 지점 반경 안의 시설물을 찾는 엔진입니다. 직전 조회의 후보와 거리를 기억해 두고,
+    화재 지점을 조금 옮기거나 반경을 바꾼 경우 삼각 부등식으로 결과가 바뀔 수 있는 시설물만 다시 계산합니다.
+
+    기준 조회(anchor)에서는 반경 + margin(reach) 안의 모든 시설물과 그 거리를 저장합니다.
+    기준점에서 shift만큼 옮긴 지점의 반경 radius 조회는, radius + shift <= reach이면 결과가 저장된 후보 안에 있으므로
+    전체를 다시 계산하지 않습니다. 후보 중 (기준 거리 - shift)가 radius보다 먼 시설물은 계산 없이 제외합니다.
+    """
+
+    def __init__(self, lines, index=None, margin=100.0, method=ELLIPSOIDAL):
+        """
+        Args:
+            lines (LineStrings): 시설물 선형
+            index (SpatialIndex or ShardedImpact, optional): 기준 조회에 사용할 within() 제공 객체
+                (없으면 경계 상자로 가지치기한 전체 계산)
+            margin (float): 기준 조회에서 반경 밖으로 더 저장해 둘 거리 (미터). 이만큼 옮기기 전까지는 부분 계산만 합니다.
+            method (str): 거리 계산 방식
+        """
+        self.lines = lines
+        self.index = index
+        self.margin = margin
+        self.method = method
+        self.anchor = None  # (위도, 경도, reach, 후보 행 번호, 기준 거리)
+        self.metrics = {'full': 0, 'incremental': 0, 'evaluated': 0, 'skipped': 0}
+
+    def reset(self):
+        """
+        저장된 기준 조회를 지웁니다. 다음 조회는 전체 계산을 합니다.
+        """
+        self.anchor = None
+
+    def _full(self, latitude, longitude, reach):
+        # 기준 조회: reach 안의 모든 시설물과 거리를 구해 저장합니다.
+        if self.index is not None:
+            rows, result = self.index.within(latitude, longitude, reach, self.method)
+        else:
+            result = polyline_distances(self.lines, latitude, longitude, reach, self.method)
+            rows = np.flatnonzero(np.isfinite(result.distance))
+            result = PolylineDistances(*(values[rows] for values in result))
+        self.anchor = (latitude, longitude, reach, rows, result.distance)
+        self.metrics['full'] += 1
+        self.metrics['evaluated'] += len(rows)
+        return rows, result
+
+    def query(self, latitude, longitude, radius):
+        """
+        화재 지점에서 radius 안에 있는 시설물을 가까운 순서로 반환합니다.
+
+        Args:
+            latitude (float): 화재 지점 위도
+            longitude (float): 화재 지점 경도
+            radius (float): 반경 (미터)
+
+        Returns:
+            tuple (np.ndarray, PolylineDistances): 행 번호와 그 행들의 거리 정보
+        """
+        shift = None
+        if self.anchor is not None:
+            anchor_lat, anchor_lon, reach = self.anchor[:3]
+            shift = float(distances(anchor_lat, anchor_lon, np.array([latitude]), np.array([longitude]), self.method)[0])
+            if pruning_limit(radius + shift) > reach:
+                shift = None  # 많이 옮겨져 저장된 후보 밖의 시설물도 반경 안에 들어올 수 있습니다.
+
+        if shift is None:
+            rows, result = self._full(latitude, longitude, radius + self.margin)
+        else:
+            self.metrics['incremental'] += 1
+            rows, anchor_distance = self.anchor[3], self.anchor[4]
+            # 삼각 부등식: 새 거리 >= 기준 거리 - shift. 이 하한이 반경보다 먼 시설물은 계산하지 않습니다.
+            affected = anchor_distance - shift <= pruning_limit(radius)
+            rows = rows[affected]
+            self.metrics['evaluated'] += len(rows)
+            self.metrics['skipped'] += len(affected) - len(rows)
+            result = row_distances(self.lines, rows, latitude, longitude, self.method)
+
+        keep = np.flatnonzero(result.distance <= radius)
+        keep = keep[np.argsort(result.distance[keep], kind='stable')]
+        return rows[keep], PolylineDistances(*(values[keep] for values in result))
+
+    def stats(self):
+        """
+        조회 지표를 반환합니다.
+
+        Returns:
+            dict: 전체/부분 계산 횟수, 거리를 계산한 시설물 수, 계산 없이 제외한 시설물 수, 저장된 후보 수
+        """
+        return dict(self.metrics, anchor_candidates=0 if self.anchor is None else len(self.anchor[3]))
@@ -0,0 +1,169 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BANDS = (50, 100, 200, 500, 1000)  # 거리대 경계 (미터)
+CHUNK_ROWS = 5000  # 내보내기에서 한 번에 만드는 행 수
+_FILE_BLOCK = 1 << 20  # 파일을 읽어 내보낼 때의 블록 크기 (바이트)
+MISSING_CATEGORY = '(없음)'
+
+
+def band_labels(bands=DEFAULT_BANDS):
+    """
+    거리대 이름 목록을 반환합니다. (예: "0-50m", "50-100m", ...)
+    """
+    edges = (0,) + tuple(bands)
+    return [f"{low:g}-{high:g}m" for low, high in zip(edges[:-1], edges[1:])]
+
+
+def assign_bands(distance, bands=DEFAULT_BANDS):
+    """
+    거리를 거리대 번호로 변환합니다. bands[i - 1] < 거리 <= bands[i]이면 i이고, 마지막 경계보다 멀면 len(bands)입니다.
+
+    Args:
+        distance (np.ndarray): 거리 (미터)
+        bands (tuple): 오름차순 거리대 경계 (미터)
+
+    Returns:
+        np.ndarray: 거리대 번호
+    """
+    return np.searchsorted(np.asarray(bands, dtype=np.float64), distance, side='left')
+
+
+def summarize(df, rows, distance, bands=DEFAULT_BANDS, category_column=None):
+    """
+    후보 시설물을 거리대와 분류별로 한 번에 집계합니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        rows (np.ndarray): 후보 행 번호 (위치 기준)
+        distance (np.ndarray): rows와 같은 순서의 거리 (미터)
+        bands (tuple): 오름차순 거리대 경계 (미터)
+        category_column (str, optional): 분류 컬럼 이름 (없으면 전체 건수만 집계)
+
+    Returns:
+        pd.DataFrame: 거리대별 행, 분류별 건수 컬럼과 '합계', '누적' 컬럼
+    """
+    band = assign_bands(distance, bands)
+    inside = band < len(bands)
+    band = band[inside]
+    if category_column is None:
+        codes, categories = np.zeros(len(band), dtype=np.int64), []
+    else:
+        codes, categories = pd.factorize(df[category_column].iloc[rows[inside]], sort=True)
+        categories = list(categories)
+        if (codes < 0).any():
+            codes = np.where(codes < 0, len(categories), codes)  # 분류 값이 없는 행
+            categories.append(MISSING_CATEGORY)
+    width = max(len(categories), 1)
+    counts = np.bincount(band * width + codes, minlength=len(bands) * width).reshape(len(bands), width)
+
+    summary = pd.DataFrame(counts if categories else counts[:, :0], index=band_labels(bands), columns=categories)
+    summary.index.name = '거리대'
+    summary['합계'] = counts.sum(axis=1)
+    summary['누적'] = np.cumsum(summary['합계'].to_numpy())
+    return summary
+
+
+def iter_report_chunks(df, rows, result, bands=DEFAULT_BANDS, chunk_rows=CHUNK_ROWS):
+    """
+    마지막 거리대 안의 시설물 상세 행을 chunk_rows개씩 DataFrame으로 만들어 차례로 반환합니다.
+    전체 상세 결과를 한 번에 만들지 않습니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        rows (np.ndarray): 후보 행 번호 (위치 기준, 가까운 순서)
+        result (PolylineDistances): rows와 같은 순서의 거리 계산 결과
+        bands (tuple): 오름차순 거리대 경계 (미터)
+        chunk_rows (int): 한 번에 만드는 행 수
+
+    Yields:
+        pd.DataFrame: 시설물 컬럼과 '거리대', '거리', '최근접위도', '최근접경도' 컬럼
+    """
+    labels = np.array(band_labels(bands) + [''], dtype=object)
+    band = assign_bands(result.distance, bands)
+    inside = np.flatnonzero(band < len(bands))
+    for start in range(0, len(inside), chunk_rows):
+        part = inside[start:start + chunk_rows]
+        chunk = df.iloc[rows[part]]
+        yield chunk.assign(**{
+            '거리대': labels[band[part]],
+            '거리': np.round(result.distance[part], 1),
+            '최근접위도': result.closest_lat[part],
+            '최근접경도': result.closest_lon[part],
+        })
+
+
+def iter_csv(chunks):
+    """
+    DataFrame 묶음을 CSV 바이트 조각으로 변환합니다. (Excel에서 한글이 깨지지 않도록 UTF-8 BOM 포함)
+
+    Args:
+        chunks (iterable): iter_report_chunks()가 반환하는 DataFrame 묶음
+
+    Yields:
+        bytes: CSV 조각
+    """
+    first = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=first).encode('utf-8-sig' if first else 'utf-8')
+        first = False
+
+
+def iter_excel(chunks, sheet_name='영향시설물'):
+    """
+    DataFrame 묶음을 Excel(.xlsx) 파일 바이트 조각으로 변환합니다.
+    openpyxl의 write_only 모드로 임시 파일에 한 행씩 기록하므로, 시트 전체를 메모리에 만들지 않습니다.
+
+    Args:
+        chunks (iterable): iter_report_chunks()가 반환하는 DataFrame 묶음
+        sheet_name (str): 시트 이름
+
+    Yields:
+        bytes: .xlsx 파일 조각
+    """
+    from openpyxl import Workbook  # Excel 내보내기를 사용할 때만 필요합니다.
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    header = False
+    for chunk in chunks:
+        if not header:
+            sheet.append(list(chunk.columns))
+            header = True
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+
+    handle, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(handle)
+    try:
+        workbook.save(path)
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(_FILE_BLOCK)
+                if not block:
+                    break
+                yield block
+    finally:
+        os.remove(path)
+
+
+def spool(parts):
+    """
+    바이트 조각을 임시 파일에 차례로 기록하고, 처음 위치로 되돌린 파일 객체를 반환합니다.
+    (st.download_button처럼 파일 객체를 받는 곳에 전달)
+
+    Args:
+        parts (iterable): bytes 조각
+
+    Returns:
+        file: 읽기 가능한 임시 파일 객체 (닫으면 삭제됩니다.)
+    """
+    f = tempfile.TemporaryFile()
+    for part in parts:
+        f.write(part)
+    f.seek(0)
+    return f
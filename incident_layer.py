@@ -0,0 +1,78 @@
+import folium
+
+# 화재 상황 레이어의 칸 (그리는 순서)
+WIND = 'wind'  # 바람 방향 영향 영역
+RINGS = 'rings'  # 영향 반경 원
+FIRE = 'fire'  # 화재 지점 마커
+SLOTS = (WIND, RINGS, FIRE)
+
+
+class IncidentLayer(folium.FeatureGroup):
+    """
+    화재 지점 마커, 영향 반경 원, 바람 방향 영역처럼 화재 상황에 따라 바뀌는 요소를 모아 두는 레이어입니다.
+    요소는 이름 붙은 칸(SLOTS)에 하나씩 들어가며, 같은 칸에 새 요소를 넣으면 이전 요소를 바로 대체합니다.
+    지도의 다른 요소를 순회하지 않으므로, 지도에 정적 요소가 아무리 많아도 교체 비용은 일정합니다.
+    """
+
+    def __init__(self, name='화재 상황'):
+        """
+        Args:
+            name (str): 레이어 이름
+        """
+        super().__init__(name=name)
+
+    def set(self, slot, element):
+        """
+        칸의 요소를 교체합니다. element가 None이면 칸을 비웁니다.
+
+        Args:
+            slot (str): 칸 이름 (WIND, RINGS, FIRE)
+            element (folium.Element): 새 요소 (없으면 None)
+
+        Raises:
+            ValueError: 알 수 없는 칸 이름인 경우
+        """
+        if slot not in SLOTS:
+            raise ValueError(f"알 수 없는 화재 상황 레이어 칸입니다: {slot}")
+        if element is None:
+            self._children.pop(slot, None)
+            return
+        self.add_child(element, name=slot)
+        # 칸을 처음 채울 때도 SLOTS 순서로 그려지도록 정렬합니다. (칸은 3개뿐입니다.)
+        for name in SLOTS:
+            if name in self._children:
+                self._children.move_to_end(name)
+
+    def get(self, slot):
+        """
+        칸의 요소를 반환합니다. (비어 있으면 None)
+        """
+        return self._children.get(slot)
+
+
+def fire_marker(latitude, longitude):
+    """
+    화재 지점 마커를 만듭니다.
+    """
+    fire_icon = folium.Icon(color="red", icon="fire", prefix="fa")
+    return folium.Marker(location=[latitude, longitude], icon=fire_icon, popup="화재 지점")
+
+
+def radius_ring(latitude, longitude, radius):
+    """
+    화재 지점 둘레의 영향 반경 원을 만듭니다.
+
+    Args:
+        latitude (float): 화재 지점 위도
+        longitude (float): 화재 지점 경도
+        radius (float): 반경 (미터)
+    """
+    return folium.Circle([latitude, longitude], radius=radius, color="red", weight=2, fill=False)
+
+
+def wind_area(zone):
+    """
+    바람 방향 영향 영역(WindZone)의 경계 다각형을 만듭니다.
+    """
+    return folium.Polygon(zone.boundary(), color="orange", weight=2, fill=True, fill_opacity=0.15,
+                          tooltip=zone.describe())
@@ -0,0 +1,194 @@
+import math
+
+import numpy as np
+
+# 기상청 동네예보 격자 (Lambert Conformal Conic 투영) 상수
+RE = 6371.00877  # 지구 반경 (km)
+GRID = 5.0  # 격자 간격 (km)
+SLAT1 = 30.0  # 투영 표준 위도 1 (도)
+SLAT2 = 60.0  # 투영 표준 위도 2 (도)
+OLON = 126.0  # 기준점 경도 (도)
+OLAT = 38.0  # 기준점 위도 (도)
+XO = 43  # 기준점 X 격자 좌표
+YO = 136  # 기준점 Y 격자 좌표
+
+# 투영 상수는 한 번만 계산합니다.
+_DEGRAD = math.pi / 180.0
+_re = RE / GRID
+_slat1 = SLAT1 * _DEGRAD
+_slat2 = SLAT2 * _DEGRAD
+_olon = OLON * _DEGRAD
+_olat = OLAT * _DEGRAD
+_sn = math.log(math.cos(_slat1) / math.cos(_slat2)) / math.log(
+    math.tan(math.pi * 0.25 + _slat2 * 0.5) / math.tan(math.pi * 0.25 + _slat1 * 0.5))
+_sf = math.tan(math.pi * 0.25 + _slat1 * 0.5) ** _sn * math.cos(_slat1) / _sn
+_ro = _re * _sf / math.tan(math.pi * 0.25 + _olat * 0.5) ** _sn
+
+# 조회 테이블을 미리 만들어 둘 주요 지역 (최소 위도, 최대 위도, 최소 경도, 최대 경도)
+HOT_REGIONS = {
+    'busan': (34.85, 35.45, 128.70, 129.35),
+    'seoul': (37.40, 37.75, 126.75, 127.20),
+}
+
+
+def latlon_to_grid(latitude, longitude):
+    """
+    WGS84 위도/경도를 기상청 동네예보 격자 좌표(nx, ny)로 변환합니다.
+    단일 좌표와 NumPy 배열을 모두 지원합니다.
+
+    Args:
+        latitude (float or array-like): 위도
+        longitude (float or array-like): 경도
+
+    Returns:
+        tuple: (nx, ny). 입력이 배열이면 정수 배열, 단일 값이면 int를 반환합니다.
+    """
+    lat = np.asarray(latitude, dtype=np.float64)
+    lon = np.asarray(longitude, dtype=np.float64)
+    ra = _re * _sf / np.tan(np.pi * 0.25 + lat * _DEGRAD * 0.5) ** _sn
+    theta = lon * _DEGRAD - _olon
+    theta = np.where(theta > np.pi, theta - 2.0 * np.pi, theta)
+    theta = np.where(theta < -np.pi, theta + 2.0 * np.pi, theta)
+    theta *= _sn
+    nx = np.floor(ra * np.sin(theta) + XO + 0.5).astype(np.int64)
+    ny = np.floor(_ro - ra * np.cos(theta) + YO + 0.5).astype(np.int64)
+    if nx.ndim == 0:
+        return int(nx), int(ny)
+    return nx, ny
+
+
+def grid_to_latlon(nx, ny):
+    """
+    기상청 격자 좌표(nx, ny)를 격자 중심의 위도/경도로 변환합니다.
+
+    Args:
+        nx (int or array-like): X 격자 좌표
+        ny (int or array-like): Y 격자 좌표
+
+    Returns:
+        tuple: (위도, 경도)
+    """
+    xn = np.asarray(nx, dtype=np.float64) - XO
+    yn = _ro - (np.asarray(ny, dtype=np.float64) - YO)
+    ra = np.sign(_sn) * np.hypot(xn, yn)
+    alat = 2.0 * np.arctan((_re * _sf / ra) ** (1.0 / _sn)) - np.pi * 0.5
+    theta = np.arctan2(xn, yn)
+    alon = theta / _sn + _olon
+    lat, lon = alat / _DEGRAD, alon / _DEGRAD
+    if lat.ndim == 0:
+        return float(lat), float(lon)
+    return lat, lon
+
+
+class GridLookup:
+    """
+    지정한 영역을 작은 칸으로 나누어, 칸 전체가 하나의 기상청 격자에 속하는 경우 그 격자 좌표를 미리 저장해 두는 조회 테이블입니다.
+    격자 경계에 걸친 칸은 -1로 표시하고, 해당 좌표만 투영 공식을 직접 계산하므로 결과는 latlon_to_grid와 항상 같습니다.
+    """
+
+    def __init__(self, bounds, step=0.005):
+        """
+        Args:
+            bounds (tuple): (최소 위도, 최대 위도, 최소 경도, 최대 경도)
+            step (float): 조회 테이블 칸 크기 (도)
+        """
+        self.lat_min, self.lat_max, self.lon_min, self.lon_max = bounds
+        self.step = step
+        rows = int(math.ceil((self.lat_max - self.lat_min) / step))
+        cols = int(math.ceil((self.lon_max - self.lon_min) / step))
+        # 칸의 네 꼭짓점이 모두 같은 격자에 속하면 칸 전체가 그 격자에 속합니다. (투영은 작은 범위에서 단조)
+        lat_edges = self.lat_min + np.arange(rows + 1) * step
+        lon_edges = self.lon_min + np.arange(cols + 1) * step
+        grid_lat, grid_lon = np.meshgrid(lat_edges, lon_edges, indexing='ij')
+        nx, ny = latlon_to_grid(grid_lat, grid_lon)
+        same = np.ones((rows, cols), dtype=bool)
+        for a, b in ((slice(None, -1), slice(1, None)), (slice(1, None), slice(None, -1)), (slice(1, None), slice(1, None))):
+            same &= (nx[a, b] == nx[:-1, :-1]) & (ny[a, b] == ny[:-1, :-1])
+        self.nx = np.where(same, nx[:-1, :-1], -1).astype(np.int16)
+        self.ny = np.where(same, ny[:-1, :-1], -1).astype(np.int16)
+        self._nx_rows = self.nx.tolist()  # 단일 좌표 조회용 (NumPy 스칼라 변환 비용을 피합니다.)
+        self._ny_rows = self.ny.tolist()
+
+    def contains(self, latitude, longitude):
+        return self.lat_min <= latitude < self.lat_max and self.lon_min <= longitude < self.lon_max
+
+    def convert(self, latitude, longitude):
+        """
+        조회 테이블을 사용하여 격자 좌표로 변환합니다. 단일 좌표와 NumPy 배열을 모두 지원합니다.
+        영역 밖이거나 격자 경계에 걸친 좌표는 투영 공식으로 계산합니다.
+
+        Args:
+            latitude (float or array-like): 위도
+            longitude (float or array-like): 경도
+
+        Returns:
+            tuple: (nx, ny)
+        """
+        if _is_scalar(latitude):
+            # 단일 좌표는 NumPy 배열을 만들지 않고 파이썬 연산으로 처리합니다.
+            latitude, longitude = float(latitude), float(longitude)
+            if self.contains(latitude, longitude):
+                r = int((latitude - self.lat_min) / self.step)
+                c = int((longitude - self.lon_min) / self.step)
+                nx = self._nx_rows[r][c]
+                if nx >= 0:
+                    return nx, self._ny_rows[r][c]
+            return latlon_to_grid(latitude, longitude)
+
+        lat = np.asarray(latitude, dtype=np.float64)
+        lon = np.asarray(longitude, dtype=np.float64)
+        r = np.floor((lat - self.lat_min) / self.step).astype(np.int64)
+        c = np.floor((lon - self.lon_min) / self.step).astype(np.int64)
+        inside = (r >= 0) & (r < self.nx.shape[0]) & (c >= 0) & (c < self.nx.shape[1])
+        nx = np.full(lat.shape, -1, dtype=np.int64)
+        ny = np.full(lat.shape, -1, dtype=np.int64)
+        nx[inside] = self.nx[r[inside], c[inside]]
+        ny[inside] = self.ny[r[inside], c[inside]]
+        missing = nx < 0
+        if missing.any():
+            nx[missing], ny[missing] = latlon_to_grid(lat[missing], lon[missing])
+        return nx, ny
+
+
+_lookups = None
+
+
+def _is_scalar(value):
+    # 파이썬 float/int는 np.ndim 호출 없이 바로 판별합니다. (단일 좌표 변환의 대부분이 여기서 끝납니다.)
+    return isinstance(value, (int, float)) or np.ndim(value) == 0
+
+
+def to_grid(latitude, longitude):
+    """
+    위도/경도를 기상청 격자 좌표로 변환합니다.
+    주요 지역(HOT_REGIONS)은 미리 만들어 둔 조회 테이블을 사용하고, 그 밖은 투영 공식으로 계산합니다.
+
+    Args:
+        latitude (float or array-like): 위도
+        longitude (float or array-like): 경도
+
+    Returns:
+        tuple: (nx, ny)
+    """
+    global _lookups
+    if _lookups is None:
+        _lookups = [GridLookup(bounds) for bounds in HOT_REGIONS.values()]
+    if _is_scalar(latitude):
+        for lookup in _lookups:
+            if lookup.contains(latitude, longitude):
+                return lookup.convert(latitude, longitude)
+        return latlon_to_grid(latitude, longitude)
+
+    lat = np.asarray(latitude, dtype=np.float64)
+    lon = np.asarray(longitude, dtype=np.float64)
+    nx = np.empty(lat.shape, dtype=np.int64)
+    ny = np.empty(lat.shape, dtype=np.int64)
+    remaining = np.ones(lat.shape, dtype=bool)
+    for lookup in _lookups:
+        inside = remaining & (lat >= lookup.lat_min) & (lat < lookup.lat_max) & (lon >= lookup.lon_min) & (lon < lookup.lon_max)
+        if inside.any():
+            nx[inside], ny[inside] = lookup.convert(lat[inside], lon[inside])
+            remaining &= ~inside
+    if remaining.any():
+        nx[remaining], ny[remaining] = latlon_to_grid(lat[remaining], lon[remaining])
+    return nx, ny
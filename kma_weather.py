@@ -0,0 +1,296 @@
+import os
+import re
+
+import numpy as np
+import requests
+from dotenv import load_dotenv
+
+from http_client import get_client
+
+# .env 파일 로드
+load_dotenv()
+
+WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')  # 환경 변수에서 날씨 API 키를 불러옵니다.
+WEATHER_BASE_URL = os.getenv('WEATHER_BASE_URL')  # 환경 변수에서 날씨 API 기본 URL을 불러옵니다. (초단기실황 URL)
+# 동네예보 서비스 주소. WEATHER_BASE_URL(예: .../VilageFcstInfoService_2.0/getUltraSrtNcst)에서 오퍼레이션 이름을 뺀 부분입니다.
+WEATHER_SERVICE_URL = os.getenv('WEATHER_SERVICE_URL') or (
+    WEATHER_BASE_URL.rsplit('/', 1)[0] if WEATHER_BASE_URL else
+    "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0")
+
+# 오퍼레이션 이름
+ULTRA_SHORT_NOWCAST = 'getUltraSrtNcst'  # 초단기실황
+ULTRA_SHORT_FORECAST = 'getUltraSrtFcst'  # 초단기예보
+SHORT_FORECAST = 'getVilageFcst'  # 단기예보
+
+PAGE_SIZE = 1000  # 한 페이지에 요청할 항목 수
+
+# 저장할 자료 구분 코드 (열 순서)
+CATEGORIES = (
+    'T1H',  # 기온 (℃, 초단기)
+    'TMP',  # 1시간 기온 (℃, 단기)
+    'REH',  # 습도 (%)
+    'RN1',  # 1시간 강수량 (mm, 초단기)
+    'PCP',  # 1시간 강수량 (mm, 단기)
+    'WSD',  # 풍속 (m/s)
+    'VEC',  # 풍향 (deg)
+    'UUU',  # 동서바람성분 (m/s)
+    'VVV',  # 남북바람성분 (m/s)
+    'PTY',  # 강수형태 (코드)
+    'SKY',  # 하늘상태 (코드)
+    'POP',  # 강수확률 (%)
+    'LGT',  # 낙뢰 (kA)
+    'SNO',  # 1시간 신적설 (cm)
+)
+CATEGORY_INDEX = {category: i for i, category in enumerate(CATEGORIES)}
+_NUMBER = re.compile(r'[-+]?\d+(?:\.\d+)?')
+MISSING_LOW, MISSING_HIGH = -900, 900  # 기상청 결측값 (-999, -998.9, 900 이상 등)은 이 범위를 벗어납니다.
+
+
+class WeatherError(Exception):
+    """
+    기상청 API 호출 또는 응답 처리에 실패한 경우 발생하는 예외입니다.
+    """
+
+
+def parse_value(value):
+    """
+    기상청 응답 값을 float로 변환합니다. 강수량/적설의 문자열 범주도 숫자로 바꿉니다.
+    ("강수없음"/"적설없음" -> 0.0, "1mm 미만" -> 0.5, "30.0~50.0mm" -> 30.0, "50.0mm 이상" -> 50.0)
+
+    Args:
+        value (str or float): 응답 값
+
+    Returns:
+        float: 변환된 값. 해석할 수 없거나 결측값이면 NaN (결측)
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+        text = ''
+    else:
+        text = str(value).strip()
+        if not text or '없음' in text:
+            return 0.0
+        match = _NUMBER.search(text)
+        if match is None:
+            return float('nan')
+        number = float(match.group())
+    if number <= MISSING_LOW or number >= MISSING_HIGH:
+        return float('nan')  # 기상청 결측값은 실제 관측으로 쓰지 않습니다.
+    if '미만' in text:
+        return number / 2  # 기준값 미만은 기준값의 절반으로 근사합니다.
+    return number
+
+
+class WeatherSeries:
+    """
+    격자 한 칸의 기상 자료를 시간 x 자료 구분(CATEGORIES) 형태의 float64 배열로 보관합니다.
+    초단기실황은 시간이 하나, 예보는 예보 시각마다 한 행입니다. 자료가 없는 칸은 NaN입니다.
+    """
+
+    __slots__ = ('nx', 'ny', 'base_date', 'base_time', 'times', 'values')
+
+    def __init__(self, nx, ny, base_date, base_time, times, values):
+        """
+        Args:
+            nx (int): X 격자 좌표
+            ny (int): Y 격자 좌표
+            base_date (str): 발표 날짜 ("YYYYMMDD")
+            base_time (str): 발표 시간 ("HHMM")
+            times (np.ndarray): 관측/예보 시각 (datetime64[m])
+            values (np.ndarray): (시간 수, len(CATEGORIES)) 크기의 값 배열
+        """
+        self.nx = nx
+        self.ny = ny
+        self.base_date = base_date
+        self.base_time = base_time
+        self.times = times
+        self.values = values
+
+    @classmethod
+    def from_items(cls, items, nx, ny, base_date, base_time):
+        """
+        API 응답 항목 목록을 배열 형태로 변환합니다.
+
+        Args:
+            items (list): API 응답의 item 목록 (obsrValue 또는 fcstDate/fcstTime/fcstValue 포함)
+            nx, ny, base_date, base_time: 요청에 사용한 격자와 발표 시각
+
+        Returns:
+            WeatherSeries: 변환된 자료
+
+        Raises:
+            WeatherError: 항목의 형식이 맞지 않는 경우
+        """
+        def when(item):
+            # 실황은 발표 시각, 예보는 예보 시각을 사용합니다.
+            date = item.get('fcstDate', item.get('baseDate', base_date))
+            hhmm = item.get('fcstTime', item.get('baseTime', base_time))
+            return f"{date[:4]}-{date[4:6]}-{date[6:8]}T{hhmm[:2]}:{hhmm[2:4]}"
+
+        try:
+            stamps = sorted({when(item) for item in items})
+            row_of = {stamp: i for i, stamp in enumerate(stamps)}
+            values = np.full((len(stamps), len(CATEGORIES)), np.nan)
+            for item in items:
+                column = CATEGORY_INDEX.get(item.get('category'))
+                if column is None:
+                    continue
+                raw = item['obsrValue'] if 'obsrValue' in item else item.get('fcstValue')
+                values[row_of[when(item)], column] = parse_value(raw)
+            times = np.array(stamps, dtype='datetime64[m]')
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise WeatherError(f"날씨 응답 항목의 형식이 올바르지 않습니다: {e!r}") from e
+        return cls(nx, ny, base_date, base_time, times, values)
+
+    def __len__(self):
+        return len(self.times)
+
+    def column(self, category):
+        """
+        자료 구분 하나의 시간별 값 배열을 반환합니다.
+
+        Args:
+            category (str): 자료 구분 코드 (예: 'WSD')
+
+        Returns:
+            np.ndarray: 시간별 값 (없으면 NaN)
+        """
+        return self.values[:, CATEGORY_INDEX[category]]
+
+    def _first_available(self, *categories):
+        for category in categories:
+            column = self.column(category)
+            if not np.isnan(column).all():
+                return column
+        return self.column(categories[0])
+
+    @property
+    def temperature(self):
+        return self._first_available('T1H', 'TMP')
+
+    @property
+    def humidity(self):
+        return self.column('REH')
+
+    @property
+    def precipitation(self):
+        return self._first_available('RN1', 'PCP')
+
+    @property
+    def wind_speed(self):
+        return self.column('WSD')
+
+    @property
+    def wind_direction(self):
+        return self.column('VEC')
+
+    def latest(self):
+        """
+        첫 번째 시각(실황은 관측 시각, 예보는 가장 가까운 예보 시각)의 값을 자료 구분별로 반환합니다.
+
+        Returns:
+            dict: 자료 구분 코드 -> 값 (NaN인 항목은 제외)
+        """
+        if not len(self.times):
+            return {}
+        row = self.values[0]
+        return {category: float(row[i]) for i, category in enumerate(CATEGORIES) if not np.isnan(row[i])}
+
+
+def fetch_items(operation, nx, ny, base_date, base_time, page_size=PAGE_SIZE):
+    """
+    기상청 동네예보 API에서 응답 항목을 모든 페이지에 걸쳐 가져옵니다. Streamlit에 의존하지 않습니다.
+
+    Args:
+        operation (str): 오퍼레이션 이름 (ULTRA_SHORT_NOWCAST, ULTRA_SHORT_FORECAST, SHORT_FORECAST)
+        nx (int): X 격자 좌표
+        ny (int): Y 격자 좌표
+        base_date (str): 발표 날짜 ("YYYYMMDD")
+        base_time (str): 발표 시간 ("HHMM")
+        page_size (int): 한 페이지에 요청할 항목 수
+
+    Returns:
+        list: 응답 항목 딕셔너리 목록
+
+    Raises:
+        WeatherError: API 호출 실패, 오류 응답, JSON 파싱 실패의 경우
+    """
+    url = f"{WEATHER_SERVICE_URL}/{operation}"
+    items = []
+    page = 1
+    while True:
+        params = {
+            "serviceKey": WEATHER_API_KEY,  # API 키
+            "numOfRows": page_size,  # 한 페이지 항목 수
+            "pageNo": page,  # 페이지 번호
+            "dataType": "JSON",  # 데이터 타입
+            "base_date": base_date,  # 발표 날짜
+            "base_time": base_time,  # 발표 시간
+            "nx": nx,  # 경도 (X 좌표)
+            "ny": ny,  # 위도 (Y 좌표)
+        }
+        try:
+            response = get_client().get('kma_weather', url, params=params)
+        except requests.RequestException as e:
+            raise WeatherError(f"날씨 API 요청 중 오류가 발생했습니다: {e}") from e
+
+        if response.status_code != 200:
+            raise WeatherError(f"API 요청에 실패했습니다. 상태 코드: {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise WeatherError("응답에서 JSON을 파싱하는 데 실패했습니다. 응답 내용이 올바르지 않을 수 있습니다.") from e
+        if data.get("response", {}).get("header", {}).get("resultCode") != "00":
+            raise WeatherError("데이터 조회에 실패했습니다.")
+        try:
+            body = data["response"]["body"]
+            page_items = body["items"]["item"]
+            total = int(body.get("totalCount", len(page_items)))
+        except (KeyError, TypeError, ValueError) as e:
+            raise WeatherError("응답에 날씨 정보가 없습니다.") from e
+
+        items.extend(page_items)
+        if not page_items or len(items) >= total:
+            return items
+        page += 1
+
+
+def fetch_observation(nx, ny, base_date, base_time):
+    """
+    격자 한 칸의 초단기실황(현재 관측)을 가져옵니다.
+
+    Args:
+        nx (int): X 격자 좌표
+        ny (int): Y 격자 좌표
+        base_date (str): 발표 날짜 ("YYYYMMDD")
+        base_time (str): 발표 시간 ("HH00")
+
+    Returns:
+        WeatherSeries: 관측 자료 (시간 1개)
+
+    Raises:
+        WeatherError: API 호출 또는 응답 처리에 실패한 경우
+    """
+    items = fetch_items(ULTRA_SHORT_NOWCAST, nx, ny, base_date, base_time)
+    return WeatherSeries.from_items(items, nx, ny, base_date, base_time)
+
+
+def fetch_forecast(nx, ny, base_date, base_time, operation=ULTRA_SHORT_FORECAST):
+    """
+    격자 한 칸의 예보(초단기예보 또는 단기예보)를 가져옵니다.
+
+    Args:
+        nx (int): X 격자 좌표
+        ny (int): Y 격자 좌표
+        base_date (str): 발표 날짜 ("YYYYMMDD")
+        base_time (str): 발표 시간 (초단기예보는 "HH30", 단기예보는 "0200", "0500", ...)
+        operation (str): ULTRA_SHORT_FORECAST 또는 SHORT_FORECAST
+
+    Returns:
+        WeatherSeries: 예보 시각별 자료
+
+    Raises:
+        WeatherError: API 호출 또는 응답 처리에 실패한 경우
+    """
+    items = fetch_items(operation, nx, ny, base_date, base_time)
+    return WeatherSeries.from_items(items, nx, ny, base_date, base_time)
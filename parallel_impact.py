@@ -0,0 +1,205 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from distance_engine import (ELLIPSOIDAL, PolylineDistances, box_distances, nearest_polylines,
+                             polyline_distances, pruning_limit)
+from facility_geometry import LineStrings
+
+# 공유 메모리에 올리는 배열 (이름, 자료형). 모두 타일 순서로 정렬되어 있어 타일 하나가 연속된 구간입니다.
+_SHARED_ARRAYS = (('coords', np.float64), ('offsets', np.int64), ('valid', np.bool_),
+                  ('bounds', np.float64), ('rows', np.int64))
+
+# 작업 프로세스에서 공유 메모리를 연결한 결과 (프로세스당 1개)
+_worker = {}
+
+
+def _views(blocks, shapes):
+    # 공유 메모리 블록 위에 복사 없이 NumPy 배열을 만듭니다.
+    return {name: np.ndarray(shapes[name], dtype=dtype, buffer=blocks[name].buf) for name, dtype in _SHARED_ARRAYS}
+
+
+def _attach(name):
+    # 공유 메모리 블록은 부모가 만들고 close()에서 해제합니다. 작업 프로세스는 연결만 하고 resource_tracker에 등록하지 않습니다.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13 이상
+    except TypeError:
+        # 이전 버전은 연결할 때도 등록합니다. spawn으로 시작한 작업 프로세스는 부모의 resource_tracker를 함께 쓰므로
+        # 같은 이름이 한 번만 기록되고, 부모의 unlink()가 해제합니다. (여기서 등록을 취소하면 부모의 기록까지 지워집니다.)
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(names, shapes):
+    blocks = {name: _attach(names[name]) for name, _ in _SHARED_ARRAYS}
+    arrays = _views(blocks, shapes)
+    _worker['blocks'] = blocks  # 블록이 닫히지 않도록 참조를 유지합니다.
+    _worker['lines'] = LineStrings(arrays['coords'], arrays['offsets'], arrays['valid'], arrays['bounds'])
+    _worker['rows'] = arrays['rows']
+
+
+def _shard_lines(start, stop):
+    # 타일 [start, stop) 행만 보는 LineStrings (offsets는 전체 coords 기준이므로 그대로 사용합니다.)
+    lines = _worker['lines']
+    return LineStrings(lines.coords, lines.offsets[start:stop + 1], lines.valid[start:stop], lines.bounds[start:stop])
+
+
+def _pack(start, rows, result):
+    # 작업 결과를 원래 행 번호와 함께 작은 배열로 돌려줍니다.
+    return _worker['rows'][start + rows], np.column_stack(result[:3]), result.segment
+
+
+def _within_task(start, stop, latitude, longitude, radius, method):
+    shard = _shard_lines(start, stop)
+    result = polyline_distances(shard, latitude, longitude, radius, method)
+    rows = np.flatnonzero(np.isfinite(result.distance))
+    return _pack(start, rows, PolylineDistances(*(values[rows] for values in result)))
+
+
+def _nearest_task(start, stop, latitude, longitude, k, method):
+    shard = _shard_lines(start, stop)
+    rows, result = nearest_polylines(shard, latitude, longitude, k, method)
+    return _pack(start, rows, result)
+
+
+def _merge(parts, limit=None):
+    # 타일별 결과를 합쳐 가까운 순서로 정렬하고, limit이 있으면 앞에서부터 limit개만 남깁니다.
+    if not parts:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.int64), PolylineDistances(empty, empty, empty, np.empty(0, dtype=np.int64))
+    rows = np.concatenate([p[0] for p in parts])
+    values = np.concatenate([p[1] for p in parts])
+    segment = np.concatenate([p[2] for p in parts])
+    order = np.argsort(values[:, 0], kind='stable')[:limit]
+    return rows[order], PolylineDistances(values[order, 0], values[order, 1], values[order, 2], segment[order])
+
+
+class ShardedImpact:
+    """
+    시설물을 공간 타일로 나누어 공유 메모리에 올리고, 조회를 타일 단위로 프로세스 풀에 나누어 처리합니다.
+    작업 프로세스는 시작할 때 공유 메모리를 연결하므로 조회마다 시설물 데이터를 pickle로 전달하지 않습니다.
+    반경 조회는 경계 상자가 반경 밖인 타일을 보내지 않고, 결과는 타일별 결과를 합쳐 정렬합니다.
+
+    with 문으로 사용하거나, 다 쓴 뒤 close()를 호출해야 공유 메모리가 해제됩니다.
+    """
+
+    def __init__(self, lines, workers=None, tiles=None):
+        """
+        Args:
+            lines (LineStrings): 시설물 선형
+            workers (int, optional): 작업 프로세스 수 (기본값: CPU 수)
+            tiles (int, optional): 타일 수 (기본값: 작업 프로세스 수의 4배. 작업량이 고르게 나뉘도록 여러 개로 나눕니다.)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        rows = np.flatnonzero(lines.valid)
+        bounds = lines.bounds[rows]
+        tiles = max(1, min(len(rows), tiles or self.workers * 4))
+
+        # 경도 순으로 세로 띠를 나누고, 띠 안에서는 위도 순으로 잘라 타일을 만듭니다. (행 수가 고른 타일)
+        columns = int(np.ceil(np.sqrt(tiles)))
+        by_x = rows[np.argsort(bounds[:, 0] + bounds[:, 2], kind='stable')]
+        order = []
+        for column in np.array_split(by_x, columns):
+            center_y = lines.bounds[column, 1] + lines.bounds[column, 3]
+            order.append(column[np.argsort(center_y, kind='stable')])
+        order = np.concatenate(order) if order else rows
+        per_tile = -(-len(order) // tiles) if len(order) else 1
+        self.tile_ranges = [(start, min(start + per_tile, len(order))) for start in range(0, len(order), per_tile)]
+
+        # 타일 순서로 좌표를 다시 배열합니다.
+        counts = lines.counts[order]
+        offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        vertex = np.repeat(lines.offsets[order] - offsets[:-1], counts) + np.arange(offsets[-1])
+        arrays = {
+            'coords': lines.coords[vertex],
+            'offsets': offsets,
+            'valid': np.ones(len(order), dtype=bool),
+            'bounds': lines.bounds[order],
+            'rows': order.astype(np.int64),
+        }
+        self.tile_bounds = np.array([
+            np.r_[arrays['bounds'][start:stop, :2].min(axis=0), arrays['bounds'][start:stop, 2:].max(axis=0)]
+            for start, stop in self.tile_ranges
+        ]).reshape(-1, 4)
+
+        self.blocks = {}
+        self.shapes = {}
+        for name, dtype in _SHARED_ARRAYS:
+            array = np.ascontiguousarray(arrays[name], dtype=dtype)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=dtype, buffer=block.buf)[...] = array
+            self.blocks[name] = block
+            self.shapes[name] = array.shape
+        names = {name: block.name for name, block in self.blocks.items()}
+        # Streamlit처럼 스레드가 여러 개인 프로세스에서 fork하면 안전하지 않으므로 spawn으로 작업 프로세스를 시작합니다.
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker, initargs=(names, self.shapes))
+
+    def within(self, latitude, longitude, radius, method=ELLIPSOIDAL):
+        """
+        기준점에서 radius 안에 있는 선형을 가까운 순서로 반환합니다.
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            radius (float): 반경 (미터)
+            method (str): 거리 계산 방식
+
+        Returns:
+            tuple (np.ndarray, PolylineDistances): 원래 행 번호와 그 행들의 거리 정보
+        """
+        near = np.flatnonzero(box_distances(self.tile_bounds, latitude, longitude) <= pruning_limit(radius))
+        futures = [self.pool.submit(_within_task, *self.tile_ranges[tile], latitude, longitude, radius, method)
+                   for tile in near.tolist()]
+        return _merge([future.result() for future in futures])
+
+    def nearest(self, latitude, longitude, k=10, method=ELLIPSOIDAL):
+        """
+        기준점에서 가장 가까운 선형 k개를 반환합니다.
+        경계 상자가 가까운 타일부터 작업 프로세스 수만큼씩 보내 타일별 k개를 찾고,
+        다음 타일의 경계 상자가 지금까지의 k번째 거리보다 멀면 멈춥니다.
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            k (int): 찾을 선형 수
+            method (str): 거리 계산 방식
+
+        Returns:
+            tuple (np.ndarray, PolylineDistances): 가까운 순서의 원래 행 번호와 그 행들의 거리 정보
+        """
+        lower = box_distances(self.tile_bounds, latitude, longitude)
+        tiles = np.argsort(lower, kind='stable').tolist()
+        parts = []
+        kth = np.inf
+        for start in range(0, len(tiles), self.workers):
+            if lower[tiles[start]] > pruning_limit(kth):
+                break  # 남은 타일은 모두 현재 k번째보다 멉니다.
+            futures = [self.pool.submit(_nearest_task, *self.tile_ranges[tile], latitude, longitude, k, method)
+                       for tile in tiles[start:start + self.workers]]
+            parts.extend(future.result() for future in futures)
+            found = np.concatenate([p[1][:, 0] for p in parts])
+            if len(found) >= k:
+                kth = np.partition(found, k - 1)[k - 1]
+        return _merge(parts, k)
+
+    def close(self):
+        """
+        프로세스 풀을 종료하고 공유 메모리를 해제합니다.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
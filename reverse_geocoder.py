@@ -0,0 +1,120 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+# 주소점 데이터 (주소, 위도, 경도 컬럼을 가진 CSV) 경로
+ADDRESS_POINTS_PATH = os.getenv('ADDRESS_POINTS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'address_points.csv'))
+EARTH_RADIUS_M = 6371008.8  # 지구 평균 반지름 (미터)
+
+
+class ReverseGeocoder:
+    """
+    디스크의 주소점 데이터로 만든 격자(grid) 인덱스를 사용하여,
+    네트워크 호출 없이 좌표에서 가장 가까운 주소를 찾는 역지오코더입니다.
+    """
+
+    def __init__(self, addresses, latitudes, longitudes, cell_size=0.001):
+        """
+        Args:
+            addresses (sequence of str): 주소 목록
+            latitudes (array-like): 위도 배열
+            longitudes (array-like): 경도 배열
+            cell_size (float): 격자 한 칸의 크기 (도 단위, 0.001도는 약 100m)
+        """
+        lat = np.asarray(latitudes, dtype=np.float64)
+        lon = np.asarray(longitudes, dtype=np.float64)
+        self.cell_size = cell_size
+        self.lat0 = float(lat.min()) if len(lat) else 0.0
+        self.lon0 = float(lon.min()) if len(lon) else 0.0
+        # 동서 방향 1도의 길이는 고위도일수록 짧으므로, 데이터 범위에서 절댓값이 가장 큰 위도(칸이 가장 좁은 곳) 기준으로
+        # 한 칸의 최소 폭(미터)을 구합니다. 그래야 고리 탐색을 끝내는 거리 조건이 범위 전체에서 보수적으로 유지됩니다.
+        max_lat = math.radians(float(np.abs(lat).max())) if len(lat) else 0.0
+        self.cell_size_m = math.radians(cell_size) * EARTH_RADIUS_M * min(1.0, math.cos(max_lat))
+
+        # 격자 칸 번호 순으로 정렬하여, 칸마다 [시작, 끝) 구간만 기억합니다.
+        ix, iy = self._cell(lat, lon)
+        order = np.lexsort((iy, ix))
+        self.lat = lat[order]
+        self.lon = lon[order]
+        self.addresses = np.asarray(addresses, dtype=object)[order]
+        keys = list(zip(ix[order].tolist(), iy[order].tolist()))
+        self.cells = {}
+        start = 0
+        for i in range(1, len(keys) + 1):
+            if i == len(keys) or keys[i] != keys[start]:
+                self.cells[keys[start]] = (start, i)
+                start = i
+        self.max_ring = max(
+            int(ix.max() - ix.min()) if len(ix) else 0,
+            int(iy.max() - iy.min()) if len(iy) else 0,
+        ) + 1
+
+    @classmethod
+    def from_csv(cls, path=ADDRESS_POINTS_PATH, address_column='주소', lat_column='위도', lon_column='경도', **kwargs):
+        """
+        주소점 CSV 파일로부터 인덱스를 생성합니다.
+
+        Args:
+            path (str): CSV 파일 경로
+            address_column (str): 주소 컬럼 이름
+            lat_column (str): 위도 컬럼 이름
+            lon_column (str): 경도 컬럼 이름
+
+        Returns:
+            ReverseGeocoder: 생성된 역지오코더
+        """
+        df = pd.read_csv(path, usecols=[address_column, lat_column, lon_column]).dropna()
+        return cls(df[address_column].to_numpy(), df[lat_column].to_numpy(), df[lon_column].to_numpy(), **kwargs)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _cell(self, lat, lon):
+        ix = np.floor((np.asarray(lon) - self.lon0) / self.cell_size).astype(np.int64)
+        iy = np.floor((np.asarray(lat) - self.lat0) / self.cell_size).astype(np.int64)
+        return ix, iy
+
+    def _ring(self, cx, cy, r):
+        # 중심 칸에서 체비쇼프 거리 r만큼 떨어진 칸들의 인덱스 구간
+        if r == 0:
+            cells = [(cx, cy)]
+        else:
+            cells = [(cx + dx, cy + dy) for dx in range(-r, r + 1) for dy in (-r, r)]
+            cells += [(cx + dx, cy + dy) for dx in (-r, r) for dy in range(-r + 1, r)]
+        return [self.cells[c] for c in cells if c in self.cells]
+
+    def nearest(self, latitude, longitude, max_distance=500.0):
+        """
+        좌표에서 가장 가까운 주소를 찾습니다.
+
+        Args:
+            latitude (float): 위도
+            longitude (float): 경도
+            max_distance (float): 이 거리(미터)보다 멀면 결과 없음으로 처리합니다.
+
+        Returns:
+            tuple (str, float, float, float): (주소, 위도, 경도, 거리(미터)). 결과가 없으면 None
+        """
+        if not len(self.lat):
+            return None
+        ix, iy = self._cell(latitude, longitude)
+        cx, cy = int(ix), int(iy)
+        cos_lat = math.cos(math.radians(latitude))
+        best_index, best_distance = None, math.inf
+        max_ring = min(self.max_ring, int(max_distance / self.cell_size_m) + 2)
+        for r in range(max_ring + 1):
+            # r번째 고리 이후의 점은 중심 칸에서 최소 (r - 1)칸 폭만큼 떨어져 있으므로, 그보다 가까운 후보가 있으면 탐색을 끝냅니다.
+            if best_distance <= (r - 1) * self.cell_size_m:
+                break
+            for start, end in self._ring(cx, cy, r):
+                dlat = np.radians(self.lat[start:end] - latitude)
+                dlon = np.radians(self.lon[start:end] - longitude) * cos_lat
+                distance = EARTH_RADIUS_M * np.hypot(dlat, dlon)  # 짧은 거리에서는 등장방형 근사로 충분합니다.
+                i = int(distance.argmin())
+                if distance[i] < best_distance:
+                    best_index, best_distance = start + i, float(distance[i])
+        if best_index is None or best_distance > max_distance:
+            return None
+        return self.addresses[best_index], float(self.lat[best_index]), float(self.lon[best_index]), best_distance
@@ -0,0 +1,224 @@
+import heapq
+import weakref
+
+import numpy as np
+
+from distance_engine import ELLIPSOIDAL, PolylineDistances, box_distances, pruning_limit, row_distances
+
+NODE_SIZE = 16  # 노드 하나에 묶는 자식 수
+
+
+class SpatialIndex:
+    """
+    시설물 선형의 경계 상자를 STR(Sort-Tile-Recursive) 방식으로 묶은 R-tree입니다.
+    반경 조회와 최근접 k개 조회에서 인덱스가 고른 후보만 실제 선분 거리를 계산합니다.
+
+    levels[0]은 STR 순서로 정렬한 선형의 경계 상자이고, levels[l]의 i번째 노드는
+    levels[l - 1]의 i * NODE_SIZE 부터 NODE_SIZE개를 감쌉니다. order[j]는 levels[0]의 j번째 상자의 행 번호입니다.
+    """
+
+    def __init__(self, lines, order, levels, node_size=NODE_SIZE):
+        """
+        Args:
+            lines (LineStrings): 인덱스 대상 선형
+            order (np.ndarray): STR 순서의 행 번호
+            levels (list): 단계별 경계 상자 배열 (맨 아래부터)
+            node_size (int): 노드 하나의 자식 수
+        """
+        self.lines = lines
+        self.order = order
+        self.levels = levels
+        self.node_size = node_size
+
+    @classmethod
+    def build(cls, lines, node_size=NODE_SIZE):
+        """
+        선형의 경계 상자로 인덱스를 만듭니다. 유효하지 않은 행은 포함하지 않습니다.
+
+        Args:
+            lines (LineStrings): 파싱된 선형
+            node_size (int): 노드 하나의 자식 수
+
+        Returns:
+            SpatialIndex: 생성된 인덱스
+        """
+        rows = np.flatnonzero(lines.valid)
+        bounds = lines.bounds[rows]
+        center_x = (bounds[:, 0] + bounds[:, 2]) * 0.5
+        center_y = (bounds[:, 1] + bounds[:, 3]) * 0.5
+
+        # 경도 순으로 세로 띠(slice)를 나누고, 띠 안에서는 위도 순으로 정렬합니다.
+        leaves = -(-len(rows) // node_size)
+        slice_size = int(np.ceil(np.sqrt(max(leaves, 1)))) * node_size
+        by_x = np.argsort(center_x, kind='stable')
+        slice_of = np.arange(len(rows)) // slice_size
+        order = by_x[np.lexsort((center_y[by_x], slice_of))]
+
+        levels = [bounds[order]]
+        while len(levels[-1]) > node_size:
+            below = levels[-1]
+            starts = np.arange(0, len(below), node_size)
+            levels.append(np.column_stack([
+                np.minimum.reduceat(below[:, :2], starts, axis=0),
+                np.maximum.reduceat(below[:, 2:], starts, axis=0),
+            ]))
+        return cls(lines, rows[order], levels, node_size)
+
+    def __len__(self):
+        return len(self.order)
+
+    def _children(self, level, nodes):
+        # levels[level]의 노드들이 감싸는 levels[level - 1]의 번호
+        children = (nodes[:, None] * self.node_size + np.arange(self.node_size)).ravel()
+        return children[children < len(self.levels[level - 1])]
+
+    def candidates(self, latitude, longitude, radius):
+        """
+        경계 상자가 기준점에서 radius 안에 있는 행 번호를 반환합니다. (실제 거리는 계산하지 않습니다.)
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            radius (float): 반경 (미터)
+
+        Returns:
+            np.ndarray: 후보 행 번호
+        """
+        limit = pruning_limit(radius)
+        nodes = np.arange(len(self.levels[-1]))
+        for level in range(len(self.levels) - 1, -1, -1):
+            nodes = nodes[box_distances(self.levels[level][nodes], latitude, longitude) <= limit]
+            if level:
+                nodes = self._children(level, nodes)
+        return self.order[nodes]
+
+    def within(self, latitude, longitude, radius, method=ELLIPSOIDAL):
+        """
+        기준점에서 radius 안에 있는 선형을 가까운 순서로 반환합니다.
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            radius (float): 반경 (미터)
+            method (str): 거리 계산 방식
+
+        Returns:
+            tuple (np.ndarray, PolylineDistances): 행 번호와 그 행들의 거리 정보
+        """
+        rows = self.candidates(latitude, longitude, radius)
+        result = row_distances(self.lines, rows, latitude, longitude, method)
+        keep = np.flatnonzero(result.distance <= radius)
+        keep = keep[np.argsort(result.distance[keep], kind='stable')]
+        return rows[keep], PolylineDistances(*(values[keep] for values in result))
+
+    def nearest(self, latitude, longitude, k=10, method=ELLIPSOIDAL):
+        """
+        기준점에서 가장 가까운 선형 k개를 반환합니다.
+        경계 상자 거리가 가까운 노드부터 펼치고, 맨 아래 노드를 펼칠 때 그 안의 선형만 실제 거리를 계산합니다.
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            k (int): 찾을 선형 수
+            method (str): 거리 계산 방식
+
+        Returns:
+            tuple (np.ndarray, PolylineDistances): 가까운 순서의 행 번호와 그 행들의 거리 정보
+        """
+        def lower_bounds(level, nodes):
+            # 상자 거리는 평면 근사이므로 실제 거리보다 조금 클 수 있어 여유를 뺍니다.
+            return ((box_distances(self.levels[level][nodes], latitude, longitude) - 1.0) / 1.001).tolist()
+
+        top = len(self.levels) - 1
+        nodes = np.arange(len(self.levels[top]))
+        # 힙 항목: (거리 또는 하한, 단계, 번호). 단계 -1은 실제 거리를 계산한 선형(번호는 행 번호)입니다.
+        heap = [(bound, top, node) for node, bound in zip(nodes.tolist(), lower_bounds(top, nodes))]
+        heapq.heapify(heap)
+        found_rows = []
+        while heap and len(found_rows) < k:
+            value, level, index = heapq.heappop(heap)
+            if level < 0:
+                found_rows.append(index)
+                continue
+            if level == 0:
+                rows = self.order[index:index + 1]
+            else:
+                nodes = self._children(level, np.array([index]))
+                if level > 1:
+                    for node, bound in zip(nodes.tolist(), lower_bounds(level - 1, nodes)):
+                        heapq.heappush(heap, (bound, level - 1, node))
+                    continue
+                rows = self.order[nodes]
+            result = row_distances(self.lines, rows, latitude, longitude, method)
+            for row, distance in zip(rows.tolist(), result.distance.tolist()):
+                heapq.heappush(heap, (distance, -1, row))
+        rows = np.array(found_rows, dtype=np.int64)
+        return rows, row_distances(self.lines, rows, latitude, longitude, method)
+
+    def save(self, path):
+        """
+        인덱스를 .npz 파일로 저장합니다. 선형 데이터는 저장하지 않습니다.
+
+        Args:
+            path (str): 저장할 파일 경로
+        """
+        arrays = {f'level{i}': bounds for i, bounds in enumerate(self.levels)}
+        np.savez(path, order=self.order, node_size=self.node_size,
+                 shape=np.array([len(self.lines), len(self.lines.coords)]), **arrays)
+
+    @classmethod
+    def load(cls, path, lines):
+        """
+        save()로 저장한 인덱스를 불러옵니다.
+
+        Args:
+            path (str): 파일 경로
+            lines (LineStrings): 인덱스를 만들 때 사용한 것과 같은 선형
+
+        Returns:
+            SpatialIndex: 불러온 인덱스
+
+        Raises:
+            ValueError: 저장된 인덱스가 lines와 맞지 않는 경우
+        """
+        with np.load(path) as data:
+            if tuple(data['shape'].tolist()) != (len(lines), len(lines.coords)):
+                raise ValueError("저장된 공간 인덱스가 시설물 데이터와 일치하지 않습니다.")
+            count = sum(1 for name in data.files if name.startswith('level'))
+            levels = [data[f'level{i}'] for i in range(count)]
+            return cls(lines, data['order'], levels, int(data['node_size']))
+
+
+# 선형별 인덱스 캐시 (선형 데이터가 사라지면 함께 제거됩니다.)
+_index_cache = weakref.WeakKeyDictionary()
+
+
+def get_spatial_index(lines, path=None):
+    """
+    선형의 공간 인덱스를 반환합니다. 같은 선형에 대해서는 한 번만 만듭니다.
+    path를 지정하면 저장된 인덱스를 먼저 불러오고, 없거나 맞지 않으면 새로 만들어 저장합니다.
+
+    Args:
+        lines (LineStrings): 파싱된 선형
+        path (str, optional): 인덱스 파일 경로 (.npz)
+
+    Returns:
+        SpatialIndex: 공간 인덱스
+    """
+    index = _index_cache.get(lines)
+    if index is not None:
+        return index
+    if path is not None:
+        try:
+            index = SpatialIndex.load(path, lines)
+        except (OSError, KeyError, ValueError):
+            index = None
+    if index is None:
+        index = SpatialIndex.build(lines)
+        if path is not None:
+            try:
+                index.save(path)
+            except OSError:
+                pass  # 읽기 전용 저장소 등에 저장하지 못하면 메모리의 인덱스만 사용합니다.
+    _index_cache[lines] = index
+    return index
@@ -1,32 +1,129 @@
 import streamlit as st
 import folium
-from geopy.geocoders import Nominatim
-from streamlit_folium import st_folium
-import json
-from streamlit.components.v1 import html
+from streamlit_folium import generate_leaflet_string, st_folium
 import os
+import copy
 from dotenv import load_dotenv
-import datetime
-import pytz
+import time
 import pandas as pd
-import requests
-from geopy.distance import geodesic
-from folium import PolyLine
+import numpy as np
+from geocode_cache import GeocodeCache
+from geocoding import GeocodeError, GeocoderChain, NaverProvider, NominatimProvider
+from http_client import get_client
+from reverse_geocoder import ADDRESS_POINTS_PATH, ReverseGeocoder
+from address_index import AddressIndex
+from kma_grid import to_grid
+from weather_cache import WeatherCache
+from weather_prefetch import WeatherPrefetcher
+from distance_engine import PolylineDistances
+from facility_geometry import get_linestrings
+from spatial_index import get_spatial_index
+from facility_store import FACILITY_STORE_PATH, index_path, load_store, load_validation, store_exists
+from impact_engine import ImpactEngine
+from parallel_impact import ShardedImpact
+from wind_zone import WindZone
+from impact_report import DEFAULT_BANDS, iter_csv, iter_excel, iter_report_chunks, spool, summarize
+from facility_layer import build_facility_layer
+from facility_simplify import level_for_zoom
+from incident_layer import FIRE, RINGS, WIND, IncidentLayer, fire_marker, radius_ring, wind_area
+import atexit
 
 # .env 파일 로드
 load_dotenv()
 
-# API 키 및 URL 설정
-NAVER_CLIENT_ID = os.getenv('NAVER_CLIENT_ID')  # 환경 변수에서 네이버 클라이언트 ID를 불러옵니다.
-NAVER_CLIENT_SECRET = os.getenv('NAVER_CLIENT_SECRET')  # 환경 변수에서 네이버 클라이언트 비밀 키를 불러옵니다.
-WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')  # 환경 변수에서 날씨 API 키를 불러옵니다.
-WEATHER_BASE_URL = os.getenv('WEATHER_BASE_URL')  # 환경 변수에서 날씨 API 기본 URL을 불러옵니다.
+# 지오코딩 캐시 (프로세스당 1개, 디스크 파일은 모든 프로세스가 공유)
+@st.cache_resource
+def get_geocode_cache():
+    """
+    모든 세션이 공유하는 지오코딩 디스크 캐시 객체를 반환합니다.
+
+    Returns:
+        GeocodeCache: 지오코딩 캐시 객체
+    """
+    return GeocodeCache()
+
+# 지오코딩 제공자 체인 (네이버 우선, 느리거나 실패하면 Nominatim으로 우회)
+@st.cache_resource
+def get_geocoder():
+    """
+    모든 세션이 공유하는 지오코더 체인을 반환합니다.
+    제공자별 응답 시간 통계와 서킷 브레이커 상태가 세션 간에 공유됩니다.
+
+    Returns:
+        GeocoderChain: 지오코더 체인
+    """
+    return GeocoderChain([NaverProvider(), NominatimProvider()], hedge_delay=0.8)
+
+# 역지오코딩 인덱스 (앱 시작 시 1회 생성하여 모든 세션이 공유)
+@st.cache_resource
+def get_reverse_geocoder():
+    """
+    주소점 데이터로 만든 오프라인 역지오코딩 인덱스를 반환합니다.
 
-# 전역 변수 선언
-seoul_tz = pytz.timezone('Asia/Seoul')  # 서울 시간대를 설정합니다.
-now = datetime.datetime.now(seoul_tz) - datetime.timedelta(hours=1)  # 현재 시간에서 1시간을 뺀 시간을 계산합니다. (날씨 API 데이터는 1시간 전 기준으로 제공될 가능성이 높기 때문입니다.)
-base_date = now.strftime("%Y%m%d")  # 현재 날짜를 "YYYYMMDD" 형식의 문자열로 변환합니다. (날씨 API 요청에 사용)
-base_time = now.strftime("%H00")  # 현재 시간을 "HH00" 형식의 문자열로 변환합니다. (날씨 API 요청에 사용, 매 시간 정각의 데이터를 요청)
+    Returns:
+        ReverseGeocoder: 역지오코더. 주소점 데이터 파일이 없으면 None을 반환합니다.
+    """
+    if not os.path.exists(ADDRESS_POINTS_PATH):
+        return None
+    return ReverseGeocoder.from_csv(ADDRESS_POINTS_PATH)
+
+# 주소 자동완성 인덱스 (주소점 데이터 + 지오코딩 기록, 1시간마다 다시 생성)
+@st.cache_resource(ttl=3600)
+def get_address_index():
+    """
+    주소 자동완성에 사용할 접두어 인덱스를 반환합니다.
+
+    Returns:
+        AddressIndex: 주소 자동완성 인덱스
+    """
+    address_csv = ADDRESS_POINTS_PATH if os.path.exists(ADDRESS_POINTS_PATH) else None
+    return AddressIndex.from_sources(address_csv, get_geocode_cache())
+
+# 시설물 저장소 (facility_store.py로 미리 변환한 데이터를 메모리 매핑으로 불러와 모든 세션이 공유)
+@st.cache_resource
+def get_facilities():
+    """
+    미리 변환해 둔 시설물 저장소를 불러옵니다. 좌표는 이미 파싱되어 있으므로 CSV를 다시 읽거나 파싱하지 않습니다.
+    공간 인덱스도 저장소에 함께 저장해 두고 다음 시작부터 다시 사용합니다.
+
+    Returns:
+        pd.DataFrame: 시설물 DataFrame. 저장소가 없으면 None을 반환합니다.
+    """
+    if not store_exists(FACILITY_STORE_PATH):
+        return None
+    df, lines = load_store(FACILITY_STORE_PATH)
+    get_spatial_index(lines, index_path(FACILITY_STORE_PATH))
+    return df
+
+# 시설물 좌표 검증 결과 (저장소를 만들 때 기록한 값)
+@st.cache_data
+def get_facility_validation():
+    """
+    시설물 저장소의 좌표 검증 결과를 불러옵니다.
+
+    Returns:
+        tuple (dict, pd.DataFrame): 사유별 건수와 거부된 행 목록
+    """
+    return load_validation(FACILITY_STORE_PATH)
+
+# 전국 규모 시설물용 병렬 조회 (IMPACT_WORKERS 환경 변수가 2 이상일 때만 사용)
+IMPACT_WORKERS = int(os.getenv('IMPACT_WORKERS', '0'))
+
+@st.cache_resource
+def get_sharded_impact():
+    """
+    시설물을 공간 타일로 나누어 공유 메모리에 올리고 프로세스 풀로 조회하는 객체를 반환합니다.
+    프로세스가 종료될 때 프로세스 풀과 공유 메모리도 함께 정리합니다.
+
+    Returns:
+        ShardedImpact: 병렬 조회 객체. 시설물 저장소가 없거나 병렬 조회를 사용하지 않으면 None을 반환합니다.
+    """
+    df = get_facilities()
+    if df is None or IMPACT_WORKERS < 2:
+        return None
+    sharded = ShardedImpact(get_linestrings(df), workers=IMPACT_WORKERS)
+    atexit.register(sharded.close)
+    return sharded
 
 # Function to get GPS coordinates from Naver API using an address
 def get_gps_from_address(address):
@@ -40,102 +137,252 @@ def get_gps_from_address(address):
         tuple (float, float): 위도와 경도를 포함하는 튜플입니다.
                         API 호출 실패 또는 주소를 찾을 수 없는 경우 None을 반환합니다.
     """
-    url = "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode"  # 네이버 Geocoding API 엔드포인트 URL입니다.
-    headers = {
-        "X-NCP-APIGW-API-KEY-ID": NAVER_CLIENT_ID,  # 네이버 클라이언트 ID를 헤더에 포함합니다.
-        "X-NCP-APIGW-API-KEY": NAVER_CLIENT_SECRET  # 네이버 클라이언트 비밀 키를 헤더에 포함합니다.
-    }
-    params = {"query": address}  # 쿼리 매개변수에 주소를 설정합니다.
-    response = requests.get(url, headers=headers, params=params)  # API 요청을 보냅니다.
-
-    if response.status_code == 200:  # 응답 상태 코드가 200 (성공)인 경우,
-        result = response.json()  # JSON 형식의 응답 데이터를 파싱합니다.
-        if result['meta']['totalCount'] > 0:  # 검색 결과가 있는 경우,
-            lat = result['addresses'][0]['y']  # 첫 번째 결과에서 위도를 추출합니다.
-            lon = result['addresses'][0]['x']  # 첫 번째 결과에서 경도를 추출합니다.
-            return float(lat), float(lon)  # 위도와 경도를 float 타입으로 반환합니다.
-        else:
-            return None  # 검색 결과가 없는 경우 None을 반환합니다.
+    cache = get_geocode_cache()
+    found, cached = cache.get(address)  # 캐시에 저장된 결과가 있으면 API를 호출하지 않습니다.
+    if found:
+        return cached
+
+    try:
+        gps_point = get_geocoder().geocode(address)  # 네이버 Geocoding API를 호출합니다. (지연/장애 시 Nominatim 사용)
+    except GeocodeError:
+        st.error("Failed to get GPS coordinates from Naver API or Nominatim")  # 모든 제공자가 실패한 경우 오류 메시지를 표시합니다.
+        return None  # 오류 발생 시 None을 반환합니다. (실패 결과는 캐시에 저장하지 않습니다.)
+    cache.put(address, gps_point)  # 검색 결과 없음(None)도 캐시에 저장하여 반복 호출을 막습니다.
+    return gps_point
+
+# 기상 관측 캐시 (모든 세션이 공유)
+@st.cache_resource
+def get_weather_cache():
+    """
+    모든 세션이 공유하는 기상 관측 캐시 객체를 반환합니다.
+    관측은 기상청의 다음 발표 시각에 만료되며, 같은 격자의 동시 요청은 하나로 합쳐집니다.
+
+    Returns:
+        WeatherCache: 기상 관측 캐시 객체
+    """
+    return WeatherCache()
+
+# 기상 관측 백그라운드 갱신 작업자 (프로세스당 1개)
+@st.cache_resource
+def get_weather_prefetcher():
+    """
+    활성 화재 지점의 기상 격자를 매시 발표 직후 갱신하는 백그라운드 작업자를 시작하고 반환합니다.
+    프로세스가 종료될 때 작업자도 함께 멈춥니다.
+
+    Returns:
+        WeatherPrefetcher: 기상 관측 갱신 작업자
+    """
+    prefetcher = WeatherPrefetcher(get_weather_cache())
+    prefetcher.start()
+    atexit.register(prefetcher.stop)
+    return prefetcher
+
+# 화재 지점의 날씨 정보를 표시하는 함수
+def show_fire_weather(latitude, longitude):
+    """
+    화재 지점 격자의 날씨 정보를 표시하는 함수입니다.
+    백그라운드 작업자가 미리 받아 둔 관측만 읽으므로 화면 갱신이 네트워크를 기다리지 않습니다.
+
+    Args:
+        latitude (float): 화재 지점 위도
+        longitude (float): 화재 지점 경도
+    """
+    nx, ny = to_grid(latitude, longitude)
+    get_weather_prefetcher().track(nx, ny)  # 이 격자를 매시 갱신 대상으로 등록합니다.
+    observation = get_weather_cache().peek(nx, ny)
+    if observation is None:
+        st.caption("화재 지점의 날씨 정보를 불러오는 중입니다.")
+        return
+    values = ", ".join(f"{category} {value:g}" for category, value in observation.series.latest().items())
+    if observation.stale:  # 최신 관측 대신 이전 관측을 표시하는 경우, 조회한 지 얼마나 지났는지 함께 표시합니다.
+        age_minutes = (time.time() - observation.fetched_at) / 60
+        st.caption(f"화재 지점 날씨 ({observation.base_date} {observation.base_time} 관측, 최신 관측 아님, "
+                   f"{age_minutes:.0f}분 전 조회) : {values}")
     else:
-        st.error("Failed to get GPS coordinates from Naver API")  # API 호출 실패 시 오류 메시지를 표시합니다.
-        return None  # 오류 발생 시 None을 반환합니다.
+        st.caption(f"화재 지점 날씨 ({observation.base_date} {observation.base_time} 관측) : {values}")
 
-def get_weather_info(latitude, longitude):
+def distance_frame(result, index):
     """
-    주어진 위도 및 경도에 대한 날씨 정보를 가져오는 함수입니다.
-    기상청 API를 사용하여 현재 날씨 정보를 조회하고, 필요한 데이터만 추출하여 반환합니다.
+    거리 계산 결과(PolylineDistances)를 DataFrame으로 변환합니다.
 
     Args:
-        latitude (float): 위도
-        longitude (float): 경도
+        result (PolylineDistances): 거리 계산 결과
+        index (pd.Index): 결과 행에 해당하는 시설물 DataFrame의 인덱스
 
     Returns:
-        list: 날씨 정보가 담긴 리스트. 각 요소는 날씨 정보 딕셔너리입니다.
-            예: [{'category': 'TMP', 'obsrValue': 25.0}, ...]
-            API 호출 실패, 데이터 없음 등의 경우 None 반환
-    """
-    # 서울 시간대를 설정하여 현재 시간 가져오기
-    seoul_tz = pytz.timezone('Asia/Seoul')
-    # now = datetime.datetime.now(seoul_tz)  # 최근 시간일 경우, 정각~데이터 나오는 시간까지 오류 발생
-    now = datetime.datetime.now(seoul_tz) - datetime.timedelta(hours=1)  # 현재시간 대비 1시간 전 날씨
-    base_date = now.strftime("%Y%m%d")
-    base_time = now.strftime("%H00")  # 정시에 업데이트 되므로 "HH00" 형태로 시간 설정
-    nx, ny = 55, 127  # 예시 좌표로 설정 (사용자 정의 또는 계산 필요)
-    params = {
-        "serviceKey": WEATHER_API_KEY,  # API 키
-        "numOfRows": 10,  # 가져올 데이터 수
-        "pageNo": 1,  # 페이지 번호
-        "dataType": "JSON",  # 데이터 타입
-        "base_date": base_date,  # 발표 날짜
-        "base_time": base_time,  # 발표 시간
-        "nx": nx,  # 경도 (X 좌표)
-        "ny": ny,  # 위도 (Y 좌표)
-    }
-
-    response = requests.get(WEATHER_BASE_URL, params=params)  # API 호출
-
-    if response.status_code == 200:  # 성공적인 응답
-        try:
-            data = response.json()  # JSON 파싱
-            if data.get("response").get("header").get("resultCode") == "00":  # 응답 코드 확인
-                items = data.get("response").get("body").get("items").get("item")  # 데이터 추출
-                return items
-            else:
-                st.error("데이터 조회에 실패했습니다.")
-                return None
-        except ValueError:
-            st.error("응답에서 JSON을 파싱하는 데 실패했습니다. 응답 내용이 올바르지 않을 수 있습니다.")
-            return None
+        pd.DataFrame: '거리', '최근접위도', '최근접경도', '선분번호' 컬럼 (계산하지 않은 행의 거리는 NaN)
+    """
+    return pd.DataFrame({
+        '거리': np.where(np.isinf(result.distance), np.nan, result.distance),
+        '최근접위도': result.closest_lat,
+        '최근접경도': result.closest_lon,
+        '선분번호': result.segment,
+    }, index=index)
+
+def attach_distances(df, rows, result):
+    """
+    시설물 DataFrame에서 rows 행을 골라 거리 정보 컬럼을 붙입니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        rows (np.ndarray): 행 번호 (위치 기준)
+        result (PolylineDistances): rows와 같은 순서의 거리 계산 결과
+
+    Returns:
+        pd.DataFrame: 선택한 행과 거리 정보 컬럼
+    """
+    matched = df.iloc[rows]
+    frame = distance_frame(result, matched.index)
+    return matched.assign(**{name: column.to_numpy() for name, column in frame.items()})
+
+# 세션별 영향 분석 엔진 (화재 지점을 조금씩 옮길 때 직전 결과를 이용해 부분 계산)
+def get_impact_engine(df):
+    """
+    현재 세션의 영향 분석 엔진을 반환합니다. 시설물 데이터가 바뀌면 새로 만듭니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+
+    Returns:
+        ImpactEngine: 영향 분석 엔진
+    """
+    engine = st.session_state.get('impact_engine')
+    lines = get_linestrings(df)
+    if engine is None or engine.lines is not lines:
+        sharded = get_sharded_impact() if df is get_facilities() else None
+        engine = ImpactEngine(lines, sharded or get_spatial_index(lines))
+        st.session_state.impact_engine = engine
+    return engine
+
+# 화재 지점 주변 시설물 조회 (지도 레이어와 표가 함께 사용)
+def query_impacted(df, radius):
+    """
+    화재 지점에서 반경과 보고서 거리대 중 먼 거리까지의 시설물을 가까운 순서로 조회합니다.
+    화재 지점과 조회 거리가 이전과 같으면 저장해 둔 결과를 그대로 반환하므로,
+    한 번의 실행에서 지도 레이어와 표가 같은 조회 결과를 나눠 씁니다.
+
+    Args:
+        df (pd.DataFrame): 시설물 DataFrame
+        radius (float): 영향 반경 (미터)
+
+    Returns:
+        tuple (np.ndarray, PolylineDistances): 행 번호와 그 행들의 거리 정보 (가까운 순서)
+    """
+    engine = get_impact_engine(df)
+    latitude, longitude = st.session_state.fire_location
+    key = (latitude, longitude, max(radius, DEFAULT_BANDS[-1]))
+    cached = st.session_state.get('impact_query')
+    if cached is None or cached[0] is not engine or cached[1] != key:
+        cached = (engine, key, *engine.query(*key))
+        st.session_state.impact_query = cached
+    return cached[2], cached[3]
+
+# 화재 지점 주변 시설물 표시
+def show_impacted_facilities():
+    """
+    시설물 저장소가 있으면, 화재 지점에서 선택한 반경 안의 시설물을 가까운 순서로 표로 보여주고,
+    거리대별 영향 보고서(집계표와 CSV/Excel 상세 목록)를 제공합니다.
+    """
+    df = get_facilities()
+    if df is None:
+        return
+    radius = st.slider("영향 반경 (m)", min_value=50, max_value=1000, value=200, step=50, key="impact_radius")
+    # 표와 보고서(와 지도 레이어)가 같은 조회 결과를 사용하도록, 둘 중 먼 거리까지 한 번만 조회합니다.
+    rows, result = query_impacted(df, radius)
+    count = int(np.searchsorted(result.distance, radius, side='right'))  # 결과는 가까운 순서입니다.
+    impacted = attach_distances(df, rows[:count], PolylineDistances(*(values[:count] for values in result)))
+    if st.radio("영향 영역", ["반경 (원형)", "바람 방향 (타원형)"], horizontal=True, key="impact_area") == "바람 방향 (타원형)":
+        show_wind_zone_facilities(radius)
     else:
-        st.error(f"API 요청에 실패했습니다. 상태 코드: {response.status_code}")
-        return None
+        st.write(f"반경 {radius}m 안의 시설물: {len(impacted)}건 (전체 {len(df)}건)")
+        st.dataframe(impacted)
+
+    # 거리대별 영향 보고서
+    st.markdown("#### 거리대별 영향 시설물")
+    category = st.selectbox("분류 기준 컬럼", ["(분류 없음)"] + [str(column) for column in df.columns],
+                            key="impact_category")
+    category_column = None if category == "(분류 없음)" else category
+    st.dataframe(summarize(df, rows, result.distance, DEFAULT_BANDS, category_column))
+    # 상세 목록은 내려받기 버튼을 누를 때 묶음 단위로 만들어 임시 파일에 기록합니다.
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("상세 목록 CSV", data=lambda: spool(iter_csv(iter_report_chunks(df, rows, result))),
+                           file_name="impact_report.csv", mime="text/csv")
+    with col2:
+        st.download_button("상세 목록 Excel", data=lambda: spool(iter_excel(iter_report_chunks(df, rows, result))),
+                           file_name="impact_report.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
-# Function to calculate distance from target coordinates
-def calculate_distance(row, target_coordinates):
+# 바람 방향 영향 영역 (1분마다 이 부분만 다시 실행하여 백그라운드에서 갱신된 관측을 반영)
+@st.fragment(run_every=60)
+def show_wind_zone_facilities(radius):
     """
-    GeoPandas DataFrame의 행과 대상 좌표 사이의 거리를 계산합니다.
+    화재 지점 격자의 최신 풍향/풍속으로 타원형 영향 영역을 만들고, 영역과 겹치는 시설물을 위험도 순서로 보여줍니다.
+    관측은 WeatherCache.peek()로 읽으므로 네트워크를 기다리지 않습니다.
 
     Args:
-        row (pd.Series): GeoPandas DataFrame의 행
-        target_coordinates (tuple): (위도, 경도) 튜플 형태의 대상 좌표
+        radius (float): 기본 반경 (미터)
+    """
+    df = get_facilities()
+    latitude, longitude = st.session_state.fire_location
+    observation = get_weather_cache().peek(*to_grid(latitude, longitude))
+    zone = WindZone.from_weather(latitude, longitude, radius, observation.series if observation else None)
+    lines = get_linestrings(df)
+    rows, score, result = zone.impacted(lines, get_spatial_index(lines))
+    st.caption(zone.describe() + ("" if observation else " (날씨 정보를 불러오는 중)"))
+    st.session_state.wind_zone = zone  # 지도에 영역을 그릴 때 사용합니다.
+    st.write(f"영향 영역 안의 시설물: {len(rows)}건")
+    st.dataframe(attach_distances(df, rows, result).assign(위험도=np.round(score, 3)))
+
+# 지도에 그릴 영향 시설물 레이어
+def get_facility_layer():
+    """
+    화재 지점에서 선택한 반경 안의 시설물 선형을 하나의 GeoJSON 레이어로 만듭니다.
+    반경과 분류 기준 컬럼(색상/툴팁)은 지도 아래 영향 시설물 위젯의 값을 사용합니다.
+    지도를 확대/축소해 다시 실행되어도, 시설물과 단순화 단계가 그대로이면 이전에 만든 레이어를 그대로 사용합니다.
 
     Returns:
-        float: 대상 좌표와 행의 중간 지점 사이의 거리 (미터 단위)
-               계산 중 오류 발생 시 None 반환
+        folium.FeatureGroup: 시설물 레이어. 시설물 저장소가 없으면 None을 반환합니다.
     """
-    try:
-        # '공간위치G' 컬럼에서 LINESTRING 좌표 문자열을 추출하고, 쉼표로 분리하여 좌표 리스트 생성
-        points_str = row['공간위치G'].replace("LINESTRING (", "").replace(")", "").split(", ")
-        # 좌표 문자열 리스트를 (경도, 위도) 튜플 리스트로 변환
-        points = [tuple(map(float, point.split())) for point in points_str]
-        # LINESTRING의 중간 지점 계산
-        mid_point = points[len(points) // 2]
-        # (경도, 위도)를 (위도, 경도)로 변환하여 mid_point_coordinates 생성
-        mid_point_coordinates = (mid_point[1], mid_point[0])
-        # 대상 좌표와 중간 지점 사이의 거리 계산 (미터 단위)
-        return geodesic(target_coordinates, mid_point_coordinates).meters
-    except:
+    df = get_facilities()
+    if df is None:
         return None
+    radius = st.session_state.get("impact_radius", 200)
+    category = st.session_state.get("impact_category", "(분류 없음)")
+    category_column = None if category == "(분류 없음)" else category
+    # 아래 표와 같은 조회이므로 query_impacted()가 저장해 둔 결과를 그대로 사용합니다.
+    rows, result = query_impacted(df, radius)
+    count = int(np.searchsorted(result.distance, radius, side='right'))
+    zoom = current_zoom()
+    tolerance = level_for_zoom(zoom, st.session_state.fire_location[0])
+    cached = st.session_state.get('facility_layer')
+    if cached is not None and cached[0] is rows and cached[1:4] == (count, category_column, tolerance):
+        return cached[4]
+    layer = build_facility_layer(df, get_linestrings(df), rows[:count], style_column=category_column,
+                                 tooltip_column=category_column, zoom=zoom)
+    st.session_state.facility_layer = (rows, count, category_column, tolerance, layer)
+    return layer
+
+# 브라우저 지도의 현재 줌 레벨
+def current_zoom():
+    """
+    사용자가 지도에서 바꾼 줌 레벨을 반환합니다. (st_folium이 마지막으로 돌려준 값, 없으면 map_state의 줌 레벨)
+    시설물 레이어는 이 줌에 맞는 단순화 단계로 그립니다.
+    """
+    returned = st.session_state.get(st.session_state.map_key) or {}
+    return returned.get("zoom") or st.session_state.map_state["zoom_level"]
+
+# 지도에 그릴 영향 영역 (반경 원과 바람 방향 타원)
+def update_impact_areas():
+    """
+    화재 상황 레이어의 영향 반경 원과, 바람 방향을 선택한 경우 타원형 영향 영역을 현재 값으로 교체합니다.
+    """
+    layer = st.session_state.incident_layer
+    latitude, longitude = st.session_state.fire_location
+    layer.set(RINGS, radius_ring(latitude, longitude, st.session_state.get("impact_radius", 200)))
+    zone = st.session_state.get("wind_zone")
+    wind = st.session_state.get("impact_area") == "바람 방향 (타원형)" and zone is not None
+    layer.set(WIND, wind_area(zone) if wind else None)
 
 # 페이지 제목 설정
 def set_page_title():
@@ -158,6 +405,25 @@ def set_input_fields():
     zoom_level = 15 # st.slider("최초 줌 레벨을 설정하세요:", min_value=1, max_value=20, value=15)  # 줌 레벨 선택 슬라이더를 생성하고 범위를 설정합니다.
     return address, zoom_level  # 입력된 주소와 줌 레벨을 반환합니다.
 
+# 주소 추천 목록 표시
+def select_address_suggestion(address):
+    """
+    입력된 주소로 시작하는 추천 주소 목록을 표시하고, 사용자가 선택한 추천 주소를 반환하는 함수입니다.
+    추천 주소에는 좌표가 미리 저장되어 있으므로 선택 시 지오코딩 API를 호출하지 않습니다.
+
+    Args:
+        address (str): 입력된 주소
+
+    Returns:
+        tuple (str, float, float): 선택한 (주소, 위도, 경도). 추천 주소를 선택하지 않은 경우 None을 반환합니다.
+    """
+    suggestions = get_address_index().suggest(address, limit=10)
+    if not suggestions:
+        return None
+    labels = ["입력한 주소 그대로 검색"] + [suggestion[0] for suggestion in suggestions]
+    choice = st.selectbox("추천 주소 :", range(len(labels)), format_func=lambda i: labels[i])
+    return suggestions[choice - 1] if choice else None
+
 # Session state 초기화
 def initialize_session_state(zoom_level):
     """
@@ -175,6 +441,7 @@ def initialize_session_state(zoom_level):
         st.session_state.last_clicked_text = "지도를 클릭하여 좌표를 업데이트 가능"  # 마지막 클릭된 좌표 텍스트를 초기화합니다.
         st.session_state.fire_location = st.session_state.map_state["location"]  # 화재 지점 좌표를 초기 위치로 설정합니다.
         st.session_state.map_key = "map1"
+        st.session_state.incident_layer = IncidentLayer()  # 화재 지점 마커와 영향 영역 (지도 위에 따로 그리는 레이어)
         st.session_state.address_search_performed = True
 
 # 주소 검색 및 지도 이동 기능
@@ -204,10 +471,15 @@ def move_to_address(address, zoom_level, gps_point):
     except Exception as e:
         st.error(f"오류가 발생했습니다: {e}")
 
+# 지도 타일 URL (tile_cache.py 프록시를 실행한 경우 예: TILE_URL=http://localhost:8765/{z}/{x}/{y}.png)
+TILE_URL = os.getenv('TILE_URL', "https://tile.openstreetmap.org/{z}/{x}/{y}.png")
+
 # 화면에 지도를 생성하는 함수
 def create_map(latitude, longitude, zoom):
     """
     Folium Map 객체를 생성하고, OpenStreetMap 타일 레이어를 추가하는 함수입니다.
+    이 지도는 세션마다 한 번 만들어 렌더링해 두는 기본 지도이며, 화재 지점 마커나 시설물처럼 바뀌는 내용은
+    display_map()에 레이어로 따로 전달합니다.
 
     Args:
         latitude (float): 지도의 중심 위도
@@ -217,27 +489,41 @@ def create_map(latitude, longitude, zoom):
     Returns:
         folium.Map: 생성된 Folium Map 객체를 반환합니다.
     """
-    m = folium.Map(location=[latitude, longitude], zoom_start=zoom, control_scale=True)  # Folium Map 객체를 생성하고 중심 위치와 줌 레벨을 설정합니다.
+    m = folium.Map(location=[latitude, longitude], zoom_start=zoom, control_scale=True, tiles=None)  # Folium Map 객체를 생성하고 중심 위치와 줌 레벨을 설정합니다. (기본 타일은 아래에서 한 번만 추가)
     folium.TileLayer(
-        "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",  # OpenStreetMap 타일 레이어 URL
+        TILE_URL,  # OpenStreetMap 타일 레이어 URL (또는 로컬 타일 캐시 프록시)
         attr='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',  # 저작권 정보
+        max_zoom=19,
     ).add_to(m)  # 생성된 Map 객체에 타일 레이어를 추가합니다.
+    # st_folium()과 같은 방식으로 변수 이름을 먼저 고정하고 한 번 렌더링해 둡니다.
+    # 이후 실행에서는 전체 HTML을 다시 렌더링하지 않고, 지도 스크립트도 바뀌지 않아 브라우저가 지도를 다시 만들지 않습니다.
+    generate_leaflet_string(m)
+    m.get_root().render()
     return m  # 생성된 Map 객체를 반환합니다.
 
 # Streamlit에서 Folium 지도를 표시하는 함수
-def display_map(m, key):
+def display_map(m, key, overlays=()):
     """
     Streamlit 앱에 Folium 지도를 표시하고, 사용자의 지도 클릭 이벤트를 처리하는 함수입니다.
+    기본 지도(m)는 바뀌지 않으므로 브라우저에서 지도를 다시 만들지 않고, overlays 레이어만 바꿔 그립니다.
+    지도 중심과 줌 레벨도 st.session_state.map_state 값으로 이동만 합니다.
 
     Args:
-        m (folium.Map): 표시할 Folium Map 객체
+        m (folium.Map): 표시할 기본 지도 (create_map()으로 만든 지도)
         key (str): Streamlit 컴포넌트 키 (세션 상태 관리에 사용)
+        overlays (list): 기본 지도 위에 그릴 레이어 (folium.FeatureGroup 목록. 화재 지점, 영향 영역, 시설물 등)
 
     Returns:
         dict: 사용자가 마지막으로 클릭한 위치의 위도, 경도 정보
               None: 지도가 표시되지 않거나, 클릭이벤트가 없는 경우
     """
-    return st_folium(m, width=800, height=600, returned_objects=["last_clicked"], key=key)  # Streamlit에 Folium 지도를 표시하고, 클릭된 위치 정보를 반환하도록 설정합니다.
+    overlays = [layer for layer in overlays if layer is not None]
+    # st_folium은 레이어를 전달받은 지도에 붙이고 렌더링하므로, 실행마다 기본 지도의 복사본을 넘겨 기본 지도는 그대로 둡니다.
+    # 복사본은 변수 이름이 기본 지도와 같아 지도 스크립트가 바뀌지 않습니다. (복사 약 3ms)
+    st_map = st_folium(copy.deepcopy(m), width=800, height=600, returned_objects=["last_clicked", "zoom"], key=key,
+                       center=st.session_state.map_state["location"], zoom=st.session_state.map_state["zoom_level"],
+                       feature_group_to_add=overlays or None, render=False)  # Streamlit에 Folium 지도를 표시하고, 클릭된 위치 정보를 반환하도록 설정합니다.
+    return st_map
 
 # 클릭한 위치의 GPS 좌표를 표시하는 함수
 def display_clicked_location(st_map, m):
@@ -258,6 +544,10 @@ def display_clicked_location(st_map, m):
         st.session_state.last_clicked_text = (
             f"선택한 좌표 : 위도 {last_clicked['lat']:.6f}, 경도 {last_clicked['lng']:.6f}"  # 클릭된 좌표 텍스트 생성
         )
+        reverse_geocoder = get_reverse_geocoder()
+        nearest = reverse_geocoder.nearest(last_clicked["lat"], last_clicked["lng"]) if reverse_geocoder else None
+        if nearest:  # 네트워크 호출 없이 가장 가까운 주소를 함께 표시합니다.
+            st.session_state.last_clicked_text += f" (인근 주소: {nearest[0]}, 약 {nearest[3]:.0f}m)"
         st.session_state.fire_location = [last_clicked["lat"], last_clicked["lng"]]  # 좌표 저장
     return m
 
@@ -281,15 +571,10 @@ def change_fire_location():
         new_longitude = st.session_state.fire_location[1]
 
         st.session_state.map_state["location"] = [new_latitude, new_longitude]
-        m = create_map(new_latitude, new_longitude, st.session_state.map_state["zoom_level"])
-        st.session_state.map = m
         st.session_state.markers = []
 
         # Add fire icon marker
-        fire_icon = folium.Icon(color="red", icon="fire", prefix="fa")
-        folium.Marker(
-            location=[new_latitude, new_longitude], icon=fire_icon, popup="화재 지점"
-        ).add_to(st.session_state.map)
+        st.session_state.incident_layer.set(FIRE, fire_marker(new_latitude, new_longitude))
         st.rerun()
     else:
         st.warning("지도를 클릭하거나 주소를 검색하여 화재 지점을 선택해주세요.")
@@ -299,28 +584,16 @@ def change_fire_location2():
     화재 지점을 변경하고 지도를 업데이트하는 함수. (st.rerun() 없이 지도 객체 직접 수정)
     st.session_state.fire_location에 저장된 좌표를 사용하여 지도의 중심을 변경하고,
     화재 지점을 표시하는 마커를 추가합니다.  st.rerun()을 호출하지 않고,
-    현재 세션 상태에 저장된 folium.Map 객체를 직접 수정하여 지도 상태를 변경합니다.
+    현재 세션 상태에 저장된 화재 지점 레이어를 직접 수정하여 지도 상태를 변경합니다. (기본 지도는 그대로 둡니다.)
     """
     if st.session_state.fire_location:
         new_latitude = st.session_state.fire_location[0]
         new_longitude = st.session_state.fire_location[1]
 
         st.session_state.map_state["location"] = [new_latitude, new_longitude]
-        m = st.session_state.map  # Get the existing map object
-
-        # Remove existing markers
-        for layer in m._children.values():
-            if isinstance(layer, folium.Marker):
-                m.remove_child(layer)
-
-        # Add the new marker
-        fire_icon = folium.Icon(color="red", icon="fire", prefix="fa")
-        folium.Marker(
-            location=[new_latitude, new_longitude], icon=fire_icon, popup="화재 지점"
-        ).add_to(m)
-
-        st.session_state.map = m  # Update the map object in session state
-        # No need to rerun the entire app, the map object is updated in place
+        # 화재 지점 칸의 마커만 교체합니다. (지도의 다른 요소를 순회하지 않습니다.)
+        st.session_state.incident_layer.set(FIRE, fire_marker(new_latitude, new_longitude))
+        # No need to rerun the entire app, the incident layer is updated in place
     else:
         st.warning("지도를 클릭하거나 주소를 검색하여 화재 지점을 선택해주세요.")
 
@@ -334,20 +607,8 @@ def update_map(new_latitude, new_longitude):
         new_longitude (float): 새로운 경도 좌표
     """
     st.session_state.map_state["location"] = [new_latitude, new_longitude]
-    m = st.session_state.map  # Get the existing map object
-
-    # Remove existing markers
-    for layer in m._children.values():
-        if isinstance(layer, folium.Marker):
-            m.remove_child(layer)
-
-    # Add the new marker
-    fire_icon = folium.Icon(color="red", icon="fire", prefix="fa")
-    folium.Marker(
-        location=[new_latitude, new_longitude], icon=fire_icon, popup="화재 지점"
-    ).add_to(m)
-
-    st.session_state.map = m  # Update the map object in session state
+    # 화재 지점 칸의 마커만 교체합니다. (지도의 다른 요소를 순회하지 않습니다.)
+    st.session_state.incident_layer.set(FIRE, fire_marker(new_latitude, new_longitude))
 
 def main():
     """
@@ -357,6 +618,7 @@ def main():
     """
     set_page_title()  # 페이지 제목과 소개문 표시
     address, zoom_level = set_input_fields()  # 주소(부암사옥), 줌 등 초기화
+    suggestion = select_address_suggestion(address)  # 입력한 주소로 시작하는 추천 주소
 
     # 초기 지도 설정 또는 저장된 상태 불러오기
     if 'map' not in st.session_state:
@@ -375,8 +637,12 @@ def main():
     with col1:
         # Naver GPS 좌표 조회 기능으로 전환할 것!!
         if st.button("이동"):
-            gps_point = get_gps_from_address(address)
-            st.write(address, ": ", gps_point[0], ",", gps_point[1])
+            if suggestion:  # 추천 주소를 선택한 경우, 미리 저장된 좌표를 사용합니다.
+                address, gps_point = suggestion[0], (suggestion[1], suggestion[2])
+            else:
+                gps_point = get_gps_from_address(address)
+            if gps_point:
+                st.write(address, ": ", gps_point[0], ",", gps_point[1])
             move_to_address(address, zoom_level, gps_point)
 
 
@@ -389,11 +655,39 @@ def main():
     show_last_clicked_text() # st.session_state.last_clicked_text -> 함수 호출로 변경
 
     # 화재지점 GPS 좌표 표기
-    st_map = display_map(m, st.session_state.map_key)
+    # 기본 지도 위에 시설물 레이어와 화재 상황 레이어(화재 지점, 영향 영역)를 그립니다. (실행마다 이 레이어들만 새로 보냅니다.)
+    update_impact_areas()
+    overlays = [get_facility_layer(), st.session_state.incident_layer]
+    st_map = display_map(m, st.session_state.map_key, overlays)
     m = display_clicked_location(st_map, m)
 
     # Update the map
     st.session_state.map = m
 
+    # 화재 지점 날씨 표시 (백그라운드에서 갱신된 관측 사용)
+    show_fire_weather(st.session_state.fire_location[0], st.session_state.fire_location[1])
+
+    # 화재 지점 주변 시설물 표시
+    show_impacted_facilities()
+
+    # 지오코딩 캐시 적중률 표시
+    cache_stats = get_geocode_cache().stats()
+    st.sidebar.caption(
+        f"지오코딩 캐시: 적중 {cache_stats['hits']} / 실패 {cache_stats['misses']} "
+        f"(적중률 {cache_stats['hit_rate']:.0%}, 저장 {cache_stats['entries']}건)"
+    )
+    # 외부 API 응답 시간 통계 표시
+    with st.sidebar.expander("API 응답 시간"):
+        st.json(get_client().latency_stats())
+        st.json(get_geocoder().health())
+    with st.sidebar.expander("날씨 갱신 상태"):
+        st.json(get_weather_prefetcher().stats())
+    # 시설물 좌표 검증 결과 (저장소를 만들 때 거부된 행과 사유)
+    if get_facilities() is not None:
+        counts, quarantine = get_facility_validation()
+        with st.sidebar.expander(f"시설물 좌표 검증 (거부 {counts.get('rejected', 0)}건)"):
+            st.json(counts)
+            st.dataframe(quarantine)
+
 if __name__ == "__main__":
     main()
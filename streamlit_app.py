@@ -2,10 +2,22 @@ import streamlit as st
 from geopy.geocoders import Nominatim
 import folium
 from streamlit_folium import st_folium
+from geocode_cache import GeocodeCache
 
 # 전역 변수
 FIRE_LOCATION = [37.5665, 126.9780]  # 초기 서울 시청 좌표
 
+# 지오코딩 캐시 (프로세스당 1개, 디스크 파일은 모든 프로세스가 공유)
+@st.cache_resource
+def get_geocode_cache():
+    """
+    모든 세션이 공유하는 지오코딩 디스크 캐시 객체를 반환합니다.
+
+    Returns:
+        GeocodeCache: 지오코딩 캐시 객체
+    """
+    return GeocodeCache()
+
 # 모듈 1: 주소를 받아 GPS 좌표로 변환하여 FIRE_LOCATION에 저장
 def get_gps_from_address(address):
     """
@@ -17,11 +29,16 @@ def get_gps_from_address(address):
     Returns:
         bool: 성공 여부를 반환합니다.
     """
-    geolocator = Nominatim(user_agent="geocoding_service")
+    cache = get_geocode_cache()
     try:
-        location = geolocator.geocode(address)
-        if location:
-            st.session_state['FIRE_LOCATION'] = [location.latitude, location.longitude]
+        found, coordinates = cache.get(address)  # 캐시에 저장된 결과가 있으면 Nominatim을 호출하지 않습니다.
+        if not found:
+            geolocator = Nominatim(user_agent="geocoding_service")
+            location = geolocator.geocode(address)
+            coordinates = (location.latitude, location.longitude) if location else None
+            cache.put(address, coordinates)
+        if coordinates:
+            st.session_state['FIRE_LOCATION'] = [coordinates[0], coordinates[1]]
             st.success(f"'{address}'의 GPS 좌표: {st.session_state['FIRE_LOCATION']}")
             return True
         else:
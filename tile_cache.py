@@ -0,0 +1,503 @@
+import argparse
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from http_client import get_client
+
+# 타일 캐시 기본 설정 (환경 변수로 변경 가능)
+TILE_CACHE_PATH = os.getenv('TILE_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'tiles.sqlite3'))
+TILE_CACHE_MAX_BYTES = int(os.getenv('TILE_CACHE_MAX_BYTES', str(2 * 1024 ** 3)))  # 최대 보관 크기 (초과 시 LRU 방식으로 제거)
+TILE_UPSTREAM = os.getenv('TILE_UPSTREAM', 'https://tile.openstreetmap.org/{z}/{x}/{y}.png')  # 원본 타일 서버
+# OSM 타일 사용 정책상 요청마다 앱을 식별할 수 있는 User-Agent가 필요합니다.
+TILE_USER_AGENT = os.getenv('TILE_USER_AGENT', 'fire-impact-tool-tile-cache/1.0')
+TILE_PROXY_HOST = os.getenv('TILE_PROXY_HOST', '127.0.0.1')
+TILE_PROXY_PORT = int(os.getenv('TILE_PROXY_PORT', '8765'))
+TILE_MAX_AGE = 7 * 24 * 3600  # 브라우저가 타일을 다시 묻지 않고 사용하는 기간 (Cache-Control max-age, 7일)
+TILE_REFRESH_AGE = 30 * 24 * 3600  # 이보다 오래된 타일은 원본 서버에 변경 여부를 확인합니다. (30일)
+MAX_ZOOM = 19
+SEED_MAX_TILES = 10000  # --force 없이 한 번에 미리 받을 수 있는 최대 타일 수 (OSM 대량 다운로드 제한)
+SEED_DELAY = 0.1  # 미리 받기에서 원본 서버 요청 사이의 대기 시간 (초)
+_ACCESS_RESOLUTION = 60  # 최근 사용 시각을 이 간격(초)보다 자주 기록하지 않습니다. (타일마다 쓰기 방지)
+_FLUSH_INTERVAL = 30  # 메모리에 모아 둔 적중/실패 횟수와 최근 사용 시각을 이 간격(초)마다 DB에 기록합니다.
+_EVICT_RATIO = 0.9  # 제거할 때 최대 크기의 이 비율까지 줄여, 넘칠 때마다 제거하지 않게 합니다.
+_TILE_PATH = re.compile(r'^/(\d+)/(\d+)/(\d+)\.png$')
+
+Tile = namedtuple('Tile', ['data', 'etag', 'fetched_at'])
+
+
+def tile_range(bbox, zoom):
+    """
+    경계 상자를 덮는 타일 번호 범위를 구합니다. (Web Mercator, OSM 타일 번호)
+
+    Args:
+        bbox (tuple): (최소 경도, 최소 위도, 최대 경도, 최대 위도)
+        zoom (int): 줌 레벨
+
+    Returns:
+        tuple (range, range): x 범위, y 범위
+    """
+    n = 2 ** zoom
+
+    def tile_x(longitude):
+        return min(n - 1, max(0, int((longitude + 180.0) / 360.0 * n)))
+
+    def tile_y(latitude):
+        latitude = math.radians(max(-85.0511, min(85.0511, latitude)))
+        return min(n - 1, max(0, int((1.0 - math.asinh(math.tan(latitude)) / math.pi) / 2.0 * n)))
+
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return range(tile_x(min_lon), tile_x(max_lon) + 1), range(tile_y(max_lat), tile_y(min_lat) + 1)
+
+
+def _etag(data):
+    return '"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+
+
+class TileCache:
+    """
+    SQLite 파일에 지도 타일(PNG)을 저장하는 디스크 캐시입니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 타일부터 제거합니다.
+    미리 받기(seed)나 MBTiles 가져오기로 넣은 타일은 고정(pinned)되어 제거하지 않으므로, 해당 지역은 오프라인에서도 사용할 수 있습니다.
+    조회는 DB에 쓰지 않습니다. 적중/실패 횟수와 최근 사용 시각은 메모리에 모았다가 flush()로 한 번에 기록하므로,
+    프록시의 요청 스레드들이 SQLite의 쓰기 잠금을 기다리지 않습니다.
+    """
+
+    def __init__(self, path=TILE_CACHE_PATH, max_bytes=TILE_CACHE_MAX_BYTES):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            max_bytes (int): 최대 보관 크기 (바이트)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()  # 스레드별 커넥션 (프록시는 요청마다 스레드에서 처리)
+        self._inflight = {}  # 원본 서버에서 받는 중인 타일 -> threading.Event
+        self._inflight_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending_counts = {'hits': 0, 'misses': 0}  # 아직 기록하지 않은 적중/실패 횟수
+        self._pending_access = {}  # 아직 기록하지 않은 최근 사용 시각 (z, x, y) -> time.time
+        self._flushed_at = time.monotonic()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tiles (
+                    z INTEGER NOT NULL,
+                    x INTEGER NOT NULL,
+                    y INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    etag TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    pinned INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (z, x, y)
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS tiles_last_access ON tiles (pinned, last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS tile_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO tile_stats VALUES ('hits', 0), ('misses', 0), ('bytes', 0)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 스레드/프로세스의 동시 읽기를 허용합니다.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, z, x, y):
+        """
+        캐시에서 타일을 조회합니다.
+
+        Returns:
+            Tile: (PNG 바이트, ETag, 받은 시각). 없으면 None
+        """
+        now = time.time()
+        row = self._connect().execute(
+            "SELECT data, etag, fetched_at, last_access FROM tiles WHERE z = ? AND x = ? AND y = ?", (z, x, y)).fetchone()
+        with self._pending_lock:
+            self._pending_counts['misses' if row is None else 'hits'] += 1
+            if row is not None and now - row[3] > _ACCESS_RESOLUTION:
+                self._pending_access[(z, x, y)] = now
+            due = time.monotonic() - self._flushed_at >= _FLUSH_INTERVAL
+        if due:
+            self.flush()
+        if row is None:
+            return None
+        return Tile(row[0], row[1], row[2])
+
+    def _write_pending(self, conn):
+        # 모아 둔 횟수와 최근 사용 시각을 conn의 현재 트랜잭션에 기록합니다.
+        with self._pending_lock:
+            counts, self._pending_counts = self._pending_counts, {'hits': 0, 'misses': 0}
+            access, self._pending_access = self._pending_access, {}
+            self._flushed_at = time.monotonic()
+        conn.executemany("UPDATE tile_stats SET value = value + ? WHERE name = ?",
+                         [(count, name) for name, count in counts.items() if count])
+        conn.executemany("UPDATE tiles SET last_access = max(last_access, ?) WHERE z = ? AND x = ? AND y = ?",
+                         [(seen, z, x, y) for (z, x, y), seen in access.items()])
+
+    def flush(self):
+        """
+        메모리에 모아 둔 적중/실패 횟수와 최근 사용 시각을 한 번의 트랜잭션으로 기록합니다.
+        """
+        with self._pending_lock:
+            if not any(self._pending_counts.values()) and not self._pending_access:
+                return
+        with self._connect() as conn:
+            self._write_pending(conn)
+
+    def contains(self, z, x, y):
+        """
+        타일이 캐시에 있는지 확인합니다. (통계와 최근 사용 시각을 바꾸지 않습니다.)
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM tiles WHERE z = ? AND x = ? AND y = ?", (z, x, y)).fetchone() is not None
+
+    def put_many(self, tiles, pinned=False):
+        """
+        타일을 한 번의 트랜잭션으로 저장하고, 최대 크기를 넘으면 오래 사용되지 않은 고정되지 않은 타일을 제거합니다.
+
+        Args:
+            tiles (iterable): (z, x, y, PNG 바이트) 묶음
+            pinned (bool): 제거하지 않는 타일로 저장할지 여부
+        """
+        now = time.time()
+        with self._connect() as conn:
+            self._write_pending(conn)  # 제거할 타일을 고르기 전에 최근 사용 시각을 반영합니다.
+            added = 0
+            for z, x, y, data in tiles:
+                old = conn.execute("SELECT length(data), pinned FROM tiles WHERE z = ? AND x = ? AND y = ?",
+                                   (z, x, y)).fetchone()
+                keep_pinned = pinned or bool(old and old[1])  # 고정된 타일은 일반 요청으로 갱신해도 고정을 유지합니다.
+                conn.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (z, x, y, sqlite3.Binary(data), _etag(data), now, now, int(keep_pinned)))
+                added += len(data) - (old[0] if old else 0)
+            conn.execute("UPDATE tile_stats SET value = value + ? WHERE name = 'bytes'", (added,))
+            self._evict(conn)
+
+    def put(self, z, x, y, data, pinned=False):
+        """
+        타일 하나를 저장합니다.
+        """
+        self.put_many([(z, x, y, data)], pinned)
+
+    def pin(self, z, x, y):
+        """
+        타일을 제거하지 않는 고정 타일로 표시합니다.
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE tiles SET pinned = 1 WHERE z = ? AND x = ? AND y = ?", (z, x, y))
+
+    def touch(self, z, x, y):
+        """
+        원본 서버에서 타일이 바뀌지 않았음을 확인한 시각을 기록합니다.
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE tiles SET fetched_at = ? WHERE z = ? AND x = ? AND y = ?", (time.time(), z, x, y))
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT value FROM tile_stats WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * _EVICT_RATIO)
+        removed = 0
+        victims = []
+        for z, x, y, size in conn.execute(
+                "SELECT z, x, y, length(data) FROM tiles WHERE pinned = 0 ORDER BY last_access"):
+            victims.append((z, x, y))
+            removed += size
+            if removed >= target:
+                break
+        conn.executemany("DELETE FROM tiles WHERE z = ? AND x = ? AND y = ?", victims)
+        conn.execute("UPDATE tile_stats SET value = value - ? WHERE name = 'bytes'", (removed,))
+
+    def fetch(self, z, x, y, offline=False):
+        """
+        타일을 반환합니다. 캐시에 없거나 오래된 타일이면 원본 서버에서 받아 저장합니다.
+        같은 타일을 여러 요청이 동시에 찾으면 원본 서버에는 한 번만 요청합니다.
+        원본 서버에 연결할 수 없으면 오래된 타일이라도 그대로 반환합니다.
+
+        Args:
+            z (int): 줌 레벨
+            x (int): 타일 x 번호
+            y (int): 타일 y 번호
+            offline (bool): True이면 원본 서버에 요청하지 않습니다.
+
+        Returns:
+            Tile: 타일. 캐시에 없고 받을 수도 없으면 None
+        """
+        tile = self.get(z, x, y)
+        if offline or (tile is not None and time.time() - tile.fetched_at < TILE_REFRESH_AGE):
+            return tile
+
+        key = (z, x, y)
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+        if not owner:
+            event.wait(timeout=30)  # 다른 요청이 받은 결과를 사용합니다.
+            return self.get(z, x, y) or tile
+        try:
+            return self._download(z, x, y, tile)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            event.set()
+
+    def _download(self, z, x, y, stale):
+        headers = {'User-Agent': TILE_USER_AGENT}
+        if stale is not None:
+            headers['If-Modified-Since'] = formatdate(stale.fetched_at, usegmt=True)
+        try:
+            response = get_client().get('osm_tile', TILE_UPSTREAM.format(z=z, x=x, y=y), headers=headers)
+        except requests.RequestException:
+            return stale
+        if response.status_code == 304 and stale is not None:
+            self.touch(z, x, y)
+            return stale
+        if response.status_code != 200 or not response.content:
+            return stale
+        self.put(z, x, y, response.content)
+        return Tile(response.content, _etag(response.content), time.time())
+
+    def stats(self):
+        """
+        캐시 적중/실패 횟수와 저장된 타일 수, 크기를 반환합니다.
+
+        Returns:
+            dict: {'hits', 'misses', 'tiles', 'pinned', 'bytes', 'max_bytes', 'hit_rate'}
+        """
+        self.flush()
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM tile_stats").fetchall())
+            tiles, pinned = conn.execute("SELECT COUNT(*), COALESCE(SUM(pinned), 0) FROM tiles").fetchone()
+        total = counters['hits'] + counters['misses']
+        return {
+            'hits': counters['hits'],
+            'misses': counters['misses'],
+            'tiles': tiles,
+            'pinned': pinned,
+            'bytes': counters['bytes'],
+            'max_bytes': self.max_bytes,
+            'hit_rate': counters['hits'] / total if total else 0.0,
+        }
+
+
+def seed(cache, bbox, min_zoom, max_zoom, refresh=False, delay=SEED_DELAY, log=print):
+    """
+    경계 상자와 줌 범위의 타일을 원본 서버에서 미리 받아 고정 타일로 저장합니다.
+
+    Args:
+        cache (TileCache): 타일 캐시
+        bbox (tuple): (최소 경도, 최소 위도, 최대 경도, 최대 위도)
+        min_zoom (int): 최소 줌 레벨
+        max_zoom (int): 최대 줌 레벨
+        refresh (bool): 이미 있는 타일도 다시 받을지 여부
+        delay (float): 요청 사이의 대기 시간 (초)
+        log (callable): 진행 상황 출력 함수
+
+    Returns:
+        dict: {'fetched', 'skipped', 'failed'} 건수
+    """
+    stats = {'fetched': 0, 'skipped': 0, 'failed': 0}
+    headers = {'User-Agent': TILE_USER_AGENT}
+    for z in range(min_zoom, max_zoom + 1):
+        xs, ys = tile_range(bbox, z)
+        for x in xs:
+            for y in ys:
+                if not refresh and cache.contains(z, x, y):
+                    cache.pin(z, x, y)  # 요청으로 받아 둔 타일도 이 범위에 들면 제거하지 않습니다.
+                    stats['skipped'] += 1
+                    continue
+                try:
+                    response = get_client().get('osm_tile', TILE_UPSTREAM.format(z=z, x=x, y=y), headers=headers)
+                except requests.RequestException:
+                    response = None
+                if response is None or response.status_code != 200 or not response.content:
+                    stats['failed'] += 1
+                else:
+                    cache.put(z, x, y, response.content, pinned=True)
+                    stats['fetched'] += 1
+                if delay:
+                    time.sleep(delay)
+        log(f"줌 {z}: {len(xs) * len(ys)}개 타일 (누적 받음 {stats['fetched']}, 건너뜀 {stats['skipped']}, "
+            f"실패 {stats['failed']})")
+    return stats
+
+
+def import_mbtiles(cache, path, batch=1000):
+    """
+    MBTiles 파일(PNG 래스터 타일)의 타일을 고정 타일로 가져옵니다.
+
+    Args:
+        cache (TileCache): 타일 캐시
+        path (str): MBTiles 파일 경로
+        batch (int): 한 트랜잭션에 저장하는 타일 수
+
+    Returns:
+        int: 가져온 타일 수
+
+    Raises:
+        ValueError: PNG 타일이 아닌 MBTiles 파일인 경우
+    """
+    source = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        metadata = dict(source.execute("SELECT name, value FROM metadata").fetchall())
+        if metadata.get('format', 'png') != 'png':
+            raise ValueError(f"PNG 타일이 아닌 MBTiles 파일입니다: format={metadata.get('format')}")
+        count = 0
+        rows = source.execute("SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles")
+        while True:
+            chunk = rows.fetchmany(batch)
+            if not chunk:
+                break
+            # MBTiles는 TMS 방식이라 y축이 반대입니다.
+            cache.put_many([(z, x, (1 << z) - 1 - row, bytes(data)) for z, x, row, data in chunk], pinned=True)
+            count += len(chunk)
+        return count
+    finally:
+        source.close()
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """
+    /{z}/{x}/{y}.png 요청에 캐시의 타일을 응답합니다. 서버 객체의 cache, offline 속성을 사용합니다.
+    """
+
+    def do_GET(self):
+        match = _TILE_PATH.match(self.path.split('?', 1)[0])
+        if match is None:
+            self.send_error(404)
+            return
+        z, x, y = map(int, match.groups())
+        if z > MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+            self.send_error(404)
+            return
+        tile = self.server.cache.fetch(z, x, y, offline=self.server.offline)
+        if tile is None:
+            self.send_error(404 if self.server.offline else 502)
+            return
+
+        if self.headers.get('If-None-Match') == tile.etag or self._not_modified_since(tile.fetched_at):
+            self.send_response(304)
+            self._send_cache_headers(tile)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(tile.data)))
+        self._send_cache_headers(tile)
+        self.end_headers()
+        self.wfile.write(tile.data)
+
+    def _not_modified_since(self, fetched_at):
+        since = self.headers.get('If-Modified-Since')
+        if since is None or self.headers.get('If-None-Match') is not None:
+            return False
+        try:
+            return parsedate_to_datetime(since).timestamp() >= int(fetched_at)
+        except (TypeError, ValueError):
+            return False
+
+    def _send_cache_headers(self, tile):
+        self.send_header('Cache-Control', f'public, max-age={TILE_MAX_AGE}')
+        self.send_header('ETag', tile.etag)
+        self.send_header('Last-Modified', formatdate(tile.fetched_at, usegmt=True))
+        self.send_header('Access-Control-Allow-Origin', '*')
+
+    def log_message(self, format, *args):
+        pass  # 타일 요청마다 로그를 남기지 않습니다.
+
+
+def serve(cache, host=TILE_PROXY_HOST, port=TILE_PROXY_PORT, offline=False):
+    """
+    타일 프록시 서버를 실행합니다. (Ctrl+C로 종료)
+
+    Args:
+        cache (TileCache): 타일 캐시
+        host (str): 바인딩할 주소
+        port (int): 포트
+        offline (bool): True이면 캐시에 있는 타일만 응답합니다.
+    """
+    server = ThreadingHTTPServer((host, port), TileHandler)
+    server.daemon_threads = True
+    server.cache = cache
+    server.offline = offline
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cache.flush()
+
+
+def main(argv=None):
+    """
+    명령행에서 타일 프록시를 실행하거나 캐시를 미리 채웁니다.
+
+    예:
+        python tile_cache.py serve --port 8765
+        python tile_cache.py seed --bbox 128.95 35.05 129.20 35.25 --zoom 12 16
+        python tile_cache.py import busan.mbtiles
+    """
+    parser = argparse.ArgumentParser(description="지도 타일 캐시 프록시")
+    parser.add_argument('--cache', default=TILE_CACHE_PATH, help=f"캐시 파일 경로 (기본값: {TILE_CACHE_PATH})")
+    parser.add_argument('--max-bytes', type=int, default=TILE_CACHE_MAX_BYTES, help="캐시 최대 크기 (바이트)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help="타일 프록시 서버 실행")
+    serve_parser.add_argument('--host', default=TILE_PROXY_HOST)
+    serve_parser.add_argument('--port', type=int, default=TILE_PROXY_PORT)
+    serve_parser.add_argument('--offline', action='store_true', help="원본 서버에 요청하지 않고 캐시의 타일만 응답합니다.")
+    seed_parser = commands.add_parser('seed', help="경계 상자와 줌 범위의 타일을 미리 받기")
+    seed_parser.add_argument('--bbox', type=float, nargs=4, required=True,
+                             metavar=('MIN_LON', 'MIN_LAT', 'MAX_LON', 'MAX_LAT'))
+    seed_parser.add_argument('--zoom', type=int, nargs=2, required=True, metavar=('MIN', 'MAX'))
+    seed_parser.add_argument('--refresh', action='store_true', help="이미 있는 타일도 다시 받습니다.")
+    seed_parser.add_argument('--delay', type=float, default=SEED_DELAY, help=f"요청 간격 (초, 기본값: {SEED_DELAY})")
+    seed_parser.add_argument('--force', action='store_true', help=f"{SEED_MAX_TILES}개보다 많은 타일도 받습니다.")
+    import_parser = commands.add_parser('import', help="MBTiles 파일의 타일 가져오기")
+    import_parser.add_argument('mbtiles', help="MBTiles 파일 경로")
+    commands.add_parser('stats', help="캐시 통계 출력")
+    args = parser.parse_args(argv)
+
+    cache = TileCache(args.cache, args.max_bytes)
+    if args.command == 'serve':
+        print(f"타일 프록시: http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.png"
+              + (" (오프라인)" if args.offline else f" (원본: {TILE_UPSTREAM})"))
+        serve(cache, args.host, args.port, args.offline)
+    elif args.command == 'seed':
+        min_zoom, max_zoom = sorted(args.zoom)
+        total = 0
+        for z in range(min_zoom, min(max_zoom, MAX_ZOOM) + 1):
+            xs, ys = tile_range(args.bbox, z)
+            total += len(xs) * len(ys)
+        if total > SEED_MAX_TILES and not args.force:
+            parser.error(f"받을 타일이 {total}개로 {SEED_MAX_TILES}개를 넘습니다. 범위를 줄이거나, "
+                         f"자체 타일 서버(TILE_UPSTREAM)를 사용하는 경우 --force를 지정하세요.")
+        started = time.perf_counter()
+        stats = seed(cache, args.bbox, min_zoom, min(max_zoom, MAX_ZOOM), args.refresh, args.delay)
+        print(f"받음 {stats['fetched']} / 건너뜀 {stats['skipped']} / 실패 {stats['failed']}, "
+              f"{time.perf_counter() - started:.1f}초")
+    elif args.command == 'import':
+        count = import_mbtiles(cache, args.mbtiles)
+        print(f"{count}개 타일을 가져왔습니다.")
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
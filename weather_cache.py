@@ -0,0 +1,166 @@
+import datetime
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pytz
+
+from kma_weather import WeatherError, fetch_observation
+
+SEOUL_TZ = pytz.timezone('Asia/Seoul')
+# 초단기실황은 매시 정각 관측값이 매시 40분 이후에 제공됩니다. 여유를 두어 45분부터 새 관측을 요청합니다.
+RELEASE_MINUTE = 45
+
+# 조회 결과. stale=True이면 최신 관측을 가져오지 못해 이전 관측을 대신 반환한 것입니다.
+WeatherResult = namedtuple('WeatherResult', ['series', 'base_date', 'base_time', 'fetched_at', 'stale'])
+
+
+def latest_release(now=None, release_minute=RELEASE_MINUTE):
+    """
+    현재 시각에 조회 가능한 가장 최근 관측의 발표 시각과, 다음 관측이 발표되는 시각을 계산합니다.
+
+    Args:
+        now (datetime, optional): 기준 시각 (기본값: 현재 서울 시각)
+        release_minute (int): 관측값이 제공되기 시작하는 분
+
+    Returns:
+        tuple (str, str, datetime): (base_date "YYYYMMDD", base_time "HH00", 다음 발표 시각)
+    """
+    now = now or datetime.datetime.now(SEOUL_TZ)
+    base = now.replace(minute=0, second=0, microsecond=0)
+    if now.minute < release_minute:
+        base -= datetime.timedelta(hours=1)  # 이번 정각 관측은 아직 제공되지 않았습니다.
+    next_release = base + datetime.timedelta(hours=1, minutes=release_minute)
+    return base.strftime("%Y%m%d"), base.strftime("%H00"), next_release
+
+
+class WeatherCache:
+    """
+    격자별 기상 관측을 (nx, ny, base_date, base_time) 키로 보관하는 캐시입니다.
+    - 항목은 기상청이 다음 관측을 발표하는 시각에 만료됩니다.
+    - 같은 격자를 동시에 요청하는 세션들은 하나의 API 요청을 공유합니다.
+    - API가 느리거나 실패하면 해당 격자의 마지막 정상 관측을 stale 표시와 함께 반환합니다.
+    """
+
+    def __init__(self, fetch=fetch_observation, wait_timeout=3.0, max_workers=4, retry_after=30.0, clock=None):
+        """
+        Args:
+            fetch (function): (nx, ny, base_date, base_time)을 받아 관측 자료(WeatherSeries)를 반환하는 함수
+            wait_timeout (float): 새 관측을 기다리는 최대 시간 (초)
+            max_workers (int): 동시에 진행할 수 있는 API 요청 수
+            retry_after (float): 요청이 실패한 격자에 다시 요청하기까지 기다리는 시간 (초)
+            clock (function, optional): 현재 서울 시각을 반환하는 함수 (테스트에서 교체 가능)
+        """
+        self.fetch = fetch
+        self.wait_timeout = wait_timeout
+        self.clock = clock or (lambda: datetime.datetime.now(SEOUL_TZ))
+        self.entries = {}  # (nx, ny, base_date, base_time) -> WeatherResult
+        self.last_good = {}  # (nx, ny) -> 가장 최근의 정상 WeatherResult
+        self.in_flight = {}  # (nx, ny, base_date, base_time) -> Future
+        self.failed_at = {}  # (nx, ny, base_date, base_time) -> 마지막 실패 시각 (time.monotonic)
+        self.slot = None  # failed_at을 마지막으로 정리한 발표 시각 (base_date, base_time)
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather')
+
+    def _fetch(self, key):
+        nx, ny, base_date, base_time = key
+        try:
+            series = self.fetch(nx, ny, base_date, base_time)
+            result = WeatherResult(series, base_date, base_time, time.time(), False)
+            with self.lock:
+                self.entries[key] = result
+                self.last_good[(nx, ny)] = result
+                self.failed_at.pop(key, None)
+                # 지난 발표 시각의 항목은 더 이상 조회되지 않으므로 정리합니다.
+                for old in [k for k in self.entries if k[:2] == (nx, ny) and k != key]:
+                    del self.entries[old]
+            return result
+        except Exception as e:
+            with self.lock:
+                self.failed_at[key] = time.monotonic()
+            if isinstance(e, WeatherError):
+                raise
+            # 응답 해석 중의 예상하지 못한 오류도 WeatherError로 바꿔, 조회하는 쪽이 이전 관측을 대신 반환하게 합니다.
+            raise WeatherError(f"날씨 정보를 처리하지 못했습니다: {e!r}") from e
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def _lookup(self, nx, ny):
+        # 최신 관측이 캐시에 있으면 (결과, None, None), 없으면 (None, 진행 중인 요청, 이전 관측)을 반환합니다.
+        base_date, base_time, _ = latest_release(self.clock())
+        key = (nx, ny, base_date, base_time)
+        with self.lock:
+            if self.slot != (base_date, base_time):
+                # 발표 시각이 바뀌면 지난 시각의 실패 기록은 다시 쓰이지 않으므로 정리합니다.
+                self.slot = (base_date, base_time)
+                self.failed_at = {k: t for k, t in self.failed_at.items() if k[2:] == self.slot}
+            result = self.entries.get(key)
+            if result is not None:
+                return result, None, None
+            fallback = self.last_good.get((nx, ny))
+            failed_at = self.failed_at.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+                return None, None, fallback  # 장애 중인 API를 세션마다 다시 호출하지 않습니다.
+            future = self.in_flight.get(key)
+            if future is None:  # 같은 격자의 요청이 진행 중이면 새로 요청하지 않고 그 결과를 함께 기다립니다.
+                future = self.executor.submit(self._fetch, key)
+                self.in_flight[key] = future
+            return None, future, fallback
+
+    def get(self, nx, ny):
+        """
+        격자의 최신 관측을 반환합니다.
+
+        Args:
+            nx (int): X 격자 좌표
+            ny (int): Y 격자 좌표
+
+        Returns:
+            WeatherResult: 관측 결과. 최신 관측을 가져오지 못한 경우 stale=True인 이전 관측
+
+        Raises:
+            WeatherError: 최신 관측을 가져오지 못했고 이전 관측도 없는 경우
+        """
+        result, future, fallback = self._lookup(nx, ny)
+        if result is not None:
+            return result
+        if future is None:
+            if fallback is None:
+                raise WeatherError("날씨 API 요청이 최근 실패하여 잠시 후 다시 시도합니다.")
+            return fallback._replace(stale=True)
+        try:
+            return future.result(timeout=self.wait_timeout)
+        except (WeatherError, FutureTimeoutError) as e:
+            if fallback is not None:
+                return fallback._replace(stale=True)
+            if isinstance(e, WeatherError):
+                raise
+            # 요청은 계속 진행되며, 완료되면 다음 조회에서 결과를 반환합니다.
+            raise WeatherError(f"날씨 API가 {self.wait_timeout:g}초 안에 응답하지 않았습니다.") from e
+
+    def peek(self, nx, ny):
+        """
+        API를 호출하거나 기다리지 않고, 격자의 가장 최근 정상 관측을 바로 반환합니다.
+        최신 발표 시각의 관측이 아니면 stale=True로 표시합니다.
+
+        Returns:
+            WeatherResult: 관측 결과. 한 번도 가져온 적이 없으면 None
+        """
+        base_date, base_time, _ = latest_release(self.clock())
+        with self.lock:
+            result = self.last_good.get((nx, ny))
+        if result is None:
+            return None
+        return result._replace(stale=(result.base_date, result.base_time) != (base_date, base_time))
+
+    def prefetch(self, nx, ny):
+        """
+        격자의 최신 관측이 캐시에 없으면 백그라운드 요청을 시작합니다. 결과를 기다리지 않습니다.
+
+        Returns:
+            Future: 진행 중인 요청. 이미 최신 관측이 있으면 None
+        """
+        return self._lookup(nx, ny)[1]
@@ -0,0 +1,158 @@
+import threading
+import time
+from concurrent.futures import wait
+
+from weather_cache import latest_release
+
+
+class WeatherPrefetcher:
+    """
+    활성 화재 지점의 기상 격자를 추적하고, 기상청의 매시 발표 직후 백그라운드 스레드에서 관측을 갱신하는 작업자입니다.
+    화면은 WeatherCache.peek()로 이미 받아 둔 관측만 읽으므로 네트워크를 기다리지 않습니다.
+    """
+
+    def __init__(self, cache, max_concurrency=4, cell_ttl=6 * 3600, retry_delay=60.0, fetch_timeout=30.0):
+        """
+        Args:
+            cache (WeatherCache): 관측을 저장할 기상 캐시
+            max_concurrency (int): 한 번에 진행할 최대 API 요청 수
+            cell_ttl (float): 이 시간(초) 동안 조회되지 않은 격자는 추적 대상에서 제외합니다.
+            retry_delay (float): 갱신에 실패한 격자를 다시 시도하기까지의 시간 (초)
+            fetch_timeout (float): 요청 한 묶음을 기다리는 최대 시간 (초)
+        """
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.cell_ttl = cell_ttl
+        self.retry_delay = retry_delay
+        self.fetch_timeout = fetch_timeout
+        self.cells = {}  # (nx, ny) -> 마지막으로 조회된 시각 (time.time)
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.retry_requested = threading.Event()  # 새 격자의 첫 요청이 실패하면 설정됩니다.
+        self.stopped = threading.Event()
+        self.thread = None
+        self.metrics = {
+            'cycles': 0,
+            'last_cycle_at': None,
+            'last_cycle_seconds': None,
+            'last_cycle_cells': 0,
+            'last_cycle_failures': 0,
+        }
+
+    def track(self, nx, ny):
+        """
+        격자를 갱신 대상으로 등록합니다. 처음 등록된 격자는 바로 관측을 요청하고,
+        그 요청이 실패하면 다음 발표 시각까지 기다리지 않고 retry_delay 뒤에 다시 시도하도록 작업자를 깨웁니다.
+
+        Args:
+            nx (int): X 격자 좌표
+            ny (int): Y 격자 좌표
+        """
+        with self.lock:
+            is_new = (nx, ny) not in self.cells
+            self.cells[(nx, ny)] = time.time()
+        if is_new:
+            future = self.cache.prefetch(nx, ny)
+            if future is not None:
+                future.add_done_callback(self._first_fetch_done)
+
+    def _first_fetch_done(self, future):
+        if future.cancelled() or future.exception() is not None:
+            self.retry_requested.set()
+            self.wakeup.set()
+
+    def active_cells(self):
+        """
+        최근 cell_ttl 안에 조회된 격자 목록을 반환하고, 오래된 격자는 추적 대상에서 제외합니다.
+        """
+        cutoff = time.time() - self.cell_ttl
+        with self.lock:
+            for cell in [cell for cell, seen in self.cells.items() if seen < cutoff]:
+                del self.cells[cell]
+            return list(self.cells)
+
+    def refresh(self):
+        """
+        모든 활성 격자의 최신 관측을 가져옵니다. 동시에 max_concurrency개까지 요청합니다.
+
+        Returns:
+            int: 갱신에 실패한 격자 수
+        """
+        started = time.perf_counter()
+        cells = self.active_cells()
+        failures = 0
+        for i in range(0, len(cells), self.max_concurrency):
+            futures = [f for f in (self.cache.prefetch(nx, ny) for nx, ny in cells[i:i + self.max_concurrency]) if f]
+            done, pending = wait(futures, timeout=self.fetch_timeout)
+            failures += len(pending) + sum(1 for f in done if f.exception() is not None)
+        self.metrics.update({
+            'cycles': self.metrics['cycles'] + 1,
+            'last_cycle_at': time.time(),
+            'last_cycle_seconds': time.perf_counter() - started,
+            'last_cycle_cells': len(cells),
+            'last_cycle_failures': failures,
+        })
+        return failures
+
+    def staleness(self):
+        """
+        격자별로 마지막 정상 관측을 받은 뒤 지난 시간(초)을 반환합니다.
+
+        Returns:
+            dict: (nx, ny) -> 경과 시간 (초). 아직 관측이 없으면 None
+        """
+        now = time.time()
+        result = {}
+        for nx, ny in self.active_cells():
+            observation = self.cache.peek(nx, ny)
+            result[(nx, ny)] = now - observation.fetched_at if observation else None
+        return result
+
+    def _run(self):
+        while not self.stopped.is_set():
+            failures = self.refresh()
+            # 다음 발표 시각까지 기다립니다. 실패한 격자가 있으면 retry_delay 후에 다시 시도합니다.
+            _, _, next_release = latest_release(self.cache.clock())
+            delay = max(0.0, (next_release - self.cache.clock()).total_seconds())
+            if failures:
+                delay = min(delay, self.retry_delay)
+            self.wakeup.wait(delay)
+            self.wakeup.clear()
+            if self.retry_requested.is_set() and not self.stopped.is_set():
+                # 새 격자의 첫 요청이 실패했습니다. 바로 다시 요청하지 않고 retry_delay 뒤에 갱신합니다.
+                self.retry_requested.clear()
+                self.wakeup.wait(self.retry_delay)
+                self.wakeup.clear()
+
+    def start(self):
+        """
+        백그라운드 갱신 스레드를 시작합니다. 이미 실행 중이면 아무 작업도 하지 않습니다.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name='weather-prefetcher', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """
+        백그라운드 갱신 스레드를 멈춥니다.
+
+        Args:
+            timeout (float): 스레드 종료를 기다리는 최대 시간 (초)
+        """
+        self.stopped.set()
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def stats(self):
+        """
+        갱신 지표를 반환합니다.
+
+        Returns:
+            dict: 갱신 주기 통계, 추적 중인 격자 수, 격자별 최대 경과 시간(초)
+        """
+        staleness = [age for age in self.staleness().values() if age is not None]
+        return dict(self.metrics, tracked_cells=len(self.cells), max_staleness_seconds=max(staleness, default=None))
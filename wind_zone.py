@@ -0,0 +1,171 @@
+import numpy as np
+
+from distance_engine import (ELLIPSOIDAL, PolylineDistances, bounds_lower_bound, closest_to_origin, local_scale,
+                             local_segments, nearest_segment, pruning_limit, row_distances)
+
+SPEED_SCALE = 5.0  # 풍속이 이만큼(m/s) 늘 때마다 풍하 방향 거리가 반경만큼 늘어납니다.
+CALM_SPEED = 0.5  # 이 풍속(m/s) 미만은 무풍으로 보고 원형 영역을 사용합니다.
+MAX_STRETCH = 4.0  # 풍하 방향 거리의 최대 배율
+
+
+class WindZone:
+    """
+    화재 지점의 풍향(VEC)과 풍속(WSD)으로 만든 타원형 영향 영역입니다.
+    무풍이면 반경 radius의 원이고, 바람이 불면 풍하 방향으로 radius × stretch, 풍상 방향으로 radius / stretch까지
+    뻗는 타원이 됩니다. (stretch = 1 + 풍속 / SPEED_SCALE, 최대 MAX_STRETCH, 타원의 단축 반경은 radius)
+
+    좌표는 화재 지점을 원점으로 하는 평면 좌표(미터)에서 u(풍하 방향), v(풍하 방향의 오른쪽)로 다룹니다.
+    타원 중심은 u = offset에 있고, v를 major / minor배 하면 반지름 major인 원이 되므로
+    선형과 타원의 교차 여부를 점-선분 거리로 정확히 판정할 수 있습니다.
+    """
+
+    def __init__(self, latitude, longitude, radius, wind_from=None, wind_speed=None):
+        """
+        Args:
+            latitude (float): 화재 지점 위도
+            longitude (float): 화재 지점 경도
+            radius (float): 기본 반경 (미터)
+            wind_from (float, optional): 풍향 (바람이 불어오는 방향, 북쪽 0도, 시계 방향)
+            wind_speed (float, optional): 풍속 (m/s)
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius = radius
+        calm = wind_from is None or wind_speed is None or not np.isfinite([wind_from, wind_speed]).all() \
+            or wind_speed < CALM_SPEED
+        self.wind_from = None if calm else float(wind_from) % 360
+        self.wind_speed = None if calm else float(wind_speed)
+        self.stretch = 1.0 if calm else min(1.0 + self.wind_speed / SPEED_SCALE, MAX_STRETCH)
+        self.downwind = 0.0 if calm else (self.wind_from + 180.0) % 360  # 바람이 불어가는 방향 (방위각)
+
+        downwind_reach = radius * self.stretch
+        upwind_reach = radius / self.stretch
+        self.major = (downwind_reach + upwind_reach) / 2  # 장축 반경
+        self.minor = float(radius)  # 단축 반경
+        self.offset = (downwind_reach - upwind_reach) / 2  # 화재 지점에서 타원 중심까지 (풍하 방향)
+
+    @classmethod
+    def from_weather(cls, latitude, longitude, radius, series):
+        """
+        기상 자료의 최신 풍향/풍속으로 영역을 만듭니다.
+
+        Args:
+            latitude (float): 화재 지점 위도
+            longitude (float): 화재 지점 경도
+            radius (float): 기본 반경 (미터)
+            series (WeatherSeries): 기상 자료 (없으면 무풍)
+
+        Returns:
+            WindZone: 영향 영역
+        """
+        values = series.latest() if series is not None else {}
+        return cls(latitude, longitude, radius, values.get('VEC'), values.get('WSD'))
+
+    @property
+    def max_reach(self):
+        """
+        화재 지점에서 영역 경계까지의 최대 거리 (풍하 방향, 미터)
+        """
+        return self.offset + self.major
+
+    def _to_wind_frame(self, x, y):
+        # 동쪽 x, 북쪽 y 평면 좌표를 풍하 방향 u, 오른쪽 v 좌표로 회전합니다.
+        beta = np.radians(self.downwind)
+        sin_b, cos_b = np.sin(beta), np.cos(beta)
+        return x * sin_b + y * cos_b, x * cos_b - y * sin_b
+
+    def reach(self, bearing):
+        """
+        화재 지점에서 방위각 방향으로 영역 경계까지의 거리를 구합니다.
+
+        Args:
+            bearing (np.ndarray): 방위각 (북쪽 0도, 시계 방향)
+
+        Returns:
+            np.ndarray: 경계까지의 거리 (미터)
+        """
+        phi = np.radians(np.asarray(bearing, dtype=np.float64) - self.downwind)
+        cos_p, sin_p = np.cos(phi), np.sin(phi)
+        a2, b2 = self.major ** 2, self.minor ** 2
+        quadratic = cos_p ** 2 / a2 + sin_p ** 2 / b2
+        linear = self.offset * cos_p / a2
+        constant = self.offset ** 2 / a2 - 1.0  # 화재 지점은 타원 안에 있으므로 음수입니다.
+        return (linear + np.sqrt(linear ** 2 - quadratic * constant)) / quadratic
+
+    def boundary(self, points=72):
+        """
+        지도에 그릴 영역 경계를 구합니다.
+
+        Args:
+            points (int): 경계 꼭짓점 수
+
+        Returns:
+            list: [(위도, 경도), ...] 닫힌 다각형
+        """
+        bearing = np.linspace(0.0, 360.0, points + 1)
+        distance = self.reach(bearing)
+        kx, ky = local_scale(self.latitude)
+        x = distance * np.sin(np.radians(bearing))
+        y = distance * np.cos(np.radians(bearing))
+        return list(zip((self.latitude + y / ky).tolist(), (self.longitude + x / kx).tolist()))
+
+    def candidates(self, lines, index=None):
+        """
+        경계 상자가 최대 도달 거리 안에 있는 후보 행을 구합니다.
+
+        Args:
+            lines (LineStrings): 시설물 선형
+            index (SpatialIndex, optional): 공간 인덱스 (없으면 전체 행의 경계 상자로 가지치기)
+
+        Returns:
+            np.ndarray: 후보 행 번호
+        """
+        if index is not None:
+            return index.candidates(self.latitude, self.longitude, self.max_reach)
+        rows = np.flatnonzero(lines.valid)
+        lower = bounds_lower_bound(lines, self.latitude, self.longitude, rows)
+        return rows[lower <= pruning_limit(self.max_reach)]
+
+    def impacted(self, lines, index=None, method=ELLIPSOIDAL):
+        """
+        영역과 겹치는 시설물을 찾아 위험도 순서로 반환합니다.
+        후보의 모든 선분을 한 번의 배열 연산으로 타원 좌표계에서 판정합니다.
+        위험도는 (가장 가까운 지점까지의 거리) / (그 방향의 영역 경계까지의 거리)로, 0은 화재 지점, 1은 경계입니다.
+
+        Args:
+            lines (LineStrings): 시설물 선형
+            index (SpatialIndex, optional): 공간 인덱스
+            method (str): 거리 계산 방식
+
+        Returns:
+            tuple (np.ndarray, np.ndarray, PolylineDistances): 행 번호, 위험도, 화재 지점에서의 거리 정보
+        """
+        rows = self.candidates(lines, index)
+        segments = local_segments(lines, rows, self.latitude, self.longitude)
+        scale = self.major / self.minor
+        au, av = self._to_wind_frame(segments.ax, segments.ay)
+        bu, bv = self._to_wind_frame(segments.bx, segments.by)
+        # 타원 중심을 원점으로 옮기고 v를 늘려 타원을 반지름 major인 원으로 바꿉니다.
+        px, py = closest_to_origin(au - self.offset, av * scale, bu - self.offset, bv * scale)
+        d2 = px * px + py * py
+        best = nearest_segment(d2, segments.group, segments.seg_counts)
+        inside = d2[best] <= self.major ** 2 * (1 + 1e-9)
+        rows = rows[segments.group[best[inside]]]
+
+        result = row_distances(lines, rows, self.latitude, self.longitude, method)
+        kx, ky = local_scale(self.latitude)
+        bearing = np.degrees(np.arctan2((result.closest_lon - self.longitude) * kx,
+                                        (result.closest_lat - self.latitude) * ky))
+        score = np.clip(result.distance / self.reach(bearing), 0.0, 1.0)
+        order = np.argsort(score, kind='stable')
+        return rows[order], score[order], PolylineDistances(*(values[order] for values in result))
+
+    def describe(self):
+        """
+        화면 표시용 영역 설명을 반환합니다.
+        """
+        if self.wind_from is None:
+            return f"무풍: 반경 {self.radius:g}m 원형 영역"
+        return (f"풍향 {self.wind_from:.0f}° / 풍속 {self.wind_speed:g}m/s: "
+                f"풍하({self.downwind:.0f}°) {self.max_reach:.0f}m, 풍상 {self.radius / self.stretch:.0f}m, "
+                f"폭 {self.minor:.0f}m 타원 영역")